@@ -1,11 +1,26 @@
-import omni.usd
-import omni.physx
+import os
+import sys
 import numpy as np
-from pxr import Usd, UsdGeom, Gf, UsdPhysics, PhysxSchema, Sdf
-import isaacsim.core.utils.prims as prim_utils
+
+# 仓库根目录下的 common/ 放两个项目共用的模块
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+from common import sim_backend
+
+if sim_backend.is_fake():
+    # 纯 NumPy 替身：弹簧关节在 fake World.step 中积分
+    from common import fake_sim
+    from common.fake_sim import omni, Gf, prim_utils
+else:
+    import omni.usd
+    import omni.physx
+    from pxr import Usd, UsdGeom, Gf, UsdPhysics, PhysxSchema, Sdf
+    import isaacsim.core.utils.prims as prim_utils
 
 class SpringForceSensor:
-    def __init__(self, prim_path, stiffness=100.0, damping=10.0, probe_mass=0.0001, t_base = [0.0, 0.0, 3.0]):
+    def __init__(self, prim_path, stiffness=100.0, damping=10.0, probe_mass=0.0001, t_base = [0.0, 0.0, 3.0],
+                 check_fast_path=False):
         self.prim_path = prim_path
         self.base_path = f"{prim_path}/Base"
         self.ee_path = f"{prim_path}/EndEffector"
@@ -27,7 +42,26 @@ class SpringForceSensor:
         
         self._build_sensor_hierarchy()
 
+        # --- 快速路径：Base 是运动学刚体，只通过 translate_op 平移且缩放为 1 ---
+        # 记录下发的 Base 位置，末端的局部偏移就退化成一次减法，不必每次求 4x4 逆矩阵
+        self._base_cmd = np.array(self.t_base, dtype=float)
+        self._base_offset = None     # Base 世界坐标 - 下发位置（父节点的平移），首次读数时确定
+        self.fast_path = True
+        # 打开后每次读数都用通用矩阵路径复核快速路径
+        self.check_fast_path = check_fast_path
+        self.fast_path_mismatches = 0
+
+        # --- 每个物理步只算一次：attach_to_world 注册的回调在 world.step 时使缓存失效 ---
+        # 没有 attach 时无法得知何时步进，不做缓存
+        # world.reset() 不触发物理回调，所以缓存同时记下所在的物理步序号，reset 把序号清零后缓存自然失效
+        self._cache_enabled = False
+        self._cached_force = None
+        self._cached_step = None
+        self._world = None
+
     def _build_sensor_hierarchy(self):
+        if sim_backend.is_fake():
+            return self._build_fake_hierarchy()
         stage = omni.usd.get_context().get_stage()
         
         # 1. 创建 Base 刚体 (使用 Xform 而不是 Cube)
@@ -73,6 +107,7 @@ class SpringForceSensor:
         d6_joint.CreateLocalPos1Attr().Set(Gf.Vec3f(0, 0, 0))
         
         d6_prim = d6_joint.GetPrim()
+        self.joint_prim = d6_prim
 
         # 锁死旋转并【清除 0.04 缓冲区】
         for axis in [UsdPhysics.Tokens.rotX, UsdPhysics.Tokens.rotY, UsdPhysics.Tokens.rotZ]:
@@ -94,7 +129,92 @@ class SpringForceSensor:
             # 清除平移轴的 0.04 干扰
             d6_prim.CreateAttribute(f"physxJoint:{axis}:contactDistance", Sdf.ValueTypeNames.Float).Set(0.0)
 
+    def _build_fake_hierarchy(self):
+        """fake 后端：同样的 prim 层级，D6 驱动换成 fake_sim.SpringJoint"""
+        self.base_prim = prim_utils.create_prim(
+            self.base_path, "Xform",
+            translation=tuple(self.t_base), scale=(1.0, 1.0, 1.0)
+        )
+        prim_utils.create_prim(f"{self.base_path}/Visual", "Cube", scale=tuple(self.base_dims))
+        self.translate_op = self.base_prim.translate_op
+        self.ee_prim = prim_utils.create_prim(
+            self.ee_path, "Sphere",
+            translation=tuple(self.t_probe), scale=tuple(self.s_probe)
+        )
+        self.joint = fake_sim.add_spring_joint(self.base_prim, self.ee_prim, self.k, self.c, self.probe_mass,
+                                               target=(0.0, 0.0, -self.l_0))
+
+    def set_parameters(self, stiffness=None, damping=None, probe_mass=None):
+        """修改弹簧刚度/阻尼和探头质量（写入 USD，需在 world.reset() 前调用才能生效）"""
+        if stiffness is not None:
+            self.k = stiffness
+        if damping is not None:
+            self.c = damping
+        if probe_mass is not None:
+            self.probe_mass = probe_mass
+        self._cached_force = None
+        if sim_backend.is_fake():
+            self.joint.k, self.joint.c, self.joint.mass = self.k, self.c, self.probe_mass
+            return
+        UsdPhysics.MassAPI(self.ee_prim).GetMassAttr().Set(self.probe_mass)
+        for axis in ["transX", "transY", "transZ"]:
+            drive = UsdPhysics.DriveAPI.Get(self.joint_prim, axis)
+            drive.GetStiffnessAttr().Set(self.k)
+            drive.GetDampingAttr().Set(self.c)
+
+    def attach_to_world(self, world):
+        """注册物理步回调：每个物理步开始时清空读数缓存，同一步内重复查询直接返回缓存"""
+        world.add_physics_callback(f"spring_sensor_cache{self.prim_path.replace('/', '_')}",
+                                   self._on_physics_step)
+        self._world = world
+        self._cache_enabled = True
+        self._cached_force = None
+
+    def _on_physics_step(self, step_size):
+        self._cached_force = None
+
     def get_equivalent_force_geom(self):
+        """返回等效力；同一物理步内重复调用不会重复计算"""
+        if self._cached_force is not None and self._cached_step == self._world.current_time_step_index:
+            return self._cached_force.copy()
+
+        if self.fast_path and self._base_offset is None:
+            self._init_fast_path()
+
+        if self.fast_path:
+            force = self._force_fast()
+            if self.check_fast_path:
+                general = self._force_general()
+                if not np.allclose(force, general, rtol=1e-6, atol=1e-9):
+                    self.fast_path_mismatches += 1
+                    print(f"WARNING: {self.prim_path} fast path {force} != general path {general}")
+                    force = general
+        else:
+            force = self._force_general()
+
+        if self._cache_enabled:
+            self._cached_force = force
+            self._cached_step = self._world.current_time_step_index
+        return force.copy()
+
+    def _init_fast_path(self):
+        """检查 Base 的世界变换确实只有平移；否则关闭快速路径"""
+        base_pose = omni.usd.get_world_transform_matrix(self.base_prim)
+        m = np.array(base_pose)
+        if np.allclose(m[:3, :3], np.eye(3), atol=1e-9):
+            self._base_offset = m[3, :3] - self._base_cmd
+        else:
+            self.fast_path = False
+            print(f"{self.prim_path}: base has rotation/scale, using the general transform path")
+
+    def _force_fast(self):
+        """快速路径：ee_local = ee_world - (下发位置 + 父节点平移)"""
+        ee_pos = np.array(omni.usd.get_world_transform_matrix(self.ee_prim).ExtractTranslation())
+        ee_local_pos = ee_pos - (self._base_cmd + self._base_offset)
+        delta_x = ee_local_pos - np.array([0.0, 0.0, -self.l_0])
+        return delta_x * self.k
+
+    def _force_general(self):
         """现在 Scale=1，矩阵运算的结果将直接以 '米' 为单位"""
         base_pose = omni.usd.get_world_transform_matrix(self.base_prim)
         ee_pose = omni.usd.get_world_transform_matrix(self.ee_prim)
@@ -112,4 +232,104 @@ class SpringForceSensor:
         return np.array([delta_x[0], delta_x[1], delta_x[2]]) * self.k
     def update_base_pose(self, position):
         """更新 Base 的世界坐标位置"""
-        self.translate_op.Set(Gf.Vec3d(*position))
\ No newline at end of file
+        self.translate_op.Set(Gf.Vec3d(*position))
+        self._base_cmd = np.array(position, dtype=float)
+        self._cached_force = None
+
+
+def _quat_to_matrix(quat):
+    """批量四元数 [w, x, y, z] -> 旋转矩阵 (N, 3, 3)（列向量约定）"""
+    q = quat / np.linalg.norm(quat, axis=1, keepdims=True)
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=1),
+        np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=1),
+        np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=1),
+    ], axis=1)
+
+
+class SpringForceSensorArray:
+    """
+    在同一个父节点下批量创建 N 个 SpringForceSensor（触觉阵列等场景）
+    一次读取全部 Base / EndEffector 位姿，用一次向量化计算得到 (N, 3) 的力
+    优先使用 PhysX tensor 视图 (isaacsim.core.prims.RigidPrim)，不可用时退回逐个读取 USD 矩阵再堆叠计算
+    """
+
+    def __init__(self, parent_path, base_positions, stiffness=100.0, damping=10.0, probe_mass=0.0001):
+        base_positions = np.atleast_2d(np.asarray(base_positions, dtype=float))
+        self.num_sensors = len(base_positions)
+        n = self.num_sensors
+
+        # 标量或长度为 N 的数组都可以，每个传感器可以有不同的刚度
+        self.k = np.broadcast_to(np.asarray(stiffness, dtype=float), (n,)).copy()
+        self.c = np.broadcast_to(np.asarray(damping, dtype=float), (n,)).copy()
+        self.probe_mass = np.broadcast_to(np.asarray(probe_mass, dtype=float), (n,)).copy()
+
+        self.parent_path = parent_path
+        prim_utils.create_prim(parent_path, "Xform")
+        self.sensors = [
+            SpringForceSensor(
+                f"{parent_path}/Sensor_{i:03d}",
+                stiffness=float(self.k[i]), damping=float(self.c[i]), probe_mass=float(self.probe_mass[i]),
+                t_base=base_positions[i].tolist()
+            )
+            for i in range(n)
+        ]
+
+        # 缓存 prim 句柄和自然长度，读取时不再逐个查找
+        self.base_prims = [sensor.base_prim for sensor in self.sensors]
+        self.ee_prims = [sensor.ee_prim for sensor in self.sensors]
+        self.target_local_pos = np.zeros((n, 3))
+        self.target_local_pos[:, 2] = -np.array([sensor.l_0 for sensor in self.sensors])
+
+        self._base_view = None
+        self._ee_view = None
+
+    def initialize_views(self):
+        """在 world.reset() 之后调用：尝试建立 PhysX tensor 视图，失败则使用 USD 堆叠矩阵的后备路径"""
+        try:
+            from isaacsim.core.prims import RigidPrim
+            self._base_view = RigidPrim(prim_paths_expr=[sensor.base_path for sensor in self.sensors],
+                                        name="spring_sensor_bases")
+            self._ee_view = RigidPrim(prim_paths_expr=[sensor.ee_path for sensor in self.sensors],
+                                      name="spring_sensor_end_effectors")
+            self._base_view.initialize()
+            self._ee_view.initialize()
+            print(f"SpringForceSensorArray: {self.num_sensors} sensors read through PhysX tensor views")
+        except Exception as e:
+            self._base_view = None
+            self._ee_view = None
+            print(f"SpringForceSensorArray: tensor views unavailable ({e}), using stacked USD matrices")
+
+    def read_poses(self):
+        """
+        一次读取所有传感器位姿
+        返回 base_pos (N, 3), world_to_base (N, 3, 3), ee_pos (N, 3)
+        其中 world_to_base 把世界系下的位移转换到 Base 局部坐标系
+        """
+        if self._base_view is not None:
+            base_pos, base_quat = self._base_view.get_world_poses()
+            ee_pos, _ = self._ee_view.get_world_poses()
+            # 刚体视图没有缩放，旋转矩阵的逆就是转置
+            world_to_base = np.transpose(_quat_to_matrix(np.asarray(base_quat, dtype=float)), (0, 2, 1))
+            return np.asarray(base_pos, dtype=float), world_to_base, np.asarray(ee_pos, dtype=float)
+
+        # Gf 矩阵是行向量约定：p_world = p_local @ M[:3, :3] + M[3, :3]
+        # 所以 p_local = (p_world - t) @ inv(M[:3, :3])，与 GetInverse().Transform() 等价
+        base_m = np.array([np.array(omni.usd.get_world_transform_matrix(p)) for p in self.base_prims])
+        ee_m = np.array([np.array(omni.usd.get_world_transform_matrix(p)) for p in self.ee_prims])
+        world_to_base = np.transpose(np.linalg.inv(base_m[:, :3, :3]), (0, 2, 1))
+        return base_m[:, 3, :3], world_to_base, ee_m[:, 3, :3]
+
+    def get_equivalent_forces(self):
+        """返回 (N, 3) 的等效力，与逐个调用 SpringForceSensor.get_equivalent_force_geom 的结果一致"""
+        base_pos, world_to_base, ee_pos = self.read_poses()
+        # 末端在 Base 局部坐标系下的位置
+        ee_local_pos = np.einsum("nij,nj->ni", world_to_base, ee_pos - base_pos)
+        delta_x = ee_local_pos - self.target_local_pos
+        return delta_x * self.k[:, None]
+
+    def update_base_poses(self, positions):
+        """批量更新每个 Base 的世界坐标位置，positions: (N, 3)"""
+        for sensor, position in zip(self.sensors, np.asarray(positions, dtype=float)):
+            sensor.update_base_pose(position.tolist())
@@ -0,0 +1,189 @@
+# 批量分析 run.py 的所有压入实验：进程池并行提取每次实验的特征，结果按文件 mtime/size 增量缓存
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.columnar_log import ColumnarLog
+from force_downsample import read_columns
+
+# run.py 的记录文件名：{timestamp}.csv/.npy/.npz（排除 _profile / _events 以及降采样缓存）
+RUN_FILE_RE = re.compile(r"^\d{8}_\d{6}\.(csv|npy|npz)$")
+INDEX_NAME = "press_index.json"
+SUMMARY_NAME = "press_summary.csv"
+
+FEATURE_FIELDS = [
+    ("samples", "i8"),
+    ("contact_time", "f8", "%.4f"),
+    ("contact_z", "f8", "%.6f"),
+    ("peak_force", "f8", "%.6f"),
+    ("peak_time", "f8", "%.4f"),
+    ("peak_disp", "f8", "%.6f"),
+    ("stiffness", "f8", "%.4f"),
+    ("stiffness_r2", "f8", "%.6f"),
+    ("hysteresis_area", "f8", "%.6g"),
+]
+SUMMARY_FIELDS = [("file", "U64", "%s")] + FEATURE_FIELDS
+
+
+def _integrate(y, x):
+    """梯形积分（避免 np.trapz / np.trapezoid 的版本差异）"""
+    return float(np.sum(0.5 * (y[1:] + y[:-1]) * np.diff(x))) if len(y) > 1 else 0.0
+
+
+def extract_features(path, threshold=0.01):
+    """
+    单个记录的特征（在子进程中执行），力取压缩方向为正 (-f_z)，位移 = 首样本 base_z - base_z
+      contact_time / contact_z : |f_z| 首次超过 threshold 的时间和 Base 高度
+      peak_*                   : 最大压缩力及其时间、位移
+      stiffness / stiffness_r2 : 加载段（接触 -> 峰值）上 力 = k * 位移 + b 的最小二乘斜率和决定系数
+      hysteresis_area          : 接触之后整条 力-位移 路径的环路积分（加载功 - 卸载回收功，所有循环合计）
+                                 没有卸载（位移没有回退）时为 None
+    """
+    cols = read_columns(path, ["time", "f_z", "base_z"])
+    t, fz = cols["time"], cols["f_z"]
+    features = {name[0]: None for name in FEATURE_FIELDS}
+    features["samples"] = int(len(t))
+    if len(t) == 0:
+        return features
+
+    contact = np.flatnonzero(np.abs(fz) > threshold)
+    if len(contact) == 0:
+        return features
+    c = int(contact[0])
+    features["contact_time"] = float(t[c])
+
+    force = -fz
+    p = int(np.argmax(force))
+    features["peak_force"] = float(force[p])
+    features["peak_time"] = float(t[p])
+
+    if "base_z" not in cols:
+        return features
+    base_z = cols["base_z"]
+    disp = base_z[0] - base_z
+    features["contact_z"] = float(base_z[c])
+    features["peak_disp"] = float(disp[p])
+
+    # --- 加载段线性拟合：[d, 1] @ [k, b] ≈ F ---
+    if p - c >= 2:
+        d, f = disp[c:p + 1], force[c:p + 1]
+        A = np.column_stack([d, np.ones_like(d)])
+        (k, b), *_ = np.linalg.lstsq(A, f, rcond=None)
+        ss_res = np.sum((f - A @ np.array([k, b])) ** 2)
+        ss_tot = np.sum((f - f.mean()) ** 2)
+        features["stiffness"] = float(k)
+        features["stiffness_r2"] = float(1.0 - ss_res / ss_tot) if ss_tot > 0 else None
+
+    # --- 滞回面积：只有位移在峰值之后明显回退时才有意义 ---
+    if disp[p:].min() < disp[p] - 0.5 * (disp[p] - disp[c]):
+        features["hysteresis_area"] = _integrate(force[c:], disp[c:])
+    return features
+
+
+def _scan(data_dir):
+    """当前目录中所有记录文件的 {文件名: (size, mtime)}"""
+    files = {}
+    for name in sorted(os.listdir(data_dir)):
+        if RUN_FILE_RE.match(name):
+            st = os.stat(os.path.join(data_dir, name))
+            files[name] = (st.st_size, st.st_mtime)
+    return files
+
+
+def _load_index(index_path):
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"索引缓存损坏，将重新分析全部文件: {e}")
+        return {}
+
+
+def _save_index(index_path, index):
+    tmp = index_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, index_path)
+
+
+def analyze_directory(data_dir, num_workers=None, threshold=0.01, rebuild=False):
+    """
+    分析目录中新增或改动过的记录，返回 {文件名: 特征}，并写出索引缓存和汇总 CSV
+    单个文件出错（缺列、文件损坏等）不影响其他文件：索引里记下 error（特征为 None），汇总 CSV 跳过该文件，
+    文件改动后下次运行会重新分析
+    """
+    index_path = os.path.join(data_dir, INDEX_NAME)
+    index = {} if rebuild else _load_index(index_path)
+    files = _scan(data_dir)
+
+    # 已删除的文件从索引中移除；阈值变化时缓存的特征不可复用
+    index = {name: entry for name, entry in index.items()
+             if name in files and entry.get("threshold") == threshold}
+    todo = [name for name, (size, mtime) in files.items()
+            if name not in index or index[name]["size"] != size or index[name]["mtime"] != mtime]
+    print(f"--- 共 {len(files)} 个记录，缓存命中 {len(files) - len(todo)} 个，待分析 {len(todo)} 个 ---")
+
+    if todo:
+        try:
+            with ProcessPoolExecutor(max_workers=num_workers) as pool:
+                futures = {pool.submit(extract_features, os.path.join(data_dir, name), threshold): name
+                           for name in todo}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    size, mtime = files[name]
+                    entry = {"size": size, "mtime": mtime, "threshold": threshold, "features": None}
+                    try:
+                        entry["features"] = future.result()
+                    except Exception as e:
+                        entry["error"] = f"{type(e).__name__}: {e}"
+                    index[name] = entry
+        finally:
+            # 中途被打断时已完成的文件也写进缓存，下次不必重做
+            _save_index(index_path, index)
+
+    failed = {name: index[name]["error"] for name in files if index[name].get("error")}
+    summary_path = os.path.join(data_dir, SUMMARY_NAME)
+    with ColumnarLog(summary_path, SUMMARY_FIELDS, fmt="csv") as log:
+        for name in files:
+            if name in failed:
+                continue
+            features = index[name]["features"]
+            log.append([name] + [np.nan if features[f[0]] is None else features[f[0]] for f in FEATURE_FIELDS])
+    for name, error in failed.items():
+        print(f"分析失败 {name}: {error}")
+    print(f"--- 汇总已保存至: {summary_path}（{len(files) - len(failed)} 个成功，{len(failed)} 个失败）---")
+    return {name: index[name]["features"] for name in files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量提取压入实验的接触点、峰值力、刚度和滞回面积")
+    parser.add_argument("data_dir", nargs="?", default=os.path.expanduser("~/Documents/ExperimentalDataRaw/press"),
+                        help="run.py 的输出目录")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认为 CPU 核数")
+    parser.add_argument("--threshold", type=float, default=0.01, help="接触判定阈值 (N)")
+    parser.add_argument("--rebuild", action="store_true", help="忽略索引缓存，重新分析全部文件")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"错误: 找不到目录 '{args.data_dir}'")
+        return
+    results = analyze_directory(args.data_dir, args.workers, args.threshold, args.rebuild)
+    for name, features in results.items():
+        if features is None:
+            continue
+        k = features["stiffness"]
+        peak = features["peak_force"]
+        print(f"{name}: peak = {'-' if peak is None else f'{peak:.4f} N'} | "
+              f"k = {'-' if k is None else f'{k:.2f} N/m'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# 在 CPU 替身后端 (common/fake_sim.py) 上回归测试 SpringForceSensor 的读数逻辑并测吞吐，不需要 Isaac Sim
+# 用法: python bench_fake.py [--steps 2000] [--array 64]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import sim_backend
+
+sim_backend.set_backend("fake")
+
+from common import fake_sim
+from experiment_runner import ExperimentRunner, SettleDetector
+from SpringForceSensor import SpringForceSensor, SpringForceSensorArray
+
+GRAVITY = 9.81
+
+
+def check_static(masses, stiffness=1000.0, max_steps=6000):
+    """静止 Base 下等效力应收敛到 -m g（与 plot_sensor_verification.py 的理论值一致）"""
+    ok = True
+    for m in masses:
+        fake_sim.new_stage()
+        app = sim_backend.create_app({"headless": True})
+        world = sim_backend.create_world(stage_units_in_meters=1.0)
+        sensor = SpringForceSensor("/World/Sensor", stiffness=stiffness, probe_mass=m, t_base=[0.0, 0.0, 3.0],
+                                   check_fast_path=True)
+        sensor.attach_to_world(world)
+        world.reset()
+
+        runner = ExperimentRunner(world, app, render_interval=0, max_steps=max_steps)
+        detector = SettleDetector(window=60, abs_tol=1e-6, rel_tol=1e-6)
+        while runner.keep_running():
+            runner.step()
+            if detector.update(sensor.get_equivalent_force_geom()[2]):
+                break
+        err = abs(detector.mean + GRAVITY * m)
+        passed = detector.settled and err < 1e-3 * max(GRAVITY * m, 1.0) and sensor.fast_path_mismatches == 0
+        ok &= passed
+        print(f"[{'OK' if passed else 'FAIL'}] m={m:.3f} | Fz: {detector.mean:.6f} N (理论 {-GRAVITY * m:.6f}) "
+              f"| steps: {runner.step_count} | fast path mismatches: {sensor.fast_path_mismatches}")
+    return ok
+
+
+def bench_press(steps):
+    """匀速下压 Base，测量 update_base_pose + step + 读数 的吞吐"""
+    fake_sim.new_stage()
+    app = sim_backend.create_app({"headless": True})
+    world = sim_backend.create_world(stage_units_in_meters=1.0)
+    sensor = SpringForceSensor("/World/Sensor", stiffness=1000.0, t_base=[0.0, 0.0, 1.35])
+    sensor.attach_to_world(world)
+    world.reset()
+    runner = ExperimentRunner(world, app, render_interval=0, max_steps=steps)
+    z = 1.35 - 0.005 * np.arange(steps) * world.get_physics_dt()
+    while runner.keep_running():
+        sensor.update_base_pose(position=(0.0, 0.0, z[runner.step_count]))
+        runner.step()
+        sensor.get_equivalent_force_geom()
+    runner.report()
+
+
+def bench_array(n, steps):
+    """SpringForceSensorArray 的批量读数与逐个读数一致，并比较两者的耗时"""
+    fake_sim.new_stage()
+    app = sim_backend.create_app({"headless": True})
+    world = sim_backend.create_world(stage_units_in_meters=1.0)
+    grid = np.stack(np.meshgrid(np.arange(n) * 0.3, [0.0], [2.0], indexing="ij"), axis=-1).reshape(-1, 3)
+    array = SpringForceSensorArray("/World/Array", grid, stiffness=np.linspace(500, 1500, n), probe_mass=0.1)
+    world.reset()
+    array.initialize_views()
+    for _ in range(steps):
+        world.step(render=False)
+
+    t0 = time.perf_counter()
+    batched = array.get_equivalent_forces()
+    t1 = time.perf_counter()
+    single = np.array([sensor.get_equivalent_force_geom() for sensor in array.sensors])
+    t2 = time.perf_counter()
+    match = np.allclose(batched, single, atol=1e-9)
+    print(f"[{'OK' if match else 'FAIL'}] array of {n}: batched {1e3 * (t1 - t0):.2f} ms | "
+          f"per-sensor {1e3 * (t2 - t1):.2f} ms")
+    return match
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SpringForceSensor regression check on the CPU stand-in backend")
+    parser.add_argument("--steps", type=int, default=2000, help="下压吞吐测试的物理步数")
+    parser.add_argument("--array", type=int, default=64, help="阵列测试的传感器数量")
+    args = parser.parse_args()
+
+    ok = check_static([0.5, 1.0, 3.5, 5.0])
+    bench_press(args.steps)
+    ok &= bench_array(args.array, 200)
+    print("--- 全部通过 ---" if ok else "--- 存在失败项 ---")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# 力传感实验共用的步进调度：物理步、渲染步、传感器采样步相互解耦
+# 注意：本模块不导入任何 omni / isaacsim 模块，可以在 SimulationApp 启动前使用 parse_args
+import argparse
+import time
+import numpy as np
+
+
+def parse_args(description="Spring force sensor experiment", render_interval=1, sample_interval=1, backend=False):
+    """
+    各实验脚本共用的命令行参数（必须在创建 SimulationApp 之前解析），默认间隔可由脚本指定
+    backend: True 时增加 --backend 并据此切换 sim_backend（脚本需通过 sim_backend 创建 App / World）
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--headless", action="store_true", help="无界面运行")
+    parser.add_argument("--render-interval", type=int, default=render_interval,
+                        help="每隔多少个物理步渲染一次，0 表示从不渲染")
+    parser.add_argument("--sample-interval", type=int, default=sample_interval,
+                        help="每隔多少个物理步读取/记录一次传感器")
+    parser.add_argument("--max-steps", type=int, default=None, help="最多运行的物理步数，默认一直运行到窗口关闭")
+    if backend:
+        from common import sim_backend
+        parser.add_argument("--backend", choices=sim_backend.BACKENDS, default=None,
+                            help="仿真后端，fake 为纯 NumPy 替身（无需 GPU），默认取环境变量 SIM_BACKEND")
+    args, _ = parser.parse_known_args()
+    if backend and args.backend is not None:
+        sim_backend.set_backend(args.backend)
+    return args
+
+
+class ExperimentRunner:
+    """
+    用法：
+        runner = ExperimentRunner(world, simulation_app, render_interval=60, sample_interval=10)
+        while runner.keep_running():
+            sampled = runner.step()
+            if sampled: ...读取传感器...
+        runner.report()
+    """
+
+    def __init__(self, world, simulation_app, render_interval=1, sample_interval=1, max_steps=None):
+        self.world = world
+        self.simulation_app = simulation_app
+        self.render_interval = render_interval
+        self.sample_interval = max(sample_interval, 1)
+        self.max_steps = max_steps
+
+        self.step_count = 0
+        self.render_count = 0
+        self.sample_count = 0
+        self._t_start = None
+        self._t_render = 0.0
+
+    @classmethod
+    def from_args(cls, world, simulation_app, args):
+        return cls(world, simulation_app, args.render_interval, args.sample_interval, args.max_steps)
+
+    def keep_running(self):
+        if self.max_steps is not None and self.step_count >= self.max_steps:
+            return False
+        return self.simulation_app.is_running()
+
+    def step(self):
+        """
+        推进一个物理步，按间隔决定是否渲染；返回这一步是否为传感器采样步
+        采样落在第 sample_interval, 2 * sample_interval, ... 个物理步完成之后（与 step_count 同相位）
+        """
+        if self._t_start is None:
+            self._t_start = time.perf_counter()
+
+        render = self.render_interval > 0 and self.step_count % self.render_interval == 0
+        if render:
+            t0 = time.perf_counter()
+            self.world.step(render=True)
+            self._t_render += time.perf_counter() - t0
+            self.render_count += 1
+        else:
+            self.world.step(render=False)
+
+        self.step_count += 1
+        sampled = self.step_count % self.sample_interval == 0
+        if sampled:
+            self.sample_count += 1
+        return sampled
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._t_start if self._t_start is not None else 0.0
+        return {
+            "physics_steps": self.step_count,
+            "render_steps": self.render_count,
+            "samples": self.sample_count,
+            "wall_time_s": elapsed,
+            "render_time_s": self._t_render,
+            "physics_steps_per_s": self.step_count / elapsed if elapsed > 0 else 0.0,
+            "render_steps_per_s": self.render_count / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def report(self):
+        s = self.stats()
+        print(f"--- 运行统计 ---")
+        print(f"物理步: {s['physics_steps']} ({s['physics_steps_per_s']:.1f} steps/s) | "
+              f"渲染步: {s['render_steps']} ({s['render_steps_per_s']:.1f} steps/s, "
+              f"耗时 {s['render_time_s']:.1f}s) | 采样: {s['samples']} | 总耗时: {s['wall_time_s']:.1f}s")
+        return s
+
+
+class SettleDetector:
+    """
+    在线滑动窗口方差判稳：维护最近 window 个样本的和与平方和，每个样本 O(1)
+    窗口填满且 std <= abs_tol + rel_tol * |mean| 时认为已稳定
+    为避免大均值下平方和相减的精度损失，样本先减去第一个样本作为参考值
+    """
+
+    def __init__(self, window=60, abs_tol=1e-4, rel_tol=1e-4, min_samples=0):
+        self.window = window
+        self.abs_tol = abs_tol
+        self.rel_tol = rel_tol
+        self.min_samples = max(min_samples, window)
+        self.reset()
+
+    def reset(self):
+        self._buf = np.zeros(self.window)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._ref = None
+        self.count = 0
+
+    def update(self, value):
+        """加入一个样本，返回是否已稳定"""
+        if self._ref is None:
+            self._ref = value
+        x = value - self._ref
+        i = self.count % self.window
+        if self.count >= self.window:
+            old = self._buf[i]
+            self._sum -= old
+            self._sum_sq -= old * old
+        self._buf[i] = x
+        self._sum += x
+        self._sum_sq += x * x
+        self.count += 1
+        return self.settled
+
+    @property
+    def mean(self):
+        n = min(self.count, self.window)
+        return self._ref + self._sum / n if n else 0.0
+
+    @property
+    def std(self):
+        n = min(self.count, self.window)
+        if n < 2:
+            return float("inf")
+        var = (self._sum_sq - self._sum * self._sum / n) / (n - 1)
+        return float(np.sqrt(max(var, 0.0)))
+
+    @property
+    def settled(self):
+        if self.count < self.min_samples:
+            return False
+        return self.std <= self.abs_tol + self.rel_tol * abs(self.mean)
+
+
+def run_until_settled(runner, read_force, detector, max_steps):
+    """
+    步进直到 detector 根据 fz 判稳或达到 max_steps（标定扫描和任务服务共用）
+    read_force() 返回 (fx, fy, fz)；返回 (最后一次读数, 实际步数)
+    """
+    steps = 0
+    force = read_force()
+    while runner.keep_running() and steps < max_steps:
+        sampled = runner.step()
+        steps += 1
+        if sampled:
+            force = read_force()
+            if detector.update(force[2]):
+                break
+    return force, steps
@@ -0,0 +1,181 @@
+# 力数据流的在线分析：每个采样 O(1)，长时间实验不必保留或重读整个 CSV
+# 不依赖 omni / isaacsim，可离线对已有记录逐行回放
+import numpy as np
+
+# 事件类型，写入 events 日志的 event 列
+CONTACT_ON = "contact_on"
+CONTACT_OFF = "contact_off"
+PEAK = "peak"
+
+EVENT_FIELDS = [
+    ("time", "f8", "%.4f"),
+    ("event", "U16", "%s"),
+    ("value", "f8"),
+]
+
+
+class Welford:
+    """逐样本更新的均值/方差（Welford 算法），支持向量样本（按分量独立统计）"""
+
+    def __init__(self, dim=3):
+        self.n = 0
+        self.mean = np.zeros(dim)
+        self._m2 = np.zeros(dim)
+
+    def update(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+
+    @property
+    def var(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else np.zeros_like(self._m2)
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+
+class LowPassFilter:
+    """
+    IIR 低通：order=1 为一阶 RC 指数平滑，order=2 为二阶 Butterworth（双线性变换）
+    cutoff_hz 为截止频率，dt 为采样间隔；首个样本直接作为初值，避免从 0 开始的瞬态
+    """
+
+    def __init__(self, cutoff_hz, dt, order=1, dim=3):
+        if order not in (1, 2):
+            raise ValueError(f"Unsupported filter order: {order}")
+        self.order = order
+        self.dim = dim
+        if order == 1:
+            rc = 1.0 / (2.0 * np.pi * cutoff_hz)
+            self.alpha = dt / (rc + dt)
+        else:
+            # 预畸变后的二阶 Butterworth 双二阶节系数
+            k = np.tan(np.pi * cutoff_hz * dt)
+            norm = 1.0 / (1.0 + np.sqrt(2.0) * k + k * k)
+            self.b = np.array([k * k, 2.0 * k * k, k * k]) * norm
+            self.a = np.array([2.0 * (k * k - 1.0), 1.0 - np.sqrt(2.0) * k + k * k]) * norm
+        self.reset()
+
+    def reset(self):
+        self.y = None
+        self._z = np.zeros((2, self.dim))   # 转置直接 II 型的状态
+
+    def update(self, x):
+        x = np.asarray(x, dtype=float)
+        if self.y is None:
+            # 以首个样本为稳态初始化
+            if self.order == 2:
+                self._z[1] = (self.b[2] - self.a[1]) * x
+                self._z[0] = self._z[1] + (self.b[1] - self.a[0]) * x
+            self.y = x.copy()
+            return self.y
+        if self.order == 1:
+            self.y = self.y + self.alpha * (x - self.y)
+        else:
+            y = self.b[0] * x + self._z[0]
+            self._z[0] = self.b[1] * x - self.a[0] * y + self._z[1]
+            self._z[1] = self.b[2] * x - self.a[1] * y
+            self.y = y
+        return self.y
+
+
+class ForceAnalytics:
+    """
+    每个采样喂一次 get_equivalent_force_geom() 的结果：
+      - Welford 统计原始力的均值/标准差
+      - IIR 低通得到 filtered
+      - 对滤波后的 |fz| 做带回差的接触判定：> on_threshold 进入接触，< off_threshold 离开
+        min_samples 个连续样本满足条件才切换状态（去抖）
+      - 跟踪全局峰值和每次接触的峰值
+    状态切换和每次接触的峰值作为事件写入 event_log（ColumnarLog，字段见 EVENT_FIELDS），也保存在 self.events
+    """
+
+    def __init__(self, dt, cutoff_hz=5.0, filter_order=1, on_threshold=0.01, off_threshold=0.005,
+                 min_samples=3, event_log=None):
+        if off_threshold > on_threshold:
+            raise ValueError("off_threshold must not exceed on_threshold")
+        self.stats = Welford(3)
+        self.lowpass = LowPassFilter(cutoff_hz, dt, order=filter_order) if cutoff_hz else None
+        self.on_threshold = on_threshold
+        self.off_threshold = off_threshold
+        self.min_samples = max(min_samples, 1)
+        self.event_log = event_log
+
+        self.filtered = np.zeros(3)
+        self.in_contact = False
+        self._pending = 0
+        self.contact_count = 0
+        self.contact_start = None
+        self.contact_durations = []
+
+        self.peak = 0.0            # 全局 |fz| 峰值（带符号保存）
+        self.peak_time = None
+        self.contact_peak = 0.0    # 当前/最近一次接触的峰值
+        self.contact_peak_time = None
+        self.events = []
+
+    def _emit(self, t, event, value):
+        self.events.append((t, event, value))
+        if self.event_log is not None:
+            self.event_log.append((t, event, value))
+
+    def update(self, t, force):
+        """加入 t 时刻的一个力样本 (fx, fy, fz)，返回滤波后的力"""
+        force = np.asarray(force, dtype=float)
+        self.stats.update(force)
+        self.filtered = self.lowpass.update(force) if self.lowpass is not None else force
+        fz = self.filtered[2]
+
+        if abs(fz) > abs(self.peak):
+            self.peak, self.peak_time = fz, t
+
+        # --- 接触判定（回差 + 去抖）---
+        if self.in_contact:
+            self._pending = self._pending + 1 if abs(fz) < self.off_threshold else 0
+            if self._pending >= self.min_samples:
+                self.in_contact = False
+                self._pending = 0
+                self.contact_durations.append(t - self.contact_start)
+                # 峰值发生在离开接触之前，先写峰值，事件表保持按时间排序
+                self._emit(self.contact_peak_time, PEAK, self.contact_peak)
+                self._emit(t, CONTACT_OFF, fz)
+        else:
+            self._pending = self._pending + 1 if abs(fz) > self.on_threshold else 0
+            if self._pending >= self.min_samples:
+                self.in_contact = True
+                self._pending = 0
+                self.contact_count += 1
+                self.contact_start = t
+                self.contact_peak, self.contact_peak_time = fz, t
+                self._emit(t, CONTACT_ON, fz)
+
+        if self.in_contact and abs(fz) > abs(self.contact_peak):
+            self.contact_peak, self.contact_peak_time = fz, t
+        return self.filtered
+
+    def finish(self, t):
+        """实验结束时仍处于接触状态，补记当前接触的峰值"""
+        if self.in_contact:
+            self.contact_durations.append(t - self.contact_start)
+            self._emit(self.contact_peak_time, PEAK, self.contact_peak)
+
+    def summary(self):
+        return {
+            "samples": self.stats.n,
+            "mean": self.stats.mean.copy(),
+            "std": self.stats.std,
+            "peak_fz": self.peak,
+            "peak_time": self.peak_time,
+            "contacts": self.contact_count,
+            "contact_durations": list(self.contact_durations),
+        }
+
+    def print_summary(self):
+        s = self.summary()
+        print(f"--- 力数据统计 ---")
+        print(f"样本数: {s['samples']} | 均值: {np.round(s['mean'], 4)} N | 标准差: {np.round(s['std'], 4)} N")
+        if s["peak_time"] is not None:
+            print(f"峰值 Fz: {s['peak_fz']:.4f} N @ {s['peak_time']:.2f}s | 接触次数: {s['contacts']}")
@@ -0,0 +1,100 @@
+# 大体量力数据的分块读取与保形降采样（LTTB / min-max 分箱），结果缓存在源文件旁边
+import os
+import numpy as np
+import pandas as pd
+
+DEFAULT_COLUMNS = ["time", "f_z", "base_z"]
+
+
+def read_columns(path, columns=DEFAULT_COLUMNS, chunk_rows=500_000):
+    """只读取需要的列；CSV 按块读取，每块转成 float64 数组后拼接，避免构造整张 DataFrame"""
+    if path.endswith(".npy") or path.endswith(".npz"):
+        # run.py 的二进制记录格式（ColumnarLog），按列存储，直接取列
+        if path.endswith(".npy"):
+            table = np.load(path, mmap_mode="r")
+            return {c: np.asarray(table[c], dtype=float) for c in columns if c in table.dtype.names}
+        with np.load(path) as data:
+            return {c: data[c].astype(float) for c in columns if c in data.files}
+
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in columns if c in header]
+    parts = {c: [] for c in usecols}
+    for chunk in pd.read_csv(path, usecols=usecols, dtype={c: np.float64 for c in usecols},
+                             chunksize=chunk_rows, engine="c"):
+        for c in usecols:
+            parts[c].append(chunk[c].to_numpy())
+    return {c: np.concatenate(parts[c]) if parts[c] else np.zeros(0) for c in usecols}
+
+
+def minmax_indices(y, n_out):
+    """min/max 分箱：分成 n_out/2 个箱，每箱保留最小和最大值的位置（保留尖峰），首尾点总是保留"""
+    n = len(y)
+    n_bins = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_bins + 1).astype(np.int64)
+    idx = [0, n - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        seg = y[lo:hi]
+        idx.append(lo + np.argmin(seg))
+        idx.append(lo + np.argmax(seg))
+    return np.unique(np.array(idx))
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets：首尾点固定，中间每个桶选与前一选中点、下一桶均值围成三角形面积最大的点"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 下一个桶的均值（最后一个桶的下一个是末点）
+        nlo, nhi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean()
+        avg_y = y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def _cache_path(path, method, points):
+    return f"{path}.{method}{points}.npz"
+
+
+def load_downsampled(path, method="lttb", points=5000, columns=DEFAULT_COLUMNS, chunk_rows=500_000,
+                     use_cache=True):
+    """
+    读取并降采样（按 time-f_z 曲线选点，其余列取同样的行）
+    缓存写在源文件旁边 <源文件>.<method><points>.npz，源文件大小或修改时间变化时自动失效
+    """
+    st = os.stat(path)
+    cache = _cache_path(path, method, points)
+    if use_cache and os.path.exists(cache):
+        with np.load(cache) as data:
+            if int(data["_size"]) == st.st_size and float(data["_mtime"]) == st.st_mtime:
+                return {c: data[c] for c in data.files if not c.startswith("_")}
+
+    cols = read_columns(path, columns, chunk_rows)
+    t, fz = cols["time"], cols["f_z"]
+    if method == "lttb":
+        idx = lttb_indices(t, fz, points)
+    elif method == "minmax":
+        idx = minmax_indices(fz, points)
+    else:
+        raise ValueError(f"Unknown downsample method: {method}")
+    result = {c: v[idx] for c, v in cols.items()}
+
+    if use_cache:
+        try:
+            np.savez(cache, _size=st.st_size, _mtime=st.st_mtime, **result)
+        except OSError as e:
+            print(f"无法写入降采样缓存 {cache}: {e}")
+    print(f"{os.path.basename(path)}: {len(t)} -> {len(idx)} 点 ({method})")
+    return result
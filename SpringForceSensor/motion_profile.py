@@ -0,0 +1,119 @@
+# 预先计算压头运动曲线 target_z(t)：在物理步长网格上一次性生成，主循环只按步号取值
+import numpy as np
+
+# 每一步所处的阶段，与 run.py 终端打印的状态对应
+WAITING, MOVING, HOLDING = 0, 1, 2
+PHASE_NAMES = {WAITING: "WAITING", MOVING: "MOVING", HOLDING: "FINISHED"}
+
+
+class MotionProfile:
+    """t[i] = i * dt 时刻 Base 的目标高度 z[i] 以及阶段 phase[i]"""
+
+    def __init__(self, dt, z, phase):
+        self.dt = dt
+        self.z = np.asarray(z, dtype=float)
+        self.phase = np.asarray(phase, dtype=np.int8)
+        self.t = np.arange(len(self.z)) * dt
+
+    def __len__(self):
+        return len(self.z)
+
+    @property
+    def duration(self):
+        return len(self.z) * self.dt
+
+    def at_step(self, step):
+        """第 step 个物理步的 (target_z, phase)，超出曲线长度后保持最后一个值"""
+        i = min(step, len(self.z) - 1)
+        return self.z[i], self.phase[i]
+
+    def save(self, path):
+        """保存规划的位移曲线，便于与测得的力按时间对齐"""
+        np.savetxt(path, np.column_stack([self.t, self.z, self.phase]),
+                   fmt=["%.6f", "%.6f", "%d"], delimiter=",", header="time,target_z,phase", comments="")
+        print(f"--- 运动曲线已保存至: {path} ---")
+
+
+def _grid(duration, dt):
+    return np.arange(int(round(duration / dt))) * dt
+
+
+def _assemble(dt, start_z, wait_time, segments, end_z, hold_time):
+    """等待段 + 若干运动段（局部时间轴上的 z 数组，不含终点）+ 停在 end_z 的保持段 拼接成完整曲线"""
+    n_wait = int(round(wait_time / dt))
+    z_parts = [np.full(n_wait, start_z)]
+    phase_parts = [np.full(n_wait, WAITING)]
+    for z in segments:
+        z_parts.append(z)
+        phase_parts.append(np.full(len(z), MOVING))
+    n_hold = max(int(round(hold_time / dt)), 1)
+    z_parts.append(np.full(n_hold, end_z))
+    phase_parts.append(np.full(n_hold, HOLDING))
+    return MotionProfile(dt, np.concatenate(z_parts), np.concatenate(phase_parts))
+
+
+def trapezoid_segment(start_z, end_z, speed, accel, dt):
+    """梯形速度段（accel=None 时为匀速，与原 run.py 的行为一致）"""
+    distance = abs(end_z - start_z)
+    direction = np.sign(end_z - start_z)
+    if accel is None or np.isinf(accel):
+        t = _grid(distance / speed, dt)
+        return start_z + direction * speed * t
+
+    # 距离不足以加速到 speed 时退化为三角形速度曲线
+    t_acc = speed / accel
+    if accel * t_acc ** 2 > distance:
+        t_acc = np.sqrt(distance / accel)
+        speed = accel * t_acc
+    t_const = (distance - accel * t_acc ** 2) / speed
+    total = 2 * t_acc + t_const
+    t = _grid(total, dt)
+
+    s = np.where(
+        t < t_acc, 0.5 * accel * t ** 2,
+        np.where(t < t_acc + t_const,
+                 0.5 * accel * t_acc ** 2 + speed * (t - t_acc),
+                 distance - 0.5 * accel * np.clip(total - t, 0.0, None) ** 2))
+    return start_z + direction * s
+
+
+def s_curve_segment(start_z, end_z, duration, dt):
+    """S 曲线（五次最小加加速度多项式），起止的速度和加速度都为零"""
+    tau = _grid(duration, dt) / duration
+    blend = 10 * tau ** 3 - 15 * tau ** 4 + 6 * tau ** 5
+    return start_z + (end_z - start_z) * blend
+
+
+def trapezoidal(start_z, end_z, speed, dt, accel=None, wait_time=0.0, hold_time=0.0):
+    return _assemble(dt, start_z, wait_time, [trapezoid_segment(start_z, end_z, speed, accel, dt)], end_z, hold_time)
+
+
+def s_curve(start_z, end_z, duration, dt, wait_time=0.0, hold_time=0.0):
+    return _assemble(dt, start_z, wait_time, [s_curve_segment(start_z, end_z, duration, dt)], end_z, hold_time)
+
+
+def sinusoidal(start_z, amplitude, frequency, cycles, dt, wait_time=0.0, hold_time=0.0):
+    """从 start_z 开始向下压的正弦往复：z = start_z - amplitude * (1 - cos(2πft)) / 2"""
+    t = _grid(cycles / frequency, dt)
+    z = start_z - amplitude * 0.5 * (1.0 - np.cos(2.0 * np.pi * frequency * t))
+    return _assemble(dt, start_z, wait_time, [z], start_z, hold_time)
+
+
+def cyclic(start_z, end_z, speed, cycles, dt, accel=None, dwell_time=0.0, wait_time=0.0, hold_time=0.0):
+    """多次加载/卸载循环（疲劳测试）：每个循环 下压 -> 停留 dwell_time -> 抬起 -> 停留"""
+    down = trapezoid_segment(start_z, end_z, speed, accel, dt)
+    up = trapezoid_segment(end_z, start_z, speed, accel, dt)
+    n_dwell = int(round(dwell_time / dt))
+    one_cycle = np.concatenate([down, np.full(n_dwell, end_z), up, np.full(n_dwell, start_z)])
+    return _assemble(dt, start_z, wait_time, [np.tile(one_cycle, cycles)], start_z, hold_time)
+
+
+def from_file(path, dt, wait_time=0.0, hold_time=0.0):
+    """从 CSV (time,z 两列，带表头) 或 .npy ((M, 2) 数组) 读取曲线并线性插值到物理步长网格"""
+    if path.endswith(".npy"):
+        data = np.load(path)
+    else:
+        data = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+    t_src, z_src = data[:, 0] - data[0, 0], data[:, 1]
+    t = _grid(t_src[-1], dt)
+    return _assemble(dt, z_src[0], wait_time, [np.interp(t, t_src, z_src)], z_src[-1], hold_time)
@@ -1,57 +1,97 @@
 # For phantom press-down and plotting the force-displacement curve
-import pandas as pd
 import matplotlib.pyplot as plt
 import argparse
 import os
+import numpy as np
+
+from force_downsample import DEFAULT_COLUMNS, load_downsampled, read_columns
+
+def load_recording(path, args):
+    """--downsample none 时读取全部样本（仍只读取需要的列），否则降采样并使用缓存"""
+    if args.downsample == "none":
+        return read_columns(path, DEFAULT_COLUMNS, args.chunk_rows)
+    return load_downsampled(path, args.downsample, args.points, DEFAULT_COLUMNS, args.chunk_rows,
+                            use_cache=not args.no_cache)
 
 def main():
     # 1. 设置命令行参数解析
     parser = argparse.ArgumentParser(description="读取传感器力数据 CSV 并绘制 F_z 随时间变化的折线图")
-    parser.add_argument("file_path", type=str, help="CSV 文件的路径")
+    parser.add_argument("file_path", type=str, nargs="+", help="CSV 文件的路径（多个文件叠加绘制）")
+    parser.add_argument("--downsample", choices=["none", "lttb", "minmax"], default="none",
+                        help="降采样算法，百万行级别的长实验建议使用 lttb 或 minmax")
+    parser.add_argument("--points", type=int, default=5000, help="降采样后保留的点数")
+    parser.add_argument("--chunk-rows", type=int, default=500_000, help="分块读取 CSV 的行数")
+    parser.add_argument("--no-cache", action="store_true", help="不读写降采样缓存")
+    parser.add_argument("--view", choices=["time", "displacement", "both"], default="time",
+                        help="time: F_z-时间；displacement: F_z-下压位移 (base_z)")
     args = parser.parse_parse_args() if hasattr(parser, 'parse_parse_args') else parser.parse_args()
 
     # 2. 检查文件是否存在
-    if not os.path.exists(args.file_path):
-        print(f"错误: 找不到文件 '{args.file_path}'")
-        return
+    for file_path in args.file_path:
+        if not os.path.exists(file_path):
+            print(f"错误: 找不到文件 '{file_path}'")
+            return
 
     try:
-        # 3. 读取 CSV 数据
+        # 3. 读取数据（只读 time / f_z / base_z 三列）
         # 预期列名为: ['time', 'f_x', 'f_y', 'f_z', 'base_z']
-        data = pd.read_csv(args.file_path)
+        recordings = []
+        for file_path in args.file_path:
+            data = load_recording(file_path, args)
+            if 'time' not in data or 'f_z' not in data:
+                print(f"错误: {file_path} 格式不正确，缺少 'time' 或 'f_z' 列。")
+                return
+            recordings.append((os.path.basename(file_path), data))
 
-        if 'time' not in data.columns or 'f_z' not in data.columns:
-            print("错误: CSV 文件格式不正确，缺少 'time' 或 'f_z' 列。")
+        views = ["time", "displacement"] if args.view == "both" else [args.view]
+        if "displacement" in views and any('base_z' not in data for _, data in recordings):
+            print("错误: 力-位移视图需要 'base_z' 列。")
             return
 
         # 4. 绘图设置
-        plt.figure(figsize=(10, 6))
-        plt.plot(data['time'], data['f_z'], label='Vertical Force ($F_z$)', color='b', linewidth=1.5)
+        fig, axes = plt.subplots(1, len(views), figsize=(10 * len(views), 6), squeeze=False)
+        single = len(recordings) == 1
+        for ax, view in zip(axes[0], views):
+            for name, data in recordings:
+                label = 'Vertical Force ($F_z$)' if single else name
+                if view == "time":
+                    ax.plot(data['time'], data['f_z'], label=label, color='b' if single else None, linewidth=1.5)
+                else:
+                    # 下压位移 = 起始高度 - 当前 Base 高度
+                    displacement = data['base_z'][0] - data['base_z']
+                    ax.plot(displacement, data['f_z'], label=label, color='b' if single else None, linewidth=1.5)
 
-        # 5. 美化图表
-        plt.title(f"Force Response Analysis\nSource: {os.path.basename(args.file_path)}", fontsize=14)
-        plt.xlabel("Time (s)", fontsize=12)
-        plt.ylabel("Force $F_z$ (N)", fontsize=12)
-        plt.grid(True, linestyle='--', alpha=0.7)
-        plt.legend()
+            # 5. 美化图表
+            source = os.path.basename(args.file_path[0]) if single else f"{len(recordings)} recordings"
+            if view == "time":
+                ax.set_title(f"Force Response Analysis\nSource: {source}", fontsize=14)
+                ax.set_xlabel("Time (s)", fontsize=12)
+            else:
+                ax.set_title(f"Force-Displacement Curve\nSource: {source}", fontsize=14)
+                ax.set_xlabel("Displacement (m)", fontsize=12)
+            ax.set_ylabel("Force $F_z$ (N)", fontsize=12)
+            ax.grid(True, linestyle='--', alpha=0.7)
+            ax.legend()
 
         # 标注开始产生压力的点（可选）
         # 找到第一个 F_z 显著偏离 0 的点
-        threshold = 0.01 
-        contact_points = data[abs(data['f_z']) > threshold]
-        if not contact_points.empty:
-            first_contact_t = contact_points['time'].iloc[0]
-            first_contact_f = contact_points['f_z'].iloc[0]
-            # plt.annotate('Contact Start', xy=(first_contact_t, first_contact_f), 
+        threshold = 0.01
+        data = recordings[0][1]
+        contact_idx = np.flatnonzero(np.abs(data['f_z']) > threshold)
+        if len(contact_idx):
+            first_contact_t = data['time'][contact_idx[0]]
+            first_contact_f = data['f_z'][contact_idx[0]]
+            # plt.annotate('Contact Start', xy=(first_contact_t, first_contact_f),
                         #  xytext=(first_contact_t + 0.5, first_contact_f + 5),
                         #  arrowprops=dict(facecolor='black', shrink=0.05, width=1, headwidth=5))
 
         # 6. 显示图表
-        print(f"正在展示文件 {args.file_path} 的图表...")
+        plt.tight_layout()
+        print(f"正在展示文件 {', '.join(args.file_path)} 的图表...")
         plt.show()
 
     except Exception as e:
         print(f"读取或绘图时出错: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -12,18 +12,26 @@ df["err_rate"] = abs(df["fz"] - df["fz_theory"]) * 100 * (-1) / df["fz_theory"]
 # ===== Plot =====
 fig, ax1 = plt.subplots(figsize=(7, 4))
 
-l1, = ax1.plot(df["m"], df["fz"], marker="o", linewidth=1.5, label="Measured $f_z$")
-l2, = ax1.plot(df["m"], df["fz_theory"], marker="s", linewidth=1.5, label=r"Theory $f_z=-9.81 * \,mass$")
+# stiffness_sweep.py 扫描多个刚度时带 k 列，此时每个刚度画一条测量曲线
+groups = df.groupby("k") if "k" in df.columns and df["k"].nunique() > 1 else [(None, df)]
+measured = []
+for k, g_df in groups:
+    label = "Measured $f_z$" if k is None else f"Measured $f_z$ (k={k:g})"
+    ln, = ax1.plot(g_df["m"], g_df["fz"], marker="o", linewidth=1.5, label=label)
+    measured.append(ln)
+theory = df.drop_duplicates("m").sort_values("m")
+l2, = ax1.plot(theory["m"], theory["fz_theory"], marker="s", linewidth=1.5, label=r"Theory $f_z=-9.81 * \,mass$")
 
 ax1.set_xlabel("Mass $m$ (kg)")
 ax1.set_ylabel("Force $f_z$ (N)")
 ax1.grid(True, linestyle="--", linewidth=0.5, alpha=0.6)
 
 ax2 = ax1.twinx()
-l3, = ax2.plot(df["m"], df["err_rate"], marker="^", linewidth=1.5, label="Absolute error rate")
+l3, = ax2.plot(df["m"], df["err_rate"], marker="^", linestyle="none" if len(measured) > 1 else "-",
+               linewidth=1.5, label="Absolute error rate")
 ax2.set_ylabel("Absolute error rate %")
 
-lines = [l1, l2, l3]
+lines = measured + [l2, l3]
 labels = [ln.get_label() for ln in lines]
 ax1.legend(lines, labels, loc="best")
 
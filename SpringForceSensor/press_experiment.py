@@ -0,0 +1,229 @@
+# 压入实验的完整流程（场景、传感器、运动曲线、记录与在线分析），run.py 和常驻任务服务共用
+# 调用前需要已经启动 SimulationApp
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import sim_backend
+from common.columnar_log import ColumnarLog
+from SpringForceSensor import SpringForceSensor
+import motion_profile
+from force_analytics import ForceAnalytics, EVENT_FIELDS
+from experiment_runner import ExperimentRunner
+
+if sim_backend.is_fake():
+    from common.fake_sim import omni, UsdLux
+else:
+    from omni.physx.scripts import deformableUtils, physicsUtils
+    from pxr import UsdGeom, Gf, UsdLux
+    import omni.kit.commands
+    import omni.usd
+
+LOG_FIELDS = [
+    ("time", "f8", "%.4f"),
+    ("f_x", "f8"),
+    ("f_y", "f8"),
+    ("f_z", "f8"),
+    ("base_z", "f8", "%.4f"),
+]
+
+# run.py 顶部的默认配置，任务服务的 press 任务可以覆盖其中任意一项
+PRESS_DEFAULTS = {
+    # --- 运动参数 ---
+    "start_z": 1.35,
+    "delta_z": 0.2,
+    "speed": 0.005,
+    "wait_time": 5.0,
+    "hold_time": 5.0,
+    "profile_type": "trapezoidal",
+    "accel": None,
+    "cycles": 10,
+    "dwell_time": 1.0,
+    "profile_file": "",
+    # --- 传感器 ---
+    "stiffness": 1000.0,
+    # --- 记录 ---
+    "save_dir": os.path.expanduser("~/Documents/ExperimentalDataRaw/press"),
+    "log_format": "csv",
+    # --- 在线分析 ---
+    "lowpass_cutoff": 5.0,
+    "lowpass_order": 1,
+    "contact_on_threshold": 0.01,
+    "contact_off_threshold": 0.005,
+}
+
+
+def create_deformable_box_official_style(stage, target_path="/World/Sponge"):
+    _, tmp_path = omni.kit.commands.execute("CreateMeshPrim", prim_type="Cube", select_new_prim=False)
+    omni.kit.commands.execute("MovePrim", path_from=tmp_path, path_to=target_path)
+    mesh = UsdGeom.Mesh.Get(stage, target_path)
+    mesh.GetPrim().GetAttribute("xformOp:translate").Set(Gf.Vec3f(0.0, 0.0, 0.5))
+    mesh.GetPrim().GetAttribute("xformOp:scale").Set(Gf.Vec3f(1.0, 1.0, 1.0))
+    mesh.GetSubdivisionSchemeAttr().Set(UsdGeom.Tokens.catmullClark)
+
+    deformableUtils.add_physx_deformable_body(
+        stage, mesh.GetPath(),
+        collision_simplification=True,
+        simulation_hexahedral_resolution=50,
+        self_collision=False,
+    )
+
+    deformableUtils.add_deformable_body_material(
+        stage, target_path + "Material",
+        youngs_modulus=20000.0, poissons_ratio=0.45,
+        damping_scale=0.0, dynamic_friction=0.5,
+    )
+    physicsUtils.add_physics_material_to_prim(stage, mesh.GetPrim(), target_path + "Material")
+    return mesh
+
+
+def setup_press_scene(world):
+    """灯光、GPU 动力学、海绵和地面（fake 后端没有可变形体，只放地面）"""
+    stage = omni.usd.get_context().get_stage()
+    UsdLux.DomeLight.Define(stage, "/World/DomeLight").CreateIntensityAttr(1200.0)
+    UsdLux.DistantLight.Define(stage, "/World/DistantLight").CreateIntensityAttr(2000.0)
+
+    scene = world.get_physics_context()
+    scene.enable_gpu_dynamics(True)
+    # scene.set_solver_position_iteration_count(64) # 针对高精度变形强制增加 # invalid
+    scene.set_broadphase_type("GPU")
+
+    if sim_backend.is_fake():
+        print("--- fake 后端不支持可变形体，场景中没有海绵 ---")
+    else:
+        create_deformable_box_official_style(stage)
+    world.scene.add_default_ground_plane()
+
+
+def build_profile(settings, dt):
+    """在物理步长网格上预先生成整条运动曲线"""
+    s = settings
+    start_z, delta_z, speed = s["start_z"], s["delta_z"], s["speed"]
+    end_z = start_z - delta_z
+    timing = {"wait_time": s["wait_time"], "hold_time": s["hold_time"]}
+    if s["profile_type"] == "trapezoidal":
+        return motion_profile.trapezoidal(start_z, end_z, speed, dt, accel=s["accel"], **timing)
+    if s["profile_type"] == "s_curve":
+        return motion_profile.s_curve(start_z, end_z, delta_z / speed, dt, **timing)
+    if s["profile_type"] == "sinusoidal":
+        return motion_profile.sinusoidal(start_z, delta_z, speed / (2 * delta_z), s["cycles"], dt, **timing)
+    if s["profile_type"] == "cyclic":
+        return motion_profile.cyclic(start_z, end_z, speed, s["cycles"], dt, accel=s["accel"],
+                                     dwell_time=s["dwell_time"], **timing)
+    if s["profile_type"] == "file":
+        return motion_profile.from_file(s["profile_file"], dt, **timing)
+    raise ValueError(f"Unknown profile_type: {s['profile_type']}")
+
+
+def run_press(world, simulation_app, settings=None, render_interval=1, sample_interval=1, max_steps=None,
+              stop_after_profile=False, on_progress=None):
+    """
+    在 world 上搭建场景并执行一次压入实验，settings 覆盖 PRESS_DEFAULTS 中的项
+    stop_after_profile: 未指定 max_steps 时跑完整条曲线后停止（无界面/任务服务下使用）
+    on_progress(dict) 与终端打印同频调用；返回记录文件路径、力数据统计和运行统计
+    """
+    s = dict(PRESS_DEFAULTS, **(settings or {}))
+    start_z = s["start_z"]
+    end_z = start_z - s["delta_z"]
+
+    # 3. 执行场景搭建
+    setup_press_scene(world)
+
+    sensor = SpringForceSensor("/World/Sensor", stiffness=s["stiffness"], t_base=[0.0, 0.0, start_z])
+    # 每个物理步只计算一次读数（CSV 记录和终端打印共用）
+    sensor.attach_to_world(world)
+
+    # --- CSV 路径与命名 ---
+    save_dir = s["save_dir"]
+    if not os.path.exists(save_dir):
+        os.makedirs(save_dir)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_filename = os.path.join(save_dir, f"{timestamp}.{s['log_format']}")
+    events_filename = os.path.join(save_dir, f"{timestamp}_events.csv")
+
+    # 4. 重置世界
+    world.reset()
+
+    # 运动曲线保存在力数据旁边
+    dt = world.get_physics_dt()
+    profile = build_profile(s, dt)
+    profile.save(os.path.join(save_dir, f"{timestamp}_profile.csv"))
+
+    runner = ExperimentRunner(world, simulation_app, render_interval, sample_interval, max_steps)
+    if stop_after_profile and runner.max_steps is None:
+        runner.max_steps = len(profile)
+
+    print(f"--- 仿真准备就绪 ---")
+    print(f"模式：等待 {s['wait_time']}s 后开始运动并记录")
+    print(f"曲线：{s['profile_type']}，{start_z}m -> {end_z}m (总时长: {profile.duration:.2f}s)")
+
+    force_log = None
+    # 事件很少，每条立即落盘
+    event_log = ColumnarLog(events_filename, EVENT_FIELDS, fmt="csv", chunk_rows=1)
+    analytics = ForceAnalytics(dt * runner.sample_interval, cutoff_hz=s["lowpass_cutoff"],
+                               filter_order=s["lowpass_order"], on_threshold=s["contact_on_threshold"],
+                               off_threshold=s["contact_off_threshold"], event_log=event_log)
+    error = None
+
+    # 5. 主循环
+    try:
+        while runner.keep_running():
+            current_time = world.current_time
+
+            # --- 按步号直接取预先计算好的目标位置 ---
+            target_z, phase = profile.at_step(runner.step_count)
+            recording = phase != motion_profile.WAITING
+
+            # 更新位置（是否渲染由 render_interval 决定）
+            sensor.update_base_pose(position=(0, 0, target_z))
+            sampled = runner.step()
+
+            # --- 数据采集与记录逻辑 ---
+            # 仅在静止时间结束后、且为采样步时记录 CSV
+            if recording and sampled:
+                # 首次进入记录阶段时打开文件（行先缓冲在内存里，按块写盘）
+                if force_log is None:
+                    force_log = ColumnarLog(csv_filename, LOG_FIELDS, fmt=s["log_format"])
+                    print(f"--- 开始记录数据至: {csv_filename} ---")
+
+                f_geom = sensor.get_equivalent_force_geom()
+                # 记录相对于运动开始的时间（或者原始时间，取决于你的分析需求，这里用原始时间）
+                force_log.append((round(current_time, 4), f_geom[0], f_geom[1], f_geom[2], round(target_z, 4)))
+                analytics.update(current_time, f_geom)
+
+            # 终端打印
+            if int(current_time * 100) % 20 == 0:
+                f_val = sensor.get_equivalent_force_geom()[2] if recording else 0.0
+                contact = " | CONTACT" if analytics.in_contact else ""
+                print(f"[{motion_profile.PHASE_NAMES[phase]}] T: {current_time:.1f}s | Z: {target_z:.3f} | Fz: {f_val:.4f} N"
+                      f" | Fz(lp): {analytics.filtered[2]:.4f} N | Peak: {analytics.peak:.4f} N{contact}")
+                if on_progress is not None:
+                    on_progress({"time": current_time, "phase": motion_profile.PHASE_NAMES[phase],
+                                 "base_z": float(target_z), "f_z": float(f_val),
+                                 "f_z_filtered": float(analytics.filtered[2]), "in_contact": analytics.in_contact})
+
+    except Exception as e:
+        error = str(e)
+        print(f"错误: {e}")
+
+    finally:
+        if force_log:
+            force_log.close()
+        analytics.finish(world.current_time)
+        event_log.close()
+        analytics.print_summary()
+        stats = runner.report()
+
+    summary = analytics.summary()
+    summary["mean"] = summary["mean"].tolist()
+    summary["std"] = summary["std"].tolist()
+    return {
+        "csv": csv_filename if force_log else None,
+        "events": events_filename,
+        "analytics": {k: (float(v) if isinstance(v, np.floating) else v) for k, v in summary.items()},
+        "stats": stats,
+        "error": error,
+    }
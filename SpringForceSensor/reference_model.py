@@ -0,0 +1,136 @@
+# SpringForceSensor 的纯 NumPy 参考模型：运动学 Base + D6 平移驱动（弹簧阻尼）+ 探头质量 + 重力 + 可选接触
+# 参数网格沿第一维批量积分，用于在进 Isaac Sim 之前预筛参数，以及自动判定仿真结果是否发散
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.columnar_log import load_log
+
+GRAVITY = 9.81
+L_0 = 0.4            # 与 SpringForceSensor.l_0 一致：驱动目标为 Base 下方 l_0
+PROBE_RADIUS = 0.1   # 探头 Sphere 半径 1.0 * s_probe 0.1
+PHYSICS_DT = 1.0 / 60.0   # World 默认物理步长
+
+
+def make_grid(**axes):
+    """参数网格：make_grid(stiffness=[...], probe_mass=[...]) -> 每个键展平成 (P,) 数组"""
+    names = list(axes)
+    mesh = np.meshgrid(*[np.atleast_1d(np.asarray(axes[n], dtype=float)) for n in names], indexing="ij")
+    return {n: m.ravel() for n, m in zip(names, mesh)}
+
+
+def simulate(base_z, dt, stiffness=100.0, damping=10.0, probe_mass=0.0001, contact_stiffness=0.0,
+             contact_z=None, gravity=GRAVITY, substeps=1, probe_radius=PROBE_RADIUS):
+    """
+    base_z: (T,) 每个物理步的 Base 高度；dt: 物理步长
+    stiffness / damping / probe_mass / contact_stiffness: 标量或 (P,) 数组，广播成 P 组参数同时积分
+    contact_z: 接触面高度，探头最低点低于它时受到 contact_stiffness * 穿透深度 的向上的力（None 为无接触）
+
+    驱动为 force 型 D6 drive：F = -k * (z_ee - z_base + l_0) - c * (v_ee - v_base)
+    与 PhysX 一样用隐式欧拉（对线性弹簧/阻尼和当前接触状态隐式求解速度），大刚度下也不会数值发散
+    返回 dict: time (T,), base_z (T,), ee_z (P, T), f_z (P, T)；f_z 与 get_equivalent_force_geom()[2] 同号同义
+    """
+    base_z = np.asarray(base_z, dtype=float)
+    k, c, m, kc = np.broadcast_arrays(*[np.atleast_1d(np.asarray(v, dtype=float))
+                                         for v in (stiffness, damping, probe_mass, contact_stiffness)])
+    n_steps = len(base_z)
+    h = dt / substeps
+
+    # 初值：Base 静止时的静平衡位置
+    z = base_z[0] - L_0 - m * gravity / k
+    v = np.zeros_like(z)
+    ee_z = np.empty((len(k), n_steps))
+    ee_z[:, 0] = z
+
+    for i in range(1, n_steps):
+        zb0, zb1 = base_z[i - 1], base_z[i]
+        vb = (zb1 - zb0) / dt
+        for s in range(substeps):
+            zb = zb0 + (zb1 - zb0) * (s + 1) / substeps
+            if contact_z is None:
+                kc_active = 0.0
+                contact_force = 0.0
+            else:
+                kc_active = np.where(z - probe_radius < contact_z, kc, 0.0)
+                contact_force = kc_active * (contact_z + probe_radius - z)
+            # m (v' - v) = h * [-k (z + h v' - zb + l_0) - c (v' - vb) - m g + kc (zc + r - z - h v')]
+            rhs = m * v + h * (-k * (z - zb + L_0) + c * vb - m * gravity + contact_force)
+            v = rhs / (m + h * c + h * h * (k + kc_active))
+            z = z + h * v
+        ee_z[:, i] = z
+
+    f_z = (ee_z - base_z + L_0) * k[:, None]
+    return {"time": np.arange(n_steps) * dt, "base_z": base_z, "ee_z": ee_z, "f_z": f_z}
+
+
+def to_run_table(result, index=0, time_offset=0.0):
+    """取出第 index 组参数的结果，转成与 run.py 记录相同字段的结构化数组（time, f_x, f_y, f_z, base_z）"""
+    n = len(result["time"])
+    table = np.zeros(n, dtype=[("time", "f8"), ("f_x", "f8"), ("f_y", "f8"), ("f_z", "f8"), ("base_z", "f8")])
+    table["time"] = result["time"] + time_offset
+    table["f_z"] = result["f_z"][index]
+    table["base_z"] = result["base_z"]
+    return table
+
+
+def compare_run(path, stiffness, damping, probe_mass, contact_stiffness=0.0, contact_z=None, substeps=1,
+                rtol=0.05, atol=1e-3, dt=PHYSICS_DT, sample_interval=1):
+    """
+    用 run.py 记录里的 base_z 驱动参考模型，与记录的 f_z 比较（可传入参数网格，逐组给出误差）
+    dt / sample_interval: 仿真的物理步长和 run.py 的 --sample-interval。记录的时间间隔必须等于 dt * sample_interval，
+    否则抛出 ValueError；模型始终按物理步长积分（采样之间的 base_z 线性插值），再取采样步与记录比较
+    diverged: 记录中出现非有限值，或 RMS 误差 > rtol * max|f_model| + atol
+    """
+    table = load_log(path)
+    t, fz, base_z = table["time"], table["f_z"], table["base_z"]
+    # 时间列保留 4 位小数，比较时留出舍入误差
+    log_dt = float(np.median(np.diff(t)))
+    if not np.isclose(log_dt, dt * sample_interval, rtol=1e-3, atol=2e-4):
+        raise ValueError(f"{path} is sampled every {log_dt:g}s, expected dt * sample_interval = "
+                         f"{dt * sample_interval:g}s; pass the run's physics dt and --sample-interval")
+    steps = np.arange((len(t) - 1) * sample_interval + 1)
+    base_z_steps = np.interp(steps, steps[::sample_interval], base_z)
+    result = simulate(base_z_steps, dt, stiffness, damping, probe_mass, contact_stiffness, contact_z,
+                      substeps=substeps)
+    result = {"time": t, "base_z": base_z, "ee_z": result["ee_z"][:, ::sample_interval],
+              "f_z": result["f_z"][:, ::sample_interval]}
+
+    err = result["f_z"] - fz
+    rms = np.sqrt(np.mean(err ** 2, axis=1))
+    max_err = np.max(np.abs(err), axis=1)
+    scale = np.max(np.abs(result["f_z"]), axis=1)
+    finite = bool(np.all(np.isfinite(fz)))
+    diverged = np.logical_or(not finite, rms > rtol * scale + atol)
+    return {"rms": rms, "max_error": max_err, "diverged": diverged, "model": result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="用参考模型复核 run.py 的力记录")
+    parser.add_argument("file_path", type=str, help="run.py 输出的 .csv/.npy/.npz")
+    parser.add_argument("--stiffness", type=float, nargs="+", default=[1000.0])
+    parser.add_argument("--damping", type=float, nargs="+", default=[10.0])
+    parser.add_argument("--probe-mass", type=float, nargs="+", default=[0.0001])
+    parser.add_argument("--contact-stiffness", type=float, nargs="+", default=[0.0])
+    parser.add_argument("--contact-z", type=float, default=None, help="接触面高度，不指定则不考虑接触")
+    parser.add_argument("--substeps", type=int, default=1)
+    parser.add_argument("--rtol", type=float, default=0.05)
+    parser.add_argument("--dt", type=float, default=PHYSICS_DT, help="仿真的物理步长")
+    parser.add_argument("--sample-interval", type=int, default=1, help="run.py 记录时的 --sample-interval")
+    args = parser.parse_args()
+
+    grid = make_grid(stiffness=args.stiffness, damping=args.damping, probe_mass=args.probe_mass,
+                     contact_stiffness=args.contact_stiffness)
+    res = compare_run(args.file_path, grid["stiffness"], grid["damping"], grid["probe_mass"],
+                      grid["contact_stiffness"], args.contact_z, args.substeps, args.rtol,
+                      dt=args.dt, sample_interval=args.sample_interval)
+    for i in range(len(grid["stiffness"])):
+        flag = "DIVERGED" if res["diverged"][i] else "OK"
+        print(f"[{flag}] k={grid['stiffness'][i]:g} c={grid['damping'][i]:g} m={grid['probe_mass'][i]:g} "
+              f"kc={grid['contact_stiffness'][i]:g} | RMS: {res['rms'][i]:.4g} N | Max: {res['max_error'][i]:.4g} N")
+
+
+if __name__ == "__main__":
+    main()
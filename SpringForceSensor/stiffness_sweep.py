@@ -0,0 +1,134 @@
+# 刚度标定扫描：在同一个 SimulationApp 里遍历 (stiffness, mass)，每组稳定后记录一行
+# 输出 Data_recording.csv，列名与 plot_sensor_verification.py 读取的一致 (m, fz, ...)
+# run_sweep 与常驻任务服务 (common/sim_server.py) 的 stiffness 任务共用
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import sim_backend
+from common.columnar_log import ColumnarLog
+from experiment_runner import ExperimentRunner, SettleDetector, parse_args, run_until_settled
+
+# --- 扫描参数配置 ---
+masses = [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0]
+stiffness_values = [1000.0]
+start_z = 3.0
+max_case_steps = 6000        # 单组最多步数，超过仍未稳定则照常记录并标记 settled=0
+
+# 判稳：最近 settle_window 个采样的 fz 标准差 <= abs_tol + rel_tol * |mean|
+settle_window = 60
+settle_abs_tol = 1e-4
+settle_rel_tol = 1e-4
+
+output_csv = "./Data_recording.csv"
+RESULT_FIELDS = [
+    ("m", "f8", "%.6f"),
+    ("fx", "f8", "%.6f"),
+    ("fy", "f8", "%.6f"),
+    ("fz", "f8", "%.6f"),
+    ("k", "f8", "%.1f"),
+    ("steps", "i8"),
+    ("fz_std", "f8", "%.3e"),
+    ("settled", "i1"),
+]
+
+
+def setup_sweep_scene(world):
+    """灯光、GPU 动力学和地面（omni / pxr 要在 SimulationApp 启动之后导入）"""
+    if sim_backend.is_fake():
+        from common.fake_sim import omni, UsdLux
+    else:
+        import omni.usd
+        from pxr import UsdLux
+
+    stage = omni.usd.get_context().get_stage()
+    UsdLux.DomeLight.Define(stage, "/World/DomeLight").CreateIntensityAttr(1200.0)
+    UsdLux.DistantLight.Define(stage, "/World/DistantLight").CreateIntensityAttr(2000.0)
+
+    scene = world.get_physics_context()
+    scene.enable_gpu_dynamics(True)
+    scene.set_broadphase_type("GPU")
+
+    world.scene.add_default_ground_plane()
+
+
+def run_sweep(world, simulation_app, stiffness_values, masses, start_z=3.0, max_case_steps=6000,
+              render_interval=0, sample_interval=1, max_steps=None, settle_window=60, abs_tol=1e-4, rel_tol=1e-4,
+              output_csv=None, on_progress=None):
+    """
+    在 world 上搭建场景并逐组运行：改参数 -> 重置世界 -> 步进到 fz 稳定
+    output_csv: 给定时每组结果立即追加一行 (RESULT_FIELDS)；on_progress(row) 在每组结束后调用
+    返回每组结果 rows、运行统计和错误信息
+    """
+    from SpringForceSensor import SpringForceSensor
+
+    setup_sweep_scene(world)
+    sensor = SpringForceSensor("/World/Sensor", stiffness=stiffness_values[0], probe_mass=masses[0],
+                               t_base=[0.0, 0.0, start_z])
+    sensor.attach_to_world(world)
+
+    runner = ExperimentRunner(world, simulation_app, render_interval, sample_interval, max_steps)
+    detector = SettleDetector(settle_window, abs_tol, rel_tol)
+    cases = [(k, m) for k in stiffness_values for m in masses]
+    print(f"--- 开始扫描：{len(cases)} 组 (stiffness x mass) ---")
+
+    # chunk_rows=1：每组结果立即落盘，中途退出也不会丢
+    results = ColumnarLog(output_csv, RESULT_FIELDS, fmt="csv", chunk_rows=1) if output_csv else None
+    rows = []
+    error = None
+    try:
+        for case_idx, (k, m) in enumerate(cases):
+            if not runner.keep_running():
+                break
+            sensor.set_parameters(stiffness=k, probe_mass=m)
+            sensor.update_base_pose(position=(0.0, 0.0, start_z))
+            world.reset()
+            detector.reset()
+
+            f_geom, case_steps = run_until_settled(runner, sensor.get_equivalent_force_geom, detector,
+                                                   max_case_steps)
+
+            settled = detector.settled
+            row = {"m": m, "fx": float(f_geom[0]), "fy": float(f_geom[1]), "fz": float(detector.mean), "k": k,
+                   "steps": case_steps, "fz_std": detector.std, "settled": settled}
+            rows.append(row)
+            if results is not None:
+                results.append((m, f_geom[0], f_geom[1], detector.mean, k, case_steps, detector.std, int(settled)))
+            if on_progress is not None:
+                on_progress(row)
+            print(f"[{case_idx + 1}/{len(cases)}] k={k:.1f} m={m:.3f} | Fz: {detector.mean:.6f} N "
+                  f"(理论 {-9.81 * m:.6f}) | std: {detector.std:.2e} | steps: {case_steps}"
+                  + ("" if settled else " | 未稳定"))
+
+    except Exception as e:
+        error = str(e)
+        print(f"错误: {e}")
+
+    finally:
+        if results is not None:
+            results.close()
+        stats = runner.report()
+
+    return {"rows": rows, "csv": output_csv, "stats": stats, "error": error}
+
+
+def main():
+    # 1. 启动 App（标定不需要画面，默认不渲染；--backend fake 在 CPU 替身上运行）
+    args = parse_args("Stiffness calibration sweep", render_interval=0, backend=True)
+    simulation_app = sim_backend.create_app({"headless": args.headless})
+
+    # 2. 初始化世界
+    world = sim_backend.create_world(stage_units_in_meters=1.0)
+
+    # 3. 逐组运行
+    try:
+        run_sweep(world, simulation_app, stiffness_values, masses, start_z, max_case_steps,
+                  args.render_interval, args.sample_interval, args.max_steps,
+                  settle_window, settle_abs_tol, settle_rel_tol, output_csv=output_csv)
+    finally:
+        print(f"--- 扫描完成，结果已保存至: {output_csv} ---")
+        simulation_app.close()
+
+
+if __name__ == "__main__":
+    main()
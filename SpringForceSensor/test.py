@@ -3,9 +3,11 @@ from isaacsim import SimulationApp
 import os
 import csv
 from datetime import datetime
+from experiment_runner import ExperimentRunner, parse_args
 
-# 1. 启动 App
-simulation_app = SimulationApp({"headless": False})
+# 1. 启动 App（--headless / --render-interval / --sample-interval / --max-steps）
+args = parse_args()
+simulation_app = SimulationApp({"headless": args.headless})
 
 from SpringForceSensor import SpringForceSensor
 import isaacsim.core.utils.prims as prim_utils
@@ -32,17 +34,18 @@ world.scene.add_default_ground_plane()
 sensor = SpringForceSensor("/World/Sensor")
 
 world.reset()
+runner = ExperimentRunner.from_args(world, simulation_app, args)
 
 try:
-    i = 0
-    while simulation_app.is_running():
-        world.step(render=True)
-        i += 1
+    while runner.keep_running():
+        runner.step()
+        i = runner.step_count
         if i%100 == 0:
             print(f"watchdog output: {i}")
 
 except Exception as e:
     print(f"错误: {e}")
 finally:
+    runner.report()
     print("Done")
     simulation_app.close()
\ No newline at end of file
@@ -2,9 +2,12 @@ from isaacsim import SimulationApp
 import os
 import csv
 from datetime import datetime
+from experiment_runner import ExperimentRunner, parse_args
 
-# 1. 启动 App
-simulation_app = SimulationApp({"headless": False})
+# 1. 启动 App（--headless / --render-interval / --sample-interval / --max-steps）
+# 默认每 100 步读一次力，与原先的打印频率一致
+args = parse_args(sample_interval=100)
+simulation_app = SimulationApp({"headless": args.headless})
 
 from SpringForceSensor import SpringForceSensor
 import isaacsim.core.utils.prims as prim_utils
@@ -33,15 +36,16 @@ probe_mass = 3.5
 sensor = SpringForceSensor("/World/Sensor", probe_mass = probe_mass)
 
 world.reset()
+runner = ExperimentRunner.from_args(world, simulation_app, args)
 
 try:
-    i = 0
-    while simulation_app.is_running():
-        world.step(render=True)
-        i += 1
+    while runner.keep_running():
+        sampled = runner.step()
+        i = runner.step_count
         if i%100 == 0:
             print(f"watchdog output: {i}")
 
+        if sampled:
             measured_f = sensor.get_equivalent_force_geom()
 
             # print(f"传感器力: {measured_f} N")
@@ -53,5 +57,6 @@ try:
 except Exception as e:
     print(f"错误: {e}")
 finally:
+    runner.report()
     print("Done")
     simulation_app.close()
\ No newline at end of file
@@ -0,0 +1 @@
+# 两个项目（stereo-simulation-dataset / SpringForceSensor）共用的模块
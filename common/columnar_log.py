@@ -0,0 +1,146 @@
+import os
+import atexit
+import numpy as np
+
+# .npy 头部按最大行数预留固定长度，这样每次刷盘只需原地改写行数，文件始终是合法的 .npy
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_MAX_ROWS = 10 ** 18
+
+
+def _npy_header_dict(dtype, num_rows):
+    return "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        np.lib.format.dtype_to_descr(dtype), num_rows)
+
+
+def _npy_header_len(dtype):
+    """能容纳任意行数的头部总长度（按 64 字节对齐）"""
+    base = len(NPY_MAGIC) + 2 + len(_npy_header_dict(dtype, _MAX_ROWS)) + 1
+    return (base + 63) // 64 * 64
+
+
+def _npy_header(dtype, num_rows, total_len):
+    header = _npy_header_dict(dtype, num_rows)
+    pad = total_len - len(NPY_MAGIC) - 2 - len(header) - 1
+    header = (header + " " * pad + "\n").encode("latin1")
+    return NPY_MAGIC + np.uint16(len(header)).tobytes() + header
+
+
+def _csv_formatter(fmt, dtype):
+    """单列的文本格式：显式 % 格式 > 整数 str > float64 的最短 repr（float32 按自身精度取最短表示）"""
+    if fmt is not None:
+        return lambda value: fmt % value
+    if dtype.kind == "f" and dtype.itemsize < 8:
+        return lambda value: str(dtype.type(value))
+    if dtype.kind == "f":
+        return repr
+    return str
+
+
+class ColumnarLog:
+    """
+    缓冲式列存日志：行先写进预分配的 NumPy 结构化数组，攒满 chunk_rows 行再整块写盘
+    fields: [(name, dtype) 或 (name, dtype, csv_fmt), ...]，每列必须是标量
+            没有 csv_fmt 的浮点列按最短往返表示 (repr) 写出，与 csv.writer 写 float 的结果相同
+    fmt:
+      "csv" - 文本 CSV（带表头），append=True 时续写已有文件
+      "npy" - 结构化 .npy，每次刷盘后更新头部行数，崩溃时已刷盘的行仍可读取
+      "npz" - 运行期间同 npy 写到 <path>.partial.npy，close() 时转成按列存储的 .npz
+    进程退出时会自动 close()，未刷盘的缓冲不会丢失
+    """
+
+    def __init__(self, path, fields, fmt="csv", chunk_rows=4096, append=False):
+        self.path = path
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+
+        self.dtype = np.dtype([(f[0], f[1]) for f in fields])
+        self.names = list(self.dtype.names)
+        self._csv_formatters = [_csv_formatter(f[2] if len(f) > 2 else None, np.dtype(f[1])) for f in fields]
+
+        self._buffer = np.zeros(chunk_rows, dtype=self.dtype)
+        self._count = 0
+        self.rows_written = 0
+        self.closed = False
+
+        if fmt == "csv":
+            has_data = append and os.path.exists(path) and os.path.getsize(path) > 0
+            self._file = open(path, "a" if append else "w", newline="")
+            if not has_data:
+                self._file.write(",".join(self.names) + "\n")
+                self._file.flush()
+        elif fmt in ("npy", "npz"):
+            if append:
+                raise ValueError("append is only supported for the csv format")
+            self._bin_path = path if fmt == "npy" else path + ".partial.npy"
+            self._header_len = _npy_header_len(self.dtype)
+            self._file = open(self._bin_path, "wb")
+            self._file.write(_npy_header(self.dtype, 0, self._header_len))
+            self._file.flush()
+        else:
+            raise ValueError(f"Unknown log format: {fmt}")
+
+        atexit.register(self.close)
+
+    def append(self, row):
+        """追加一行（按 fields 顺序的序列），返回本次是否触发了刷盘"""
+        self._buffer[self._count] = tuple(row)
+        self._count += 1
+        if self._count == self.chunk_rows:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        """把缓冲区中的行整块写盘"""
+        if self._count == 0 or self.closed:
+            return
+        chunk = self._buffer[:self._count]
+        if self.fmt == "csv":
+            self._file.write("".join(
+                ",".join(fmt(value) for fmt, value in zip(self._csv_formatters, row)) + "\n"
+                for row in chunk.tolist()
+            ))
+        else:
+            # 先追加数据，再回写头部行数
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(chunk.tobytes())
+            self._file.seek(0)
+            self._file.write(_npy_header(self.dtype, self.rows_written + self._count, self._header_len))
+        self._file.flush()
+        self.rows_written += self._count
+        self._count = 0
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self._file.close()
+        self.closed = True
+        atexit.unregister(self.close)
+
+        if self.fmt == "npz":
+            table = np.load(self._bin_path)
+            np.savez(self.path, **{name: table[name] for name in self.names})
+            os.remove(self._bin_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_log(path):
+    """读取 ColumnarLog 写出的 .csv / .npy / .npz，统一返回结构化数组"""
+    if path.endswith(".npy"):
+        return np.load(path)
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            names = list(data.files)
+            table = np.zeros(len(data[names[0]]), dtype=[(n, data[n].dtype) for n in names])
+            for n in names:
+                table[n] = data[n]
+        return table
+    # dtype=None 按列推断类型，字符串列（如事件名）不会被读成 nan
+    return np.genfromtxt(path, delimiter=",", names=True, ndmin=1, dtype=None, encoding="utf-8")
+
@@ -0,0 +1,320 @@
+# Isaac Sim 环境清单：启动一次 SimulationApp，收集所有扩展的 ID / 版本 / 路径和关键模块的成员，写入 JSON 缓存
+# 之后的查询（"有没有 StereoCamera？" "physx 是哪个版本？"）直接读缓存，不需要启动仿真器
+# 缓存按安装路径 + 构建指纹 (VERSION 内容和构建产物的 mtime) 区分，Isaac Sim 重新编译或换安装目录后自动失效，
+# 下次查询时重新收集（指纹只看两层目录，见 build_fingerprint）
+#
+#   ~/isaacsim/_build/linux-x86_64/release/python.sh common/env_inventory.py collect
+#   python common/env_inventory.py ext omni.physx
+#   python common/env_inventory.py has isaacsim.sensors.camera StereoCamera
+#
+# 其他脚本可以用 has_member() / extension_info() 选择 API 分支，而不用先导入重量级模块
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import subprocess
+import sys
+import time
+from importlib.util import find_spec
+
+DEFAULT_INSTALL = os.path.expanduser("~/isaacsim/_build/linux-x86_64/release")
+CACHE_FILE = os.environ.get("ISAACSIM_INVENTORY",
+                            os.path.expanduser("~/.cache/isaacsim_wks/env_inventory.json"))
+
+# 记录成员列表的模块（其余模块只能在收集时通过 --module 追加）
+KEY_MODULES = [
+    "isaacsim.core.api",
+    "isaacsim.core.prims",
+    "isaacsim.core.utils.prims",
+    "isaacsim.core.utils.rotations",
+    "isaacsim.sensors.camera",
+    "omni.physx.scripts.deformableUtils",
+    "omni.physx.scripts.physicsUtils",
+]
+
+# 这些文件/目录（及目录下一层条目）的 mtime 任一变化都视为重新构建
+_BUILD_MARKERS = ["VERSION", "kit", "exts", "extscache", "python_packages"]
+_VERSION_FILE = "VERSION"
+
+
+def find_install_path():
+    """Isaac Sim 安装目录：python.sh 设置的 ISAAC_PATH > isaacsim 包所在位置 > 默认源码编译目录"""
+    if os.environ.get("ISAAC_PATH"):
+        return os.path.realpath(os.environ["ISAAC_PATH"])
+    try:
+        # 只查找包的位置，不执行 isaacsim/__init__.py
+        spec = find_spec("isaacsim")
+    except (ImportError, ValueError):
+        spec = None
+    if spec is not None and spec.origin:
+        path = os.path.dirname(os.path.realpath(spec.origin))
+        while path != os.path.dirname(path):
+            if os.path.isdir(os.path.join(path, "kit")):
+                return path
+            path = os.path.dirname(path)
+    return os.path.realpath(DEFAULT_INSTALL)
+
+
+def _newest_mtime(path):
+    """文件的 mtime；目录取自身和直接子条目中最新的 mtime"""
+    mtime = os.stat(path).st_mtime
+    if os.path.isdir(path):
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    mtime = max(mtime, entry.stat(follow_symlinks=False).st_mtime)
+                except OSError:
+                    pass
+    return mtime
+
+
+def build_fingerprint(install_path):
+    """
+    构建指纹 "VERSION 内容哈希:最新 mtime"，安装目录里没有任何标记时返回 None
+    mtime 取各标记文件/目录及其直接子条目（如 exts/<ext>/）中最新的一个：子条目目录的 mtime 在其中增删、
+    替换文件时更新，所以重新编译改写扩展目录内的文件也能察觉。
+    限制：只原地改写更深层的文件（不改变 exts/<ext>/ 的直接条目，VERSION 也不变）时指纹不变，需要手动 collect
+    """
+    mtimes = [_newest_mtime(os.path.join(install_path, name)) for name in _BUILD_MARKERS
+              if os.path.exists(os.path.join(install_path, name))]
+    if not mtimes:
+        return None
+    version_hash = ""
+    version_path = os.path.join(install_path, _VERSION_FILE)
+    if os.path.isfile(version_path):
+        with open(version_path, "rb") as f:
+            version_hash = hashlib.sha1(f.read()).hexdigest()[:12]
+    return f"{version_hash}:{max(mtimes)!r}"
+
+
+def _read_cache():
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(install_path, inventory):
+    cache = _read_cache()
+    cache[install_path] = inventory
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    # 先写临时文件再替换，并发查询不会读到写了一半的 JSON
+    tmp = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp, CACHE_FILE)
+
+
+def load(install_path=None):
+    """读取缓存，不存在或已过期（构建指纹变化）时返回 None，不会启动仿真器"""
+    install_path = install_path or find_install_path()
+    inventory = _read_cache().get(install_path)
+    if inventory is None or inventory.get("build_fingerprint") != build_fingerprint(install_path):
+        return None
+    return inventory
+
+
+# --- 收集（需要 Isaac Sim 的 python.sh）---
+def _version_str(ext):
+    version = ext.get("version")
+    if isinstance(version, (list, tuple)):
+        return ".".join(str(v) for v in version[:3] if v != "")
+    if version:
+        return str(version)
+    # ID 形如 omni.physx-107.3.26
+    ext_id = ext.get("id", "")
+    return ext_id.split("-", 1)[1] if "-" in ext_id else None
+
+
+def _collect_extensions(manager):
+    """
+    {扩展名: 信息}；同名扩展有多个版本（如 extscache 里的旧版本）时取已启用的那个，
+    都未启用时取列出的第一个，全部版本的 ID 记在 all_ids 里
+    """
+    extensions = {}
+    for ext in manager.get_extensions():
+        name = ext.get("name") or ext["id"].split("-", 1)[0]
+        info = {
+            "id": ext.get("id"),
+            "version": _version_str(ext),
+            "path": ext.get("path"),
+            "enabled": bool(ext.get("enabled")),
+        }
+        prev = extensions.get(name)
+        info["all_ids"] = (prev["all_ids"] if prev else []) + [info["id"]]
+        if prev is not None and (prev["enabled"] or not info["enabled"]):
+            prev["all_ids"] = info["all_ids"]
+            continue
+        extensions[name] = info
+    return extensions
+
+
+def _member_kind(obj):
+    if inspect.isclass(obj):
+        return "class"
+    if inspect.isfunction(obj) or inspect.isbuiltin(obj):
+        return "function"
+    if inspect.ismodule(obj):
+        return "module"
+    return "other"
+
+
+def _collect_module(name):
+    try:
+        module = importlib.import_module(name)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    members = {}
+    for attr in dir(module):
+        if attr.startswith("_"):
+            continue
+        try:
+            members[attr] = _member_kind(getattr(module, attr))
+        except Exception:
+            members[attr] = "other"
+    return {"file": getattr(module, "__file__", None), "members": members}
+
+
+def collect(modules=None):
+    """启动无界面 SimulationApp 收集清单并写入缓存，返回清单"""
+    install_path = find_install_path()
+    t0 = time.perf_counter()
+
+    from isaacsim import SimulationApp
+    simulation_app = SimulationApp({"headless": True})
+    try:
+        import omni.kit.app
+        app = omni.kit.app.get_app_interface()
+        inventory = {
+            "install_path": install_path,
+            "build_fingerprint": build_fingerprint(install_path),
+            "collected_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "kit_version": app.get_build_version(),
+            "extensions": _collect_extensions(app.get_extension_manager()),
+            "modules": {name: _collect_module(name) for name in (modules or KEY_MODULES)},
+        }
+        try:
+            from isaacsim.core.version import get_version
+            inventory["isaacsim_version"] = ".".join(str(v) for v in get_version()[:3])
+        except Exception:
+            inventory["isaacsim_version"] = None
+    finally:
+        simulation_app.close()
+
+    _write_cache(install_path, inventory)
+    print(f"--- Inventory: {len(inventory['extensions'])} extensions, {len(inventory['modules'])} modules "
+          f"({time.perf_counter() - t0:.1f}s) -> {CACHE_FILE} ---")
+    return inventory
+
+
+def get_inventory(refresh=False, collect_if_missing=True):
+    """
+    优先读缓存；缓存缺失/过期时在子进程里收集一次（当前进程不受 SimulationApp 影响）
+    需要在 Isaac Sim 的 python.sh 下运行，或者 isaacsim 可导入；collect_if_missing=False 时直接返回 None
+    """
+    install_path = find_install_path()
+    inventory = None if refresh else load(install_path)
+    if inventory is None and collect_if_missing:
+        python = sys.executable
+        if find_spec("isaacsim") is None and os.path.exists(os.path.join(install_path, "python.sh")):
+            python = os.path.join(install_path, "python.sh")
+        print(f"--- Inventory cache missing or stale, collecting with {python} ---")
+        if subprocess.run([python, os.path.abspath(__file__), "collect"]).returncode != 0:
+            raise RuntimeError(f"Inventory collection failed for {install_path}; run `collect` with python.sh")
+        inventory = load(install_path)
+    return inventory
+
+
+# --- 查询 ---
+def extension_info(name, inventory=None):
+    """{"id", "version", "path", "enabled", "all_ids"}（多版本时为已启用的那个），扩展不存在时返回 None"""
+    inventory = inventory or get_inventory()
+    return inventory["extensions"].get(name)
+
+
+def module_members(module, inventory=None):
+    """{成员名: class/function/module/other}；模块不在清单里返回 None，导入失败返回 {}"""
+    inventory = inventory or get_inventory()
+    entry = inventory["modules"].get(module)
+    if entry is None:
+        return None
+    return entry.get("members", {})
+
+
+def has_member(module, member, inventory=None):
+    """模块里是否有该成员；模块没有被收集时返回 None（未知）"""
+    members = module_members(module, inventory)
+    return None if members is None else member in members
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cached Isaac Sim environment inventory")
+    parser.add_argument("--no-collect", action="store_true", help="缓存缺失时不启动仿真器，直接报错")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_collect = sub.add_parser("collect", help="启动一次 SimulationApp 重新收集（需要 python.sh）")
+    p_collect.add_argument("--module", action="append", default=[], help="额外记录成员的模块")
+    sub.add_parser("show", help="打印版本和缓存信息")
+    p_ext = sub.add_parser("ext", help="扩展的 ID / 版本 / 路径")
+    p_ext.add_argument("name")
+    p_members = sub.add_parser("members", help="模块成员列表")
+    p_members.add_argument("module")
+    p_members.add_argument("--kind", default=None, choices=["class", "function", "module", "other"])
+    p_has = sub.add_parser("has", help="模块里是否有某个成员（退出码 0 = 有）")
+    p_has.add_argument("module")
+    p_has.add_argument("member")
+    args = parser.parse_args()
+
+    if args.command == "collect":
+        collect(KEY_MODULES + [m for m in args.module if m not in KEY_MODULES])
+        return
+
+    t0 = time.perf_counter()
+    try:
+        inventory = get_inventory(collect_if_missing=not args.no_collect)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    if inventory is None:
+        sys.exit(f"No valid inventory for {find_install_path()} in {CACHE_FILE}; run `collect` with python.sh")
+
+    if args.command == "show":
+        print(f"Install: {inventory['install_path']}")
+        print(f"Isaac Sim: {inventory.get('isaacsim_version')} | Kit: {inventory.get('kit_version')} "
+              f"| Python: {inventory.get('python')}")
+        enabled = sum(ext["enabled"] for ext in inventory["extensions"].values())
+        print(f"Extensions: {len(inventory['extensions'])} ({enabled} enabled) | collected at {inventory['collected_at']}")
+        for name, entry in sorted(inventory["modules"].items()):
+            print(f" - {name}: " + (entry["error"] if "error" in entry else f"{len(entry['members'])} members"))
+    elif args.command == "ext":
+        info = extension_info(args.name, inventory)
+        if info is None:
+            sys.exit(f"{args.name} not found")
+        print(f"--- Component Info ---")
+        print(f"Extension ID: {info['id']}")
+        print(f"Version: {info['version']}")
+        print(f"Path: {info['path']}")
+        print(f"Enabled: {info['enabled']}")
+        if len(info.get("all_ids", [])) > 1:
+            print(f"All versions: {', '.join(info['all_ids'])}")
+    elif args.command == "members":
+        members = module_members(args.module, inventory)
+        if members is None:
+            sys.exit(f"{args.module} not in inventory; add it with `collect --module {args.module}`")
+        for name, kind in sorted(members.items()):
+            if args.kind is None or kind == args.kind:
+                print(f" - {name} ({kind})")
+    elif args.command == "has":
+        found = has_member(args.module, args.member, inventory)
+        if found is None:
+            sys.exit(f"{args.module} not in inventory; add it with `collect --module {args.module}`")
+        print(f"{args.module}.{args.member}: {'found' if found else 'missing'}")
+        if not found:
+            sys.exit(1)
+    print(f"({(time.perf_counter() - t0) * 1000:.1f} ms from cache)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,553 @@
+# 纯 NumPy 的 Isaac Sim 替身：只实现本仓库用到的那部分接口
+#   SimulationApp / World (step, current_time, reset, 物理回调) / prim_utils.create_prim / UsdLux 灯光
+#   omni.usd.get_world_transform_matrix / Camera (位姿, get_rgba, get_depth, get_intrinsics_matrix) / CameraView (批量位姿和抓图)
+# Camera 对 stage 上的 Sphere / Cube / 地面做光线投射，输出确定性的合成图像；
+# SpringForceSensor 的弹簧关节按 D6 force drive 的弹簧阻尼方程在 World.step 中积分
+# 通过 common/sim_backend.py 选择，不要直接在业务代码里导入
+import re
+from types import SimpleNamespace
+
+import numpy as np
+
+GRAVITY = np.array([0.0, 0.0, -9.81])
+
+
+def _quat_to_rot(q):
+    """[w, x, y, z] -> 3x3 旋转矩阵（列向量约定）"""
+    w, x, y, z = np.asarray(q, dtype=float) / np.linalg.norm(q)
+    return np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+        [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+        [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+    ])
+
+
+def _rotate_xyz(deg):
+    """USD rotateXYZ（先绕 X，再 Y，再 Z）的旋转矩阵（列向量约定）"""
+    rx, ry, rz = np.radians(deg)
+    cx, sx, cy, sy, cz, sz = np.cos(rx), np.sin(rx), np.cos(ry), np.sin(ry), np.cos(rz), np.sin(rz)
+    mx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    my = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    mz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return mz @ my @ mx
+
+
+# ---------------------------------------------------------------- Gf / 变换矩阵
+
+class FakeMatrix:
+    """模仿 Gf.Matrix4d 的行向量约定：p_world = p_local @ M[:3, :3] + M[3, :3]"""
+
+    def __init__(self, m):
+        self.m = np.asarray(m, dtype=float)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.m if dtype is None else self.m.astype(dtype)
+
+    def ExtractTranslation(self):
+        return self.m[3, :3].copy()
+
+    def GetInverse(self):
+        return FakeMatrix(np.linalg.inv(self.m))
+
+    def Transform(self, v):
+        return (np.append(np.asarray(v, dtype=float), 1.0) @ self.m)[:3]
+
+
+Gf = SimpleNamespace(
+    Vec3d=lambda *v: np.array(v, dtype=float),
+    Vec3f=lambda *v: np.array(v, dtype=float),
+)
+
+
+# ---------------------------------------------------------------- Stage / Prim
+
+class _Attr:
+    def __init__(self, prim, name):
+        self._prim = prim
+        self._name = name
+
+    def Set(self, value):
+        self._prim.attributes[self._name] = value
+
+    def Get(self):
+        return self._prim.attributes.get(self._name)
+
+
+class _TranslateOp:
+    def __init__(self, prim):
+        self._prim = prim
+
+    def Set(self, value):
+        self._prim.translation = np.array(value, dtype=float)
+
+    def Get(self):
+        return self._prim.translation.copy()
+
+
+class FakePrim:
+    def __init__(self, stage, path, prim_type="Xform", translation=None, orientation=None, scale=None,
+                 usd_path=None, attributes=None):
+        self.stage = stage
+        self.path = path
+        self.type = prim_type
+        self.translation = np.array(translation if translation is not None else (0.0, 0.0, 0.0), dtype=float)
+        self.orientation = np.array(orientation if orientation is not None else (1.0, 0.0, 0.0, 0.0), dtype=float)
+        self.scale = np.array(scale if scale is not None else (1.0, 1.0, 1.0), dtype=float)
+        self.usd_path = usd_path
+        self.attributes = dict(attributes or {})
+        self.translate_op = _TranslateOp(self)
+
+    def GetPath(self):
+        return self.path
+
+    def GetTypeName(self):
+        return self.type
+
+    def IsValid(self):
+        return self.path in self.stage.prims
+
+    def GetAttribute(self, name):
+        return _Attr(self, name)
+
+    def CreateAttribute(self, name, *args):
+        return _Attr(self, name)
+
+    def local_matrix(self):
+        m = np.eye(4)
+        m[:3, :3] = np.diag(self.scale) @ _quat_to_rot(self.orientation).T
+        m[3, :3] = self.translation
+        return m
+
+    def world_matrix(self):
+        m = self.local_matrix()
+        parent = self.stage.prims.get(self.path.rsplit("/", 1)[0])
+        return m @ parent.world_matrix() if parent is not None else m
+
+
+class _FakeLight:
+    def __init__(self, prim):
+        self.prim = prim
+
+    def CreateIntensityAttr(self, value):
+        self.prim.attributes["intensity"] = value
+        return _Attr(self.prim, "intensity")
+
+    def AddRotateXYZOp(self):
+        return _Attr(self.prim, "xformOp:rotateXYZ")
+
+    def GetPrim(self):
+        return self.prim
+
+
+class _LightType:
+    def __init__(self, type_name):
+        self.type_name = type_name
+
+    def Define(self, stage, path):
+        return _FakeLight(stage.define_prim(path, self.type_name))
+
+
+UsdLux = SimpleNamespace(DomeLight=_LightType("DomeLight"), DistantLight=_LightType("DistantLight"))
+
+
+class FakeStage:
+    def __init__(self):
+        self.prims = {}
+        self.ground = False
+        self.joints = []
+
+    def define_prim(self, path, prim_type="Xform", **kwargs):
+        # 与 USD 一样自动补齐父节点
+        parent = path.rsplit("/", 1)[0]
+        if parent and parent not in self.prims:
+            self.define_prim(parent)
+        prim = FakePrim(self, path, prim_type, **kwargs)
+        self.prims[path] = prim
+        return prim
+
+    def GetPrimAtPath(self, path):
+        return self.prims.get(path)
+
+    def remove_prim(self, path):
+        for p in [p for p in self.prims if p == path or p.startswith(path + "/")]:
+            del self.prims[p]
+        self.joints = [j for j in self.joints if j.ee_prim.path in self.prims]
+
+
+_stage = FakeStage()
+
+
+def new_stage():
+    """清空 stage（同一进程里跑多个独立用例时使用）"""
+    global _stage
+    _stage = FakeStage()
+    return _stage
+
+
+def _get_stage():
+    return _stage
+
+
+def _create_prim(prim_path, prim_type="Xform", position=None, translation=None, orientation=None, scale=None,
+                 usd_path=None, semantic_label=None, attributes=None):
+    if usd_path is not None:
+        prim_type = "Reference"
+    return _stage.define_prim(prim_path, prim_type, translation=translation if translation is not None else position,
+                              orientation=orientation, scale=scale, usd_path=usd_path, attributes=attributes)
+
+
+prim_utils = SimpleNamespace(
+    create_prim=_create_prim,
+    get_current_stage=_get_stage,
+    get_prim_at_path=lambda path: _stage.GetPrimAtPath(path),
+    is_prim_path_valid=lambda path: path in _stage.prims,
+    delete_prim=lambda path: _stage.remove_prim(path),
+)
+
+omni = SimpleNamespace(usd=SimpleNamespace(
+    get_context=lambda: SimpleNamespace(get_stage=_get_stage),
+    get_world_transform_matrix=lambda prim: FakeMatrix(prim.world_matrix()),
+))
+
+
+# ---------------------------------------------------------------- 物理
+
+class SpringJoint:
+    """Base（运动学）与 EndEffector（动力学）之间三个平移轴的 force 型弹簧阻尼驱动"""
+
+    def __init__(self, base_prim, ee_prim, stiffness, damping, mass, target):
+        self.base_prim = base_prim
+        self.ee_prim = ee_prim
+        self.k = stiffness
+        self.c = damping
+        self.mass = mass
+        self.target = np.asarray(target, dtype=float)
+        self._initial_translation = ee_prim.translation.copy()
+        self.reset()
+
+    def reset(self):
+        self.ee_prim.translation = self._initial_translation.copy()
+        self.v = np.zeros(3)
+        self._prev_base = None
+
+    def step(self, dt):
+        """隐式欧拉：m (v' - v) = dt * [-k (x + dt v' - base - target) - c (v' - v_base) + m g]"""
+        base = self.base_prim.world_matrix()[3, :3]
+        vb = np.zeros(3) if self._prev_base is None else (base - self._prev_base) / dt
+        self._prev_base = base
+        ee_m = self.ee_prim.world_matrix()
+        x = ee_m[3, :3]
+        rhs = self.mass * self.v + dt * (-self.k * (x - base - self.target) + self.c * vb + self.mass * GRAVITY)
+        self.v = rhs / (self.mass + dt * self.c + dt * dt * self.k)
+        # 父节点只做平移时，局部平移的增量等于世界坐标的增量
+        self.ee_prim.translation = self.ee_prim.translation + dt * self.v
+
+
+def add_spring_joint(base_prim, ee_prim, stiffness, damping, mass, target):
+    joint = SpringJoint(base_prim, ee_prim, stiffness, damping, mass, target)
+    _stage.joints.append(joint)
+    return joint
+
+
+class _PhysicsContext:
+    """GPU 动力学、broadphase 等设置在替身中没有意义，全部忽略"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class _Scene:
+    def add_default_ground_plane(self, *args, **kwargs):
+        _stage.ground = True
+
+    def add(self, obj):
+        return obj
+
+
+class World:
+    def __init__(self, stage_units_in_meters=1.0, physics_dt=1.0 / 60.0, rendering_dt=None, **kwargs):
+        self.stage = _stage
+        self.scene = _Scene()
+        self._physics_dt = physics_dt
+        self._callbacks = {}
+        self._playing = False
+        self.current_time = 0.0
+        self.current_time_step_index = 0
+
+    def get_physics_dt(self):
+        return self._physics_dt
+
+    def get_physics_context(self):
+        return _PhysicsContext()
+
+    def add_physics_callback(self, name, callback_fn):
+        self._callbacks[name] = callback_fn
+
+    def remove_physics_callback(self, name):
+        self._callbacks.pop(name, None)
+
+    def play(self):
+        self._playing = True
+
+    def stop(self):
+        self._playing = False
+
+    def is_playing(self):
+        return self._playing
+
+    def reset(self, soft=False):
+        self.current_time = 0.0
+        self.current_time_step_index = 0
+        for joint in self.stage.joints:
+            joint.reset()
+        self.play()
+
+    def step(self, render=True, step_sim=True):
+        if not step_sim:
+            return
+        dt = self._physics_dt
+        for fn in list(self._callbacks.values()):
+            fn(dt)
+        for joint in self.stage.joints:
+            joint.step(dt)
+        self.current_time += dt
+        self.current_time_step_index += 1
+
+
+class SimulationApp:
+    def __init__(self, launch_config=None, experience=""):
+        self.config = dict(launch_config or {})
+        self._running = True
+        print(">>> Using the CPU stand-in simulation backend (common/fake_sim.py)")
+
+    def is_running(self):
+        return self._running
+
+    def update(self):
+        pass
+
+    def close(self):
+        self._running = False
+
+
+# ---------------------------------------------------------------- 相机
+
+_PALETTE = np.array([
+    [200, 60, 50], [50, 110, 200], [70, 170, 80], [220, 170, 40], [150, 80, 180], [60, 180, 180],
+], dtype=float) / 255.0
+_SKY = np.array([0.55, 0.70, 0.90])
+
+
+class Camera:
+    """
+    Isaac Sim 相机的替身。世界坐标系下相机 +X 为光轴，+Y 指向图像左侧，+Z 指向图像上方
+    光圈默认值与 Isaac Sim 一致（20.955 USD 单位 = 2.0955 stage 单位），焦距以 stage 单位设置
+    """
+
+    def __init__(self, prim_path, resolution=(1280, 720), position=None, orientation=None, **kwargs):
+        self.prim_path = prim_path
+        self.resolution = tuple(resolution)
+        self.prim = _stage.define_prim(prim_path, "Camera", translation=position, orientation=orientation)
+        # CameraView 通过 prim 找回相机对象
+        self.prim.camera = self
+        self.focal_length = 2.4
+        self.horizontal_aperture = 2.0955
+        self.near = 0.01
+        self.far = 10000.0
+        self._warned_refs = False
+
+    def initialize(self, physics_sim_view=None):
+        pass
+
+    def set_focal_length(self, value):
+        self.focal_length = value
+
+    def get_focal_length(self):
+        return self.focal_length
+
+    def set_horizontal_aperture(self, value):
+        self.horizontal_aperture = value
+
+    def get_horizontal_aperture(self):
+        return self.horizontal_aperture
+
+    def set_clipping_range(self, near_distance=None, far_distance=None):
+        if near_distance is not None:
+            self.near = near_distance
+        if far_distance is not None:
+            self.far = far_distance
+
+    def set_world_pose(self, position=None, orientation=None, camera_axes="world"):
+        if position is not None:
+            self.prim.translation = np.array(position, dtype=float)
+        if orientation is not None:
+            self.prim.orientation = np.array(orientation, dtype=float)
+
+    def get_world_pose(self, camera_axes="world"):
+        return self.prim.translation.copy(), self.prim.orientation.copy()
+
+    def get_intrinsics_matrix(self):
+        width, height = self.resolution
+        fx = width * self.focal_length / self.horizontal_aperture
+        vertical_aperture = self.horizontal_aperture * height / width
+        fy = height * self.focal_length / vertical_aperture
+        return np.array([[fx, 0.0, width / 2.0], [0.0, fy, height / 2.0], [0.0, 0.0, 1.0]])
+
+    def _rays(self):
+        """每个像素中心的世界坐标射线方向 (H*W, 3)"""
+        width, height = self.resolution
+        K = self.get_intrinsics_matrix()
+        u, v = np.meshgrid(np.arange(width) + 0.5, np.arange(height) + 0.5)
+        x = (u.ravel() - K[0, 2]) / K[0, 0]
+        y = (v.ravel() - K[1, 2]) / K[1, 1]
+        rot = _quat_to_rot(self.prim.orientation)
+        d = rot[:, 0][None] - x[:, None] * rot[:, 1][None] - y[:, None] * rot[:, 2][None]
+        return d / np.linalg.norm(d, axis=1, keepdims=True)
+
+    def _light_dir(self):
+        """指向光源的方向：第一盏 DistantLight 的 -Z 轴取反，没有时从正上方照射"""
+        for prim in _stage.prims.values():
+            if prim.type == "DistantLight":
+                rot = _rotate_xyz(prim.attributes.get("xformOp:rotateXYZ", (0.0, 0.0, 0.0)))
+                return rot[:, 2]
+        return np.array([0.0, 0.0, 1.0])
+
+    def add_distance_to_image_plane_to_frame(self):
+        pass
+
+    def _raycast(self):
+        """对 stage 上的 Sphere / Cube（按轴对齐包围盒）/ 地面做光线投射，返回射线方向、命中距离、法线、颜色和棋盘格尺寸"""
+        origin = self.prim.translation
+        d = self._rays()
+        n = len(d)
+        t_hit = np.full(n, np.inf)
+        normal = np.zeros((n, 3))
+        checker_size = np.full(n, 0.02)
+        hit_color = np.zeros((n, 3))
+
+        def accept(t, nrm, rgb, checker):
+            closer = (t > self.near) & (t < np.minimum(t_hit, self.far))
+            t_hit[closer] = t[closer]
+            normal[closer] = nrm[closer] if nrm.ndim == 2 else nrm
+            hit_color[closer] = rgb
+            checker_size[closer] = checker
+
+        # 地面 z = 0
+        if _stage.ground:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = np.where(d[:, 2] < 0, -origin[2] / d[:, 2], np.inf)
+            accept(t, np.array([0.0, 0.0, 1.0]), [0.6, 0.6, 0.6], 0.1)
+
+        shapes = [p for p in _stage.prims.values() if p.type in ("Sphere", "Cube")]
+        if not self._warned_refs and any(p.type == "Reference" for p in _stage.prims.values()):
+            print(">>> fake_sim: referenced USD assets are not rendered by the stand-in camera")
+            self._warned_refs = True
+
+        for idx, prim in enumerate(shapes):
+            m = prim.world_matrix()
+            center = m[3, :3]
+            axis_scale = np.linalg.norm(m[:3, :3], axis=1)
+            rgb = _PALETTE[idx % len(_PALETTE)]
+            if prim.type == "Sphere":
+                radius = float(prim.attributes.get("radius", 1.0)) * axis_scale.max()
+                oc = origin - center
+                b = d @ oc
+                disc = b * b - (oc @ oc - radius * radius)
+                sq = np.sqrt(np.maximum(disc, 0.0))
+                t = np.where(-b - sq > self.near, -b - sq, -b + sq)
+                t = np.where(disc >= 0, t, np.inf)
+                p = origin + d * t[:, None]
+                accept(t, (p - center) / radius, rgb, 0.02)
+            else:
+                half = float(prim.attributes.get("size", 2.0)) / 2.0 * axis_scale
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    inv = 1.0 / np.where(d == 0, 1e-12, d)
+                t1 = (center - half - origin) * inv
+                t2 = (center + half - origin) * inv
+                t_near = np.minimum(t1, t2)
+                t_far = np.maximum(t1, t2)
+                axis = np.argmax(t_near, axis=1)
+                t_min = t_near.max(axis=1)
+                t_max = t_far.min(axis=1)
+                t = np.where(t_min > self.near, t_min, t_max)
+                t = np.where(t_max >= np.maximum(t_min, self.near), t, np.inf)
+                nrm = np.zeros((n, 3))
+                nrm[np.arange(n), axis] = -np.sign(d[np.arange(n), axis])
+                accept(t, nrm, rgb, 0.02)
+
+        return d, t_hit, normal, hit_color, checker_size
+
+    def get_rgba(self):
+        """光线投射渲染，Lambert 着色 + 棋盘格纹理"""
+        width, height = self.resolution
+        origin = self.prim.translation
+        d, t_hit, normal, hit_color, checker_size = self._raycast()
+        color = np.tile(_SKY, (len(d), 1))
+
+        hit = np.isfinite(t_hit)
+        p = origin + d[hit] * t_hit[hit, None]
+        checker = (np.floor(p / checker_size[hit, None]).astype(np.int64).sum(axis=1) % 2) * 0.25 + 0.75
+        shade = 0.35 + 0.65 * np.clip(normal[hit] @ self._light_dir(), 0.0, None)
+        color[hit] = hit_color[hit] * (checker * shade)[:, None]
+
+        rgba = np.empty((height, width, 4), dtype=np.uint8)
+        rgba[:, :, :3] = np.clip(color * 255.0, 0, 255).reshape(height, width, 3).astype(np.uint8)
+        rgba[:, :, 3] = 255
+        return rgba
+
+    def get_depth(self):
+        """到像平面的距离 (H, W) float32（与 distance_to_image_plane 一致），没有击中物体的像素为 inf"""
+        width, height = self.resolution
+        d, t_hit, _, _, _ = self._raycast()
+        optical_axis = _quat_to_rot(self.prim.orientation)[:, 0]
+        with np.errstate(invalid="ignore"):
+            depth = t_hit * (d @ optical_axis)
+        return depth.reshape(height, width).astype(np.float32)
+
+
+class CameraView:
+    """
+    isaacsim.sensors.camera.CameraView 的替身：路径匹配 prim_paths_expr（正则）的已有 Camera 组成一组，
+    按创建顺序批量设置位姿、批量抓图（内部仍逐个光线投射）
+    """
+
+    def __init__(self, prim_paths_expr, name="camera_prim_view", camera_resolution=(256, 256),
+                 output_annotators=None, **kwargs):
+        pattern = re.compile(prim_paths_expr)
+        prims = [p for path, p in _stage.prims.items() if p.type == "Camera" and pattern.fullmatch(path)]
+        if not prims:
+            raise ValueError(f"No camera prims match {prim_paths_expr}")
+        self.name = name
+        self.prim_paths = [p.path for p in prims]
+        self._cameras = [p.camera for p in prims]
+
+    @property
+    def count(self):
+        return len(self._cameras)
+
+    def set_world_poses(self, positions=None, orientations=None, indices=None, usd=True):
+        indices = range(self.count) if indices is None else indices
+        for k, i in enumerate(indices):
+            self._cameras[i].set_world_pose(position=None if positions is None else positions[k],
+                                            orientation=None if orientations is None else orientations[k])
+
+    def get_world_poses(self, indices=None, usd=True):
+        cameras = self._cameras if indices is None else [self._cameras[i] for i in indices]
+        poses = [cam.get_world_pose() for cam in cameras]
+        return np.stack([p for p, _ in poses]), np.stack([q for _, q in poses])
+
+    def get_depth(self, out=None):
+        """(N, H, W, 1) float32"""
+        depth = np.stack([cam.get_depth()[:, :, None] for cam in self._cameras])
+        if out is not None:
+            out[...] = depth
+            return out
+        return depth
+
+    def get_rgb(self, out=None):
+        """(N, H, W, 3) uint8"""
+        rgb = np.stack([cam.get_rgba()[:, :, :3] for cam in self._cameras])
+        if out is not None:
+            out[...] = rgb
+            return out
+        return rgb
@@ -0,0 +1,276 @@
+# 常驻仿真进程的任务队列与通信协议（本地 Unix socket，每行一个 JSON）
+# 本模块不导入 Isaac Sim，可以配合 stub_handlers() 在任何机器上测试排队和协议
+#
+# 客户端 -> 服务端: {"id": "...", "type": "press", "params": {...}}
+#   内置类型: "ping"（立即回复 pong 和队列长度）, "shutdown"（处理完已排队的任务后退出）
+# 服务端 -> 客户端（同一个连接上按顺序推送，最后一条总是 done）:
+#   {"id", "event": "accepted", "position"} -> "started" -> 若干 "progress" -> "result" 或 "error" -> "done"
+import argparse
+import itertools
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+import traceback
+
+import numpy as np
+
+DEFAULT_SOCKET = os.environ.get("ISAACSIM_JOB_SOCKET", "/tmp/isaacsim_jobs.sock")
+
+
+class JobError(RuntimeError):
+    """任务在服务端抛出异常，message 里带有服务端的 traceback"""
+
+
+def _to_json(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def encode(msg):
+    return (json.dumps(msg, default=_to_json) + "\n").encode("utf-8")
+
+
+class _Connection:
+    """一个客户端连接；多个线程（接收线程、主线程执行任务）共用时按行加锁发送"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = sock.makefile("rb")
+        self._lock = threading.Lock()
+        self.alive = True
+
+    def send(self, msg):
+        """客户端已断开时返回 False，任务照常执行完"""
+        if not self.alive:
+            return False
+        try:
+            with self._lock:
+                self.sock.sendall(encode(msg))
+            return True
+        except OSError:
+            self.alive = False
+            return False
+
+    def close(self):
+        self.alive = False
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class JobServer:
+    """
+    handlers: {任务类型: fn(params, emit)}，fn 在调用 serve_forever() 的线程（即 SimulationApp 所在的主线程）
+    中依次执行，emit(dict) 推送一条 progress，返回值作为 result 发回
+    idle: 队列为空时周期性调用（有界面时可以传 simulation_app.update 保持窗口响应）
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, handlers=None, idle=None, idle_interval=0.1):
+        self.socket_path = socket_path
+        self.handlers = dict(handlers or {})
+        self.idle = idle
+        self.idle_interval = idle_interval
+
+        self._jobs = queue.Queue()
+        self._ids = itertools.count()
+        self._shutdown = threading.Event()
+        self._server = None
+        self.jobs_done = 0
+
+    # --- 网络线程 ---
+    def start(self):
+        if os.path.exists(self.socket_path):
+            # 上一次异常退出留下的 socket 文件
+            os.remove(self.socket_path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_path)
+        self._server.listen()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        print(f">>> Job server listening on {self.socket_path} (jobs: {', '.join(sorted(self.handlers))})")
+
+    def _accept_loop(self):
+        while not self._shutdown.is_set():
+            try:
+                sock, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._client_loop, args=(_Connection(sock),), daemon=True).start()
+
+    def _client_loop(self, conn):
+        for line in conn.reader:
+            try:
+                req = json.loads(line)
+                if not isinstance(req, dict):
+                    raise TypeError(f"expected a JSON object, got {type(req).__name__}")
+                job_id = str(req.get("id", next(self._ids)))
+                job_type = req["type"]
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                conn.send({"id": None, "event": "error", "message": f"bad request: {e}"})
+                continue
+
+            if job_type == "ping":
+                conn.send({"id": job_id, "event": "pong", "queued": self._jobs.qsize(), "done": self.jobs_done})
+            elif job_type == "shutdown":
+                self._jobs.put(None)
+                conn.send({"id": job_id, "event": "done"})
+            elif job_type not in self.handlers:
+                conn.send({"id": job_id, "event": "error", "message": f"unknown job type: {job_type}"})
+                conn.send({"id": job_id, "event": "done"})
+            else:
+                conn.send({"id": job_id, "event": "accepted", "position": self._jobs.qsize()})
+                self._jobs.put((conn, job_id, job_type, req.get("params") or {}))
+
+    # --- 主线程 ---
+    def run_job(self, conn, job_id, job_type, params):
+        conn.send({"id": job_id, "event": "started", "type": job_type})
+        t0 = time.perf_counter()
+        try:
+            result = self.handlers[job_type](params, lambda data: conn.send(
+                {"id": job_id, "event": "progress", "data": data}))
+            conn.send({"id": job_id, "event": "result", "data": result,
+                       "elapsed_s": time.perf_counter() - t0})
+        except Exception as e:
+            print(f">>> Job {job_id} ({job_type}) failed: {e}")
+            conn.send({"id": job_id, "event": "error", "message": str(e), "traceback": traceback.format_exc()})
+        finally:
+            conn.send({"id": job_id, "event": "done"})
+            self.jobs_done += 1
+
+    def serve_forever(self):
+        """在当前线程依次执行任务，直到收到 shutdown"""
+        if self._server is None:
+            self.start()
+        try:
+            while True:
+                try:
+                    job = self._jobs.get(timeout=self.idle_interval)
+                except queue.Empty:
+                    if self.idle is not None:
+                        self.idle()
+                    continue
+                if job is None:
+                    break
+                self.run_job(*job)
+        finally:
+            self.close()
+
+    def close(self):
+        self._shutdown.set()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        print(f">>> Job server stopped after {self.jobs_done} jobs")
+
+
+class JobClient:
+    """每次提交使用一个独立连接，事件按服务端推送顺序逐条产出"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, connect_timeout=10.0):
+        self.socket_path = socket_path
+        self.connect_timeout = connect_timeout
+
+    def _connect(self):
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+                return sock
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                # 服务端可能还在启动 Isaac Sim
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.2)
+
+    def submit(self, job_type, params=None, job_id=None):
+        """提交任务，逐条产出服务端事件，直到 done"""
+        sock = self._connect()
+        try:
+            msg = {"type": job_type, "params": params or {}}
+            if job_id is not None:
+                msg["id"] = job_id
+            sock.sendall(encode(msg))
+            for line in sock.makefile("rb"):
+                event = json.loads(line)
+                yield event
+                if event["event"] in ("done", "pong"):
+                    return
+        finally:
+            sock.close()
+
+    def run(self, job_type, params=None, on_progress=None):
+        """提交任务并阻塞到完成，返回 result；服务端出错时抛出 JobError"""
+        result = None
+        for event in self.submit(job_type, params):
+            if event["event"] == "progress" and on_progress is not None:
+                on_progress(event["data"])
+            elif event["event"] == "result":
+                result = event["data"]
+            elif event["event"] == "error":
+                raise JobError(event.get("traceback") or event["message"])
+        return result
+
+    def ping(self):
+        return next(self.submit("ping"))
+
+    def shutdown(self):
+        for _ in self.submit("shutdown"):
+            pass
+
+
+def stub_handlers(step_time=0.01, steps=5):
+    """不依赖 Isaac Sim 的替身任务：推送几条进度后返回参数回显，用于测试排队和协议"""
+    def make(job_type):
+        def handler(params, emit):
+            if params.get("fail"):
+                raise RuntimeError(f"stub {job_type} failed on request")
+            for i in range(steps):
+                time.sleep(step_time)
+                emit({"step": i, "total": steps})
+            return {"type": job_type, "params": params, "pid": os.getpid()}
+        return handler
+    return {name: make(name) for name in ("capture", "press", "stiffness")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job server protocol tools")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("serve-stub", help="运行替身任务服务（不需要 Isaac Sim）")
+    p_submit = sub.add_parser("submit", help="提交任务并打印事件流")
+    p_submit.add_argument("type")
+    p_submit.add_argument("params", nargs="?", default="{}", help="JSON 参数")
+    sub.add_parser("ping")
+    sub.add_parser("shutdown")
+    args = parser.parse_args()
+
+    if args.command == "serve-stub":
+        JobServer(args.socket, stub_handlers()).serve_forever()
+        return
+    client = JobClient(args.socket)
+    if args.command == "submit":
+        ok = True
+        for event in client.submit(args.type, json.loads(args.params)):
+            print(json.dumps(event, ensure_ascii=False))
+            ok &= event["event"] != "error"
+        sys.exit(0 if ok else 1)
+    elif args.command == "ping":
+        print(json.dumps(client.ping()))
+    elif args.command == "shutdown":
+        client.shutdown()
+
+
+if __name__ == "__main__":
+    main()
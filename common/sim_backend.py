@@ -0,0 +1,56 @@
+# 仿真后端选择："isaac"（默认，真实 Isaac Sim）或 "fake"（common/fake_sim.py，纯 NumPy，CPU 即可运行）
+# 通过环境变量 SIM_BACKEND 或在导入仿真相关模块之前调用 set_backend() 选择
+import os
+
+BACKENDS = ("isaac", "fake")
+_backend = os.environ.get("SIM_BACKEND", "isaac")
+
+
+def set_backend(name):
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown simulation backend: {name}")
+    _backend = name
+    # 子进程（如分片 worker）沿用同一后端
+    os.environ["SIM_BACKEND"] = name
+
+
+def get_backend():
+    return _backend
+
+
+def is_fake():
+    return _backend == "fake"
+
+
+def create_app(config):
+    """等价于 SimulationApp(config)，必须在导入其他 Isaac Sim 模块之前调用"""
+    if is_fake():
+        from common.fake_sim import SimulationApp
+    else:
+        from isaacsim import SimulationApp
+    return SimulationApp(config)
+
+
+def create_world(**kwargs):
+    """等价于 isaacsim.core.api.World(**kwargs)"""
+    if is_fake():
+        from common.fake_sim import World
+    else:
+        from isaacsim.core.api import World
+    return World(**kwargs)
+
+
+def new_world(**kwargs):
+    """在全新的空 stage 上创建 World（常驻进程里每个任务开始前调用，互不干扰）"""
+    if is_fake():
+        from common import fake_sim
+        fake_sim.new_stage()
+        from common.fake_sim import World
+    else:
+        import omni.usd
+        from isaacsim.core.api import World
+        # World 是单例，先清掉上一个任务的实例再换新 stage
+        World.clear_instance()
+        omni.usd.get_context().new_stage()
+    return World(**kwargs)
@@ -0,0 +1,99 @@
+# 常驻 Isaac Sim 任务服务：只启动一次 SimulationApp，之后通过 Unix socket 接收任务
+# 每个任务都在新的空 stage + World 上执行，结果和进度以 JSON 事件流推回客户端
+#
+#   ~/isaacsim/_build/linux-x86_64/release/python.sh common/sim_server.py [--backend fake]
+#   python common/job_server.py submit press '{"settings": {"speed": 0.01}, "max_steps": 2000}'
+#
+# 任务类型:
+#   capture   - 双目数据集采集，params: {"config": {Config 属性覆盖}, "frame_start", "frame_stop"}
+#   press     - 压入实验，params: {"settings": {PRESS_DEFAULTS 覆盖}, "render_interval", "sample_interval", "max_steps"}
+#   stiffness - 刚度/质量静态标定，params: {"stiffness": [...], "masses": [...], "max_case_steps", "sample_interval"}
+import argparse
+import os
+import sys
+
+import numpy as np
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(_REPO_ROOT)
+sys.path.append(os.path.join(_REPO_ROOT, "stereo-simulation-dataset"))
+sys.path.append(os.path.join(_REPO_ROOT, "SpringForceSensor"))
+from common import sim_backend
+from common.job_server import JobServer, DEFAULT_SOCKET
+
+
+def _override(cls, overrides):
+    """临时覆盖 Config 类属性，返回用于恢复的旧值；numpy 数组属性会把 JSON 列表转回数组"""
+    saved = {}
+    for key, value in overrides.items():
+        if not hasattr(cls, key):
+            raise KeyError(f"Config has no attribute {key}")
+        saved[key] = getattr(cls, key)
+        setattr(cls, key, np.asarray(value) if isinstance(saved[key], np.ndarray) else value)
+    return saved
+
+
+def make_handlers(simulation_app):
+    # 这些模块会导入 omni / pxr，必须在 SimulationApp 启动之后导入
+    from src.config import Config
+    from src.capture import run_capture
+    from press_experiment import run_press
+    from stiffness_sweep import run_sweep
+
+    def capture(params, emit):
+        saved = _override(Config, params.get("config", {}))
+        try:
+            world = sim_backend.new_world(stage_units_in_meters=1.0)
+            result = run_capture(world, simulation_app, Config, params.get("frame_start", 0),
+                                 params.get("frame_stop"),
+                                 on_progress=lambda i, n: emit({"frame": i, "stop": n}))
+        finally:
+            _override(Config, saved)
+        if result["error"]:
+            raise RuntimeError(result["error"])
+        return result
+
+    def press(params, emit):
+        world = sim_backend.new_world(stage_units_in_meters=1.0)
+        result = run_press(world, simulation_app, params.get("settings"), params.get("render_interval", 0),
+                           params.get("sample_interval", 1), params.get("max_steps"),
+                           stop_after_profile=True, on_progress=emit)
+        if result["error"]:
+            raise RuntimeError(result["error"])
+        return result
+
+    def stiffness(params, emit):
+        """与 stiffness_sweep.py 相同的流程（共用 run_sweep），每组结果作为一条 progress 推送"""
+        world = sim_backend.new_world(stage_units_in_meters=1.0)
+        result = run_sweep(world, simulation_app, params.get("stiffness", [1000.0]), params.get("masses", [1.0]),
+                           start_z=params.get("start_z", 3.0), max_case_steps=params.get("max_case_steps", 6000),
+                           sample_interval=params.get("sample_interval", 1),
+                           settle_window=params.get("settle_window", 60), abs_tol=params.get("abs_tol", 1e-4),
+                           rel_tol=params.get("rel_tol", 1e-4), on_progress=emit)
+        if result["error"]:
+            raise RuntimeError(result["error"])
+        return {"rows": result["rows"], "stats": result["stats"]}
+
+    return {"capture": capture, "press": press, "stiffness": stiffness}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent Isaac Sim job server")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket 路径")
+    parser.add_argument("--backend", choices=sim_backend.BACKENDS, default=None, help="仿真后端，默认取 SIM_BACKEND")
+    parser.add_argument("--gui", action="store_true", help="带界面运行（默认无界面）")
+    args = parser.parse_args()
+    if args.backend is not None:
+        sim_backend.set_backend(args.backend)
+
+    simulation_app = sim_backend.create_app({"headless": not args.gui})
+    try:
+        server = JobServer(args.socket, make_handlers(simulation_app),
+                           idle=simulation_app.update if args.gui else None)
+        server.serve_forever()
+    finally:
+        simulation_app.close()
+
+
+if __name__ == "__main__":
+    main()
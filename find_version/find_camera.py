@@ -1,9 +1,10 @@
-# 必须先启动 SimulationApp 才能加载相关模块
-from isaacsim import SimulationApp
-simulation_app = SimulationApp({"headless": True})
+# 检查 isaacsim.sensors.camera 里有没有 StereoCamera
+# 成员列表来自 common/env_inventory.py 的缓存，不需要每次都启动 SimulationApp
+import os
+import sys
 
-import importlib
-import inspect
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import env_inventory
 
 def check_stereo_camera():
     module_name = "isaacsim.sensors.camera"
@@ -12,29 +13,23 @@ def check_stereo_camera():
     print(f"\n" + "="*50)
     print(f"正在检查模块: {module_name}")
     
-    try:
-        # 尝试动态导入模块
-        module = importlib.import_module(module_name)
+    members = env_inventory.module_members(module_name)
+    if not members:
+        print(f"无法导入模块 {module_name}")
+    elif class_to_find in members:
+        print(f"✅ 成功! 找到了类: {class_to_find}")
+    else:
+        print(f"❌ 失败: 在 {module_name} 中找不到 '{class_to_find}'")
         
-        # 检查类是否存在
-        if hasattr(module, class_to_find):
-            print(f"✅ 成功! 找到了类: {class_to_find}")
-        else:
-            print(f"❌ 失败: 在 {module_name} 中找不到 '{class_to_find}'")
-            
-            # 列出该模块下所有可用的类，看看真相是什么
-            print("\n该模块下可用的所有类/成员如下:")
-            members = inspect.getmembers(module, inspect.isclass)
-            for name, _ in members:
+        # 列出该模块下所有可用的类，看看真相是什么
+        print("\n该模块下可用的所有类/成员如下:")
+        for name, kind in sorted(members.items()):
+            if kind == "class":
                 print(f" - {name}")
-                
-    except ImportError as e:
-        print(f"无法导入模块 {module_name}: {e}")
     
     print("="*50 + "\n")
 
 check_stereo_camera()
-simulation_app.close()
 
 # result: gemini is also cjb
 # ==================================================
@@ -1,31 +1,21 @@
-from omni.isaac.kit import SimulationApp
-# 必须先启动，否则 Manager 无法初始化
-simulation_app = SimulationApp({"headless": True})
+# 查询 omni.physx 扩展的 ID / 版本 / 路径
+# 结果来自 common/env_inventory.py 的缓存，只在缓存缺失或 Isaac Sim 重新编译后才启动一次 SimulationApp
+import os
+import sys
 
-import omni.kit.app
-import omni.ext
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import env_inventory
 
-# 获取 App 接口和扩展管理器
-manager = omni.kit.app.get_app_interface().get_extension_manager()
+info = env_inventory.extension_info("omni.physx")
 
-# 检查 omni.physx 是否启用并获取其版本
-# 在新版本中，建议通过 get_enabled_extension_id 获取完整的标识符
-ext_id = manager.get_enabled_extension_id("omni.physx")
-
-if ext_id:
-    # 从扩展字典中提取版本信息
-    ext_dict = manager.get_extension_dict(ext_id)
-    version = ext_dict.get("version", "Unknown")
-    path = ext_dict.get("path", "Unknown")
+if info:
     print(f"--- Component Info ---")
-    print(f"PhysX Extension ID: {ext_id}")
-    print(f"PhysX Version: {version}")
-    print(f"PhysX Path: {path}") # 这将直接告诉你它的物理位置
+    print(f"PhysX Extension ID: {info['id']}")
+    print(f"PhysX Version: {info['version']}")
+    print(f"PhysX Path: {info['path']}") # 这将直接告诉你它的物理位置
 else:
     print("omni.physx extension is not enabled or found.")
 
-simulation_app.close()
-
 # the result
 # [6.797s] Simulation App Startup Complete
 
@@ -0,0 +1,105 @@
+# 深度 -> 视差真值的换算与存储开销测试（CPU 替身后端，不需要 Isaac Sim）
+# 比较每只眼的: 视差换算耗时、16 位视差 PNG 与 RGB PNG 的编码耗时/体积、分片后端 float16 + 位掩码的体积，并检查量化误差
+# 用法: python bench_depth.py [--resolution 400 400] [--resolution 1920 1080] [--repeat 5]
+import argparse
+import io
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.config import Config  # 导入 src 时把仓库根目录加入 sys.path
+from common import sim_backend
+
+sim_backend.set_backend("fake")
+
+
+def _png_bytes(img):
+    buf = io.BytesIO()
+    Image.fromarray(img).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _timed(fn, repeat):
+    """返回 (结果, 单次平均耗时 ms)"""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, 1e3 * (time.perf_counter() - t0) / repeat
+
+
+def render_frame(resolution):
+    """在替身场景里渲染第一帧的左眼 RGB 和深度"""
+    simulation_app = sim_backend.create_app({"headless": True})
+    world = sim_backend.new_world(stage_units_in_meters=1.0)
+
+    from src.scene_utils import setup_stereo_scene
+    from src.camera_rig import create_rig
+    from src.trajectory import build_trajectory
+
+    Config.RESOLUTION = tuple(resolution)
+    Config.CAPTURE_DEPTH = True
+    setup_stereo_scene(world, Config)
+    rig = create_rig(Config)
+    positions, quats = rig.solve_array_poses(build_trajectory(Config), Config.TARGET_POINT)
+    world.reset()
+    rig.apply_poses(positions[0], quats[0])
+    world.step(render=True)
+    simulation_app.update()
+    views = rig.capture()
+    depth = rig.capture_depth()
+    return views[0], depth[0], rig.get_intrinsics_matrix()[0, 0]
+
+
+def bench(resolution, repeat):
+    from src.disparity import (depth_to_disparity, encode_disparity_png16, decode_disparity_png16,
+                               pack_valid_mask, unpack_valid_mask)
+
+    rgb, depth, focal_px = render_frame(resolution)
+    width, height = resolution
+    scale = Config.DISPARITY_SCALE
+
+    out = np.empty(depth.shape, dtype=np.float32)
+    valid = np.empty(depth.shape, dtype=bool)
+    (disp, valid), t_disp = _timed(lambda: depth_to_disparity(depth, focal_px, Config.BASELINE, out, valid), repeat)
+    code, t_code = _timed(lambda: encode_disparity_png16(disp, valid, scale), repeat)
+    disp_png, t_disp_png = _timed(lambda: _png_bytes(code), repeat)
+    rgb_png, t_rgb_png = _timed(lambda: _png_bytes(rgb[:, :, :3]), repeat)
+    (half, packed), t_shard = _timed(lambda: (disp.astype(np.float16), pack_valid_mask(valid)), repeat)
+
+    # 量化误差：16 位定点不超过 0.5 / scale 像素；float16 相对误差约 2^-11
+    decoded, decoded_valid = decode_disparity_png16(code, scale)
+    png_err = np.abs(decoded - disp)[valid].max() if valid.any() else 0.0
+    half_err = (np.abs(half.astype(np.float32) - disp) / np.maximum(disp, 1e-6))[valid].max() if valid.any() else 0.0
+    ok = (np.array_equal(decoded_valid, valid) and np.array_equal(unpack_valid_mask(packed, width), valid)
+          and png_err <= 0.5 / scale + 1e-6 and half_err <= 2.0 ** -10)
+
+    raw_kb = depth.nbytes / 1024
+    print(f"--- {width}x{height} | 有效像素 {valid.mean() * 100:.1f}% | 视差 {disp[valid].min():.3f} ~ "
+          f"{disp[valid].max():.3f} px ---")
+    print(f"  depth -> disparity:      {t_disp:7.2f} ms")
+    print(f"  disparity PNG16:         {t_code + t_disp_png:7.2f} ms  {len(disp_png) / 1024:8.1f} KB "
+          f"(float32 深度 {raw_kb:.1f} KB, 误差 {png_err:.5f} px)")
+    print(f"  RGB PNG (对照):          {t_rgb_png:7.2f} ms  {len(rgb_png) / 1024:8.1f} KB")
+    print(f"  float16 + packbits:      {t_shard:7.2f} ms  {(half.nbytes + packed.nbytes) / 1024:8.1f} KB "
+          f"(相对误差 {half_err:.2e})")
+    print(f"[{'OK' if ok else 'FAIL'}] 往返解码与有效掩码一致")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Depth/disparity conversion and storage benchmark on the CPU stand-in")
+    parser.add_argument("--resolution", type=int, nargs=2, action="append", metavar=("W", "H"),
+                        help="可重复指定，默认 Config.RESOLUTION 和 1920x1080")
+    parser.add_argument("--repeat", type=int, default=5, help="每项计时的重复次数")
+    args = parser.parse_args()
+
+    ok = True
+    for resolution in args.resolution or [Config.RESOLUTION, (1920, 1080)]:
+        ok &= bench(resolution, args.repeat)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# 替身 worker：命令行与 main.py 相同，但不启动 Isaac Sim，只输出合成图像，用于验证分片启动与合并逻辑
+import argparse
+import numpy as np
+
+from src.config import Config
+from src.camera_rig import solve_array_poses, array_offsets
+from src.data_handler import create_writer
+from src.trajectory import build_trajectory, save_trajectory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic stand-in for main.py")
+    parser.add_argument("--frame-start", type=int, default=0)
+    parser.add_argument("--frame-stop", type=int, default=None)
+    parser.add_argument("--output-dir", type=str, default=None)
+    parser.add_argument("--num-frames", type=int, default=None)
+    parser.add_argument("--headless", action="store_true")
+    args, _ = parser.parse_known_args()
+
+    if args.output_dir is not None:
+        Config.OUTPUT_DIR = args.output_dir
+    if args.num_frames is not None:
+        Config.NUM_FRAMES = args.num_frames
+
+    writer = create_writer(Config)
+    width, height = Config.RESOLUTION
+    writer.save_metadata(Config, np.array([[width, 0.0, width / 2], [0.0, width, height / 2], [0.0, 0.0, 1.0]]))
+
+    trajectory = build_trajectory(Config)
+    save_trajectory(trajectory, Config.OUTPUT_DIR)
+    offsets = array_offsets(Config.CAMERA_LAYOUT, Config.NUM_CAMERAS, Config.BASELINE, Config.RING_RADIUS,
+                            Config.CAMERA_OFFSETS)
+    positions, quats = solve_array_poses(trajectory, Config.TARGET_POINT, offsets)
+
+    frame_stop = Config.NUM_FRAMES if args.frame_stop is None else min(args.frame_stop, Config.NUM_FRAMES)
+    try:
+        for i in range(args.frame_start, frame_stop):
+            # 用帧号做种子，同一帧在任何分片下都生成相同的图像
+            rng = np.random.default_rng(i)
+            views = rng.integers(0, 256, (len(offsets), height, width, 4), dtype=np.uint8)
+            writer.write_views(i, i / 60.0, positions[i], quats[i], views)
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# 多进程分片采集：把 NUM_FRAMES 切成若干段，每段由一个独立的 Isaac Sim 进程渲染，最后合并成一个数据集
+import argparse
+import os
+import shutil
+import sys
+
+from src.config import Config
+from src.sharding import run_shards, merge_shards
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the stereo capture across several SimulationApp workers")
+    parser.add_argument("--workers", type=int, default=2, help="分片数（worker 进程数）")
+    parser.add_argument("--max-parallel", type=int, default=None, help="同时运行的 worker 数，默认等于分片数")
+    parser.add_argument("--num-frames", type=int, default=Config.NUM_FRAMES)
+    parser.add_argument("--output-dir", type=str, default=Config.OUTPUT_DIR)
+    parser.add_argument("--worker-script", type=str, default=os.path.join(BASE_DIR, "main.py"),
+                        help="worker 入口，默认 main.py；可换成 fake_worker.py 在没有 Isaac Sim 的机器上验证")
+    parser.add_argument("--keep-shards", action="store_true", help="合并后保留各分片目录")
+    args = parser.parse_args()
+
+    if Config.OUTPUT_BACKEND != "png":
+        parser.error("sharded capture merges PNG outputs; set Config.OUTPUT_BACKEND = \"png\"")
+    if Config.POSE_LOG_FORMAT != "csv":
+        parser.error("sharded capture merges camera_poses.csv; set Config.POSE_LOG_FORMAT = \"csv\"")
+
+    if os.path.exists(args.output_dir):
+        print(f">>> Detected existing output directory: {args.output_dir}. Cleaning up...")
+        shutil.rmtree(args.output_dir)
+
+    # worker 用和 launcher 相同的解释器启动（Isaac Sim 下即 python.sh 对应的 python）
+    def worker_cmd(start, stop, shard_dir):
+        return [
+            sys.executable, args.worker_script,
+            "--frame-start", str(start),
+            "--frame-stop", str(stop),
+            "--output-dir", shard_dir,
+            "--num-frames", str(args.num_frames),
+            "--headless",
+        ]
+
+    shards = run_shards(worker_cmd, args.num_frames, args.workers, args.output_dir, args.max_parallel)
+    subdirs = Config.view_names()
+    if Config.CAPTURE_DEPTH:
+        subdirs += [f"disp_{name}" for name in subdirs]
+    merge_shards([shard_dir for _, _, shard_dir in shards], args.output_dir, keep_shards=args.keep_shards,
+                 view_names=subdirs, num_frames=args.num_frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 仓库根目录下的 common/ 放两个项目共用的模块（列存日志、仿真后端选择等）
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
@@ -1,21 +1,276 @@
 import numpy as np
-from pxr import Gf
-from isaacsim.sensors.camera import Camera
 
-class StereoRig:
-    def __init__(self, resolution, focal_length, baseline):
-        self.baseline = baseline
-        self.cam_l = Camera(prim_path="/World/cam_l", resolution=resolution)
-        self.cam_r = Camera(prim_path="/World/cam_r", resolution=resolution)
-        
-        for cam in [self.cam_l, self.cam_r]:
-            cam.initialize()
+from common import sim_backend
+
+# 位姿解算 (solve_stereo_poses) 只依赖 NumPy，没有 Isaac Sim 的机器上也能导入本模块做预计算/单元测试
+# fake 后端下相机换成 common/fake_sim.py 的光线投射替身
+if sim_backend.is_fake():
+    from common.fake_sim import Camera, CameraView
+    Gf = None
+else:
+    try:
+        from pxr import Gf
+        from isaacsim.sensors.camera import Camera
+    except ImportError:
+        Gf = None
+        Camera = None
+    try:
+        from isaacsim.sensors.camera import CameraView
+    except ImportError:
+        CameraView = None
+
+# 与 Gf::GetNormalized 的默认 eps 一致
+_GF_MIN_VECTOR_LENGTH = 1e-10
+
+
+def _gf_normalized(v):
+    """逐行复刻 Gf 的 GetNormalized：长度小于 eps 时除以 eps 而不是长度"""
+    length = np.linalg.norm(v, axis=-1, keepdims=True)
+    return v / np.where(length > _GF_MIN_VECTOR_LENGTH, length, _GF_MIN_VECTOR_LENGTH)
+
+
+def _extract_rotation_quat(m):
+    """
+    批量复刻 GfMatrix4d::ExtractRotationQuat（行向量约定的 3x3 旋转部分）
+    m: (N, 3, 3)，返回 (N, 4) 的 [w, x, y, z]
+    """
+    n = len(m)
+    diag = np.diagonal(m, axis1=1, axis2=2)
+    trace = diag.sum(axis=1)
+
+    # 与 Gf 相同的最大对角元选择顺序（严格大于，平局时取后者）
+    i = np.where(diag[:, 0] > diag[:, 1],
+                 np.where(diag[:, 0] > diag[:, 2], 0, 2),
+                 np.where(diag[:, 1] > diag[:, 2], 1, 2))
+    rows = np.arange(n)
+    use_trace = trace > diag[rows, i]
+
+    quat = np.empty((n, 4))
+
+    # 分支 1：迹为主
+    r = 0.5 * np.sqrt(np.where(use_trace, trace + 1.0, 1.0))
+    quat[:, 0] = r
+    quat[:, 1] = (m[:, 1, 2] - m[:, 2, 1]) / (4.0 * r)
+    quat[:, 2] = (m[:, 2, 0] - m[:, 0, 2]) / (4.0 * r)
+    quat[:, 3] = (m[:, 0, 1] - m[:, 1, 0]) / (4.0 * r)
+
+    # 分支 2：最大对角元为主
+    j = (i + 1) % 3
+    k = (i + 2) % 3
+    q = 0.5 * np.sqrt(np.where(use_trace, 1.0, diag[rows, i] - diag[rows, j] - diag[rows, k] + 1.0))
+    im = np.empty((n, 3))
+    im[rows, i] = q
+    im[rows, j] = (m[rows, i, j] + m[rows, j, i]) / (4.0 * q)
+    im[rows, k] = (m[rows, k, i] + m[rows, i, k]) / (4.0 * q)
+    r_alt = (m[rows, j, k] - m[rows, k, j]) / (4.0 * q)
+
+    alt = ~use_trace
+    quat[alt, 0] = r_alt[alt]
+    quat[alt, 1:] = im[alt]
+    quat[:, 0] = np.clip(quat[:, 0], -1.0, 1.0)
+    return quat
+
+
+def _rig_frame(centers, targets):
+    """
+    阵列中心的公共朝向和平移基向量（与 StereoRig._get_rig_orientation (Gf) 的结果一致）
+    返回 quat (N, 4) [w, x, y, z]、水平侧向向量 side_vec (N, 3) 和相机上方向 real_up (N, 3)
+    唯一的例外是视线与 Up 轴平行（正上方俯视/正下方仰视）：Gf 的基退化成零向量，得到的不是旋转；
+    这里把右方向取为 +Y（与 side_vec 的回退方向一致），保证结果仍是单位四元数
+    """
+    up = np.array([0.0, 0.0, 1.0])
+
+    # 1. 与 Gf SetLookAt 相同的正交基
+    view = _gf_normalized(targets - centers)
+    cross = np.cross(view, up)
+    degenerate = np.linalg.norm(cross, axis=-1) <= _GF_MIN_VECTOR_LENGTH
+    right = np.where(degenerate[:, None], np.array([0.0, 1.0, 0.0]), _gf_normalized(cross))
+    real_up = np.cross(right, view)
+
+    # 2. 修正后的相机矩阵（行向量约定）：
+    #    LookAt 逆矩阵的旋转行为 [right, up, -view]，左乘 Rx(-90)*Ry(90) 的修正后
+    #    三行变为 [view, -right, up]，即相机 +X 指向目标、+Z 朝上
+    m = np.stack([view, -right, real_up], axis=1)
+    quat = _extract_rotation_quat(m)
+
+    # 3. 水平面内的侧向向量（与视线和 Up 轴垂直）
+    dist_h = np.linalg.norm(centers[:, :2], axis=1)
+    valid = dist_h > 1e-6
+    safe_dist = np.where(valid, dist_h, 1.0)
+    side_vec = np.zeros_like(centers)
+    side_vec[:, 0] = np.where(valid, -centers[:, 1] / safe_dist, 0.0)
+    side_vec[:, 1] = np.where(valid, centers[:, 0] / safe_dist, 1.0)
+    return quat, side_vec, real_up
+
+
+def solve_stereo_poses(centers, targets, baseline):
+    """
+    纯 NumPy 批量解算双目位姿，与 StereoRig._get_rig_orientation (Gf) 的结果一致
+    centers: (N, 3) 双目中心；targets: (3,) 或 (N, 3) 注视点
+    返回 pos_l (N, 3), pos_r (N, 3), quat (N, 4) [w, x, y, z]
+    """
+    centers = np.atleast_2d(np.asarray(centers, dtype=float))
+    targets = np.broadcast_to(np.asarray(targets, dtype=float), centers.shape)
+    quat, side_vec, _ = _rig_frame(centers, targets)
+
+    pos_l = centers + side_vec * (baseline / 2.0)
+    pos_r = centers - side_vec * (baseline / 2.0)
+    return pos_l, pos_r, quat
+
+
+def solve_array_poses(centers, targets, offsets):
+    """
+    一次向量化解算 F 帧 x N 个相机的位姿，所有相机共用阵列中心的朝向（平行光轴）
+    offsets: (N, 2) 每个相机相对阵列中心的 [横向, 竖直] 偏移 (m)，横向沿 side_vec（与双目的左眼方向相同），
+             竖直沿相机上方向
+    返回 positions (F, N, 3), quat (F, 4)
+    """
+    centers = np.atleast_2d(np.asarray(centers, dtype=float))
+    targets = np.broadcast_to(np.asarray(targets, dtype=float), centers.shape)
+    offsets = np.atleast_2d(np.asarray(offsets, dtype=float))
+    quat, side_vec, real_up = _rig_frame(centers, targets)
+
+    positions = (centers[:, None, :]
+                 + offsets[None, :, 0, None] * side_vec[:, None, :]
+                 + offsets[None, :, 1, None] * real_up[:, None, :])
+    return positions, quat
+
+
+def array_offsets(layout, num_cameras=2, baseline=0.032, ring_radius=0.05, offsets=None):
+    """
+    阵列布局 -> (N, 2) [横向, 竖直] 偏移
+      stereo: 左右两个相机，间距 baseline（与 solve_stereo_poses 相同）
+      linear: num_cameras 个相机沿基线方向等间距排开，相邻间距 baseline（3 个即三目）
+      ring:   num_cameras 个相机均匀分布在垂直于视线、半径 ring_radius 的圆上
+      custom: 直接使用 offsets（如不等间距的多基线阵列）
+    """
+    if layout == "stereo":
+        return np.array([[baseline / 2.0, 0.0], [-baseline / 2.0, 0.0]])
+    if layout == "linear":
+        lateral = ((num_cameras - 1) / 2.0 - np.arange(num_cameras)) * baseline
+        return np.stack([lateral, np.zeros(num_cameras)], axis=1)
+    if layout == "ring":
+        theta = 2.0 * np.pi * np.arange(num_cameras) / num_cameras
+        return ring_radius * np.stack([np.cos(theta), np.sin(theta)], axis=1)
+    if layout == "custom":
+        if offsets is None:
+            raise ValueError("custom camera layout requires CAMERA_OFFSETS")
+        return np.atleast_2d(np.asarray(offsets, dtype=float))
+    raise ValueError(f"Unknown camera layout: {layout}")
+
+
+class CameraArray:
+    """
+    N 个相机组成的阵列（双目 / 三目 / 多基线 / 圆环），所有相机与阵列中心同朝向
+    batched=True 且 CameraView 可用时，位姿写入和抓图都是对整个阵列的一次批量调用，否则逐个相机处理
+    capture() 把图像写进预分配的 (N, H, W, 4) uint8 缓冲并返回该缓冲，下一次 capture() 会覆盖它；
+    也可以传入 out（如 FrameRing 的一块 (N, H, W, 3)）直接写进调用方的缓冲
+    depth=True 时额外输出到像平面的距离，capture_depth() 的用法与 capture() 相同
+    """
+
+    def __init__(self, resolution, focal_length, offsets, names=None, root="/World", batched=True, depth=False):
+        self.offsets = np.atleast_2d(np.asarray(offsets, dtype=float))
+        num_cameras = len(self.offsets)
+        self.names = list(names) if names is not None else [f"cam_{i:02d}" for i in range(num_cameras)]
+        self.prim_paths = [f"{root}/{name}" for name in self.names]
+        self.cameras = [Camera(prim_path=path, resolution=resolution) for path in self.prim_paths]
+
+        width, height = resolution
+        self.frames = np.empty((num_cameras, height, width, 4), dtype=np.uint8)
+        self.frames[:, :, :, 3] = 255
+        self.depth_enabled = depth
+        self.depth = np.zeros((num_cameras, height, width), dtype=np.float32) if depth else None
+
+        self.view = None
+        self._order = slice(None)
+        if batched and CameraView is not None:
+            # 一个 CameraView 覆盖全部相机，共用一个分块渲染输出
+            self.view = CameraView(prim_paths_expr=f"{root}/({'|'.join(self.names)})", name="camera_array_view",
+                                   camera_resolution=tuple(resolution),
+                                   output_annotators=["rgb", "depth"] if depth else ["rgb"])
+            view_paths = list(getattr(self.view, "prim_paths", self.prim_paths))
+            if view_paths != self.prim_paths:
+                # CameraView 按 stage 遍历顺序排列，换算成阵列序号
+                self._order = np.array([self.prim_paths.index(path) for path in view_paths])
+
+        for cam in self.cameras:
+            if self.view is None:
+                cam.initialize()
+                if depth:
+                    cam.add_distance_to_image_plane_to_frame()
             cam.set_focal_length(focal_length)
             # 设置剪切平面，防止物体太近或太远被裁剪
             cam.set_clipping_range(near_distance=0.01, far_distance=10000.0)
 
+    @property
+    def num_cameras(self):
+        return len(self.cameras)
+
+    def get_intrinsics_matrix(self):
+        """阵列内相机参数相同，返回第一个相机的 K"""
+        return self.cameras[0].get_intrinsics_matrix()
+
+    def solve_array_poses(self, centers, targets):
+        """批量计算 F 帧所有相机的位置 (F, N, 3) 和共用的四元数 (F, 4)，不需要 pxr"""
+        return solve_array_poses(centers, targets, self.offsets)
+
+    def apply_poses(self, positions, quat):
+        """把一帧的 (N, 3) 位置和共用四元数写入全部相机"""
+        if self.view is not None:
+            self.view.set_world_poses(positions=positions[self._order],
+                                      orientations=np.tile(quat, (self.num_cameras, 1)))
+            return
+        for cam, position in zip(self.cameras, positions):
+            cam.set_world_pose(position=position, orientation=quat)
+
+    def capture(self, out=None):
+        """
+        抓取全部相机的图像，RGB 从渲染器输出只拷贝一次到 out（默认 self.frames）并返回 out
+        out 可以是 (N, H, W, 3) 或 (N, H, W, 4) 的 uint8 数组；渲染器还没有输出时返回 None
+        """
+        frames = self.frames if out is None else out
+        if self.view is not None:
+            rgb = self.view.get_rgb()
+            if rgb is None or np.size(rgb) == 0:
+                return None
+            frames[self._order, :, :, :3] = np.asarray(rgb)[..., :3]
+            return frames
+        for i, cam in enumerate(self.cameras):
+            img = cam.get_rgba()
+            if img is None or img.size == 0:
+                return None
+            frames[i, :, :, :3] = img[:, :, :3]
+        return frames
+
+    def capture_depth(self, out=None):
+        """抓取全部相机到像平面的距离 (N, H, W) float32 到 out（默认 self.depth），渲染器还没有输出时返回 None"""
+        depth = self.depth if out is None else out
+        if self.view is not None:
+            data = self.view.get_depth()
+            if data is None or np.size(data) == 0:
+                return None
+            # CameraView 的输出带一个通道维 (N, H, W, 1)
+            depth[self._order] = np.asarray(data).reshape(depth.shape)
+            return depth
+        for i, cam in enumerate(self.cameras):
+            data = cam.get_depth()
+            if data is None or np.size(data) == 0:
+                return None
+            depth[i] = np.asarray(data).reshape(depth.shape[1:])
+        return depth
+
+
+class StereoRig(CameraArray):
+    """双目 = 两个相机的 CameraArray，相机沿用 /World/cam_l 和 /World/cam_r，capture() 的结果可以直接解包成左右图"""
+
+    def __init__(self, resolution, focal_length, baseline, batched=True, depth=False):
+        super().__init__(resolution, focal_length, array_offsets("stereo", baseline=baseline),
+                         names=["cam_l", "cam_r"], batched=batched, depth=depth)
+        self.baseline = baseline
+        self.cam_l, self.cam_r = self.cameras
+
     def _get_rig_orientation(self, eye_pos, target_pos):
-        """计算修正后的四元数，确保相机朝向正确且画面水平"""
+        """计算修正后的四元数，确保相机朝向正确且画面水平（Gf 参考实现，用于校验 solve_poses）"""
         eye = Gf.Vec3d(*eye_pos.tolist())
         target = Gf.Vec3d(*target_pos.tolist())
         up = Gf.Vec3d(0, 0, 1)
@@ -33,30 +288,27 @@ class StereoRig:
         q = final_matrix.ExtractRotationQuat()
         return np.array([q.GetReal(), *q.GetImaginary()]) # 返回 [w, x, y, z]
 
+    def solve_poses(self, centers, targets):
+        """批量计算 N 帧的左右相机位置和四元数，不需要 pxr"""
+        return solve_stereo_poses(centers, targets, self.baseline)
+
+    def apply_pose(self, pos_l, pos_r, quat):
+        """把预先解算好的一帧位姿写入左右相机"""
+        self.apply_poses(np.stack([pos_l, pos_r]), quat)
+
     def set_stereo_pose(self, center_pos, target_point):
         """设置双目相机位姿（平行光轴配置）"""
-        rig_quat = self._get_rig_orientation(center_pos, target_point)
-        
-        # 计算水平面上的视线方向，用于推导侧向向量（Side Vector）
-        view_dir_h = np.array([center_pos[0], center_pos[1], 0])
-        dist_h = np.linalg.norm(view_dir_h)
-        
-        if dist_h > 1e-6:
-            view_dir_h /= dist_h
-            # 侧向向量（与视线和Up轴垂直）
-            side_vec = np.array([-view_dir_h[1], view_dir_h[0], 0])
-        else:
-            side_vec = np.array([0, 1, 0])
-        
-        # 计算左右相机位置
-        pos_l = center_pos + side_vec * (self.baseline / 2.0)
-        pos_r = center_pos - side_vec * (self.baseline / 2.0)
-        
-        self.cam_l.set_world_pose(position=pos_l, orientation=rig_quat)
-        self.cam_r.set_world_pose(position=pos_r, orientation=rig_quat)
-        
-        return pos_l, pos_r, rig_quat
+        pos_l, pos_r, quat = self.solve_poses(center_pos, target_point)
+        self.apply_pose(pos_l[0], pos_r[0], quat[0])
+        return pos_l[0], pos_r[0], quat[0]
+
 
-    def capture(self):
-        """获取最新的 RGBA 图像"""
-        return self.cam_l.get_rgba(), self.cam_r.get_rgba()
\ No newline at end of file
+def create_rig(config):
+    """根据 Config.CAMERA_LAYOUT 创建双目或 N 相机阵列"""
+    if config.CAMERA_LAYOUT == "stereo":
+        return StereoRig(config.RESOLUTION, config.FOCAL_LENGTH, config.BASELINE, batched=config.CAMERA_BATCHED,
+                         depth=config.CAPTURE_DEPTH)
+    offsets = array_offsets(config.CAMERA_LAYOUT, config.NUM_CAMERAS, config.BASELINE, config.RING_RADIUS,
+                            config.CAMERA_OFFSETS)
+    return CameraArray(config.RESOLUTION, config.FOCAL_LENGTH, offsets, names=config.view_names(),
+                       batched=config.CAMERA_BATCHED, depth=config.CAPTURE_DEPTH)
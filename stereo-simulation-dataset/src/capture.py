@@ -0,0 +1,149 @@
+# 一次完整的双目 / 相机阵列采集流程（场景、相机、轨迹、预热、逐帧写出）
+# main.py 和常驻任务服务 (common/sim_server.py) 共用，调用前需要已经启动 SimulationApp
+import os
+from functools import partial
+
+from .camera_rig import create_rig
+from .scene_utils import setup_stereo_scene
+from .data_handler import create_writer
+from .trajectory import build_trajectory, save_trajectory
+from .warmup import RendererWarmup
+from .frame_ring import FrameRing
+from .profiler import StageProfiler, MemoryMonitor, peak_rss_mb
+
+
+def run_capture(world, simulation_app, config, frame_start=0, frame_stop=None, on_progress=None):
+    """
+    在 world 上搭建场景并采集 [frame_start, frame_stop) 帧
+    on_progress(frame_id, frame_stop) 在每帧写出后调用；返回写出帧数、渲染器没有输出而跳过的帧数 (dropped)、预热步数、输出目录和错误信息
+    """
+    # 分阶段计时（config.PROFILE 关闭时所有 stage 都是空操作）
+    profiler = StageProfiler(enabled=config.PROFILE)
+
+    # 3. 准备输出目录 (利用你刚学的 @classmethod)
+    config.prepare_output_dirs()
+
+    # 4. 构建场景 (DIY 几何体 或 导入外部模型)
+    setup_stereo_scene(world, config)
+
+    # 5. 初始化相机系统 (双目基线或阵列布局、焦距等)
+    rig = create_rig(config)
+
+    # 6. 初始化数据记录器和采集缓冲环（渲染结果拷进环里，按引用交给写出端，写完归还）
+    writer = create_writer(config, profiler)
+    intrinsic_k = rig.get_intrinsics_matrix()
+    width, height = config.RESOLUTION
+    ring = FrameRing(config.capture_slots(), rig.num_cameras, height, width, depth=config.CAPTURE_DEPTH)
+    memory = MemoryMonitor(enabled=config.PROFILE_MEMORY, frame_bytes=width * height * 3)
+
+    profiler.instrument(rig, ["apply_poses", "capture", "capture_depth"], prefix="rig")
+    # 异步写出时 writer.write_views 只是提交（和队列满时的等待），编码耗时是 worker 里测得的 writer.encode
+    profiler.instrument(writer, ["write_views", "close"], prefix="writer")
+
+    # 一次性生成整条相机中心轨迹，并随数据集保存以便复现
+    with profiler.stage("build_trajectory"):
+        trajectory = build_trajectory(config)
+    save_trajectory(trajectory, config.OUTPUT_DIR)
+
+    # 整条轨迹所有相机的位姿一次性批量解算 (F, N, 3)，循环内只做写入
+    with profiler.stage("rig.solve_poses"):
+        positions, quats = rig.solve_array_poses(trajectory, config.TARGET_POINT)
+
+    # 重置世界以应用更改
+    world.reset()
+
+    # 预热渲染器：让光照和纹理加载完毕，避免第一帧黑屏
+    # 先摆到第一帧的位姿，直到画面稳定且不再是黑屏为止
+    print(">>> Warming up renderer...")
+    first = frame_start if frame_start < config.NUM_FRAMES else 0
+    rig.apply_poses(positions[first], quats[first])
+    warmup_steps = RendererWarmup.from_config(config).run(world, rig)
+
+    # 元数据里记录实际的预热步数（相机阵列另外记录布局和各相机偏移）
+    extra = {"Warm-up Steps": warmup_steps}
+    if config.CAMERA_LAYOUT != "stereo":
+        extra["Camera Layout"] = f"{config.CAMERA_LAYOUT} x{rig.num_cameras}"
+        extra["Camera Offsets (lateral, up)"] = rig.offsets.round(6).tolist()
+    if config.CAPTURE_DEPTH:
+        if config.OUTPUT_BACKEND == "png":
+            extra["Disparity"] = "disp_<view>/ 16-bit PNG, d = fx * baseline / Z = value / scale, 0 = invalid"
+            extra["Disparity Scale"] = config.DISPARITY_SCALE
+        else:
+            extra["Disparity"] = "float16 d = fx * baseline / Z with packed valid mask"
+    writer.save_metadata(config, intrinsic_k, extra=extra)
+
+    print(f">>> Starting capture in {config.ORBIT_MODE} mode...")
+    profiler.start_capture()
+    memory.start()
+
+    frames_written = 0
+    frames_dropped = 0
+    error = None
+    try:
+        frame_stop = config.NUM_FRAMES if frame_stop is None else min(frame_stop, config.NUM_FRAMES)
+        for i in range(frame_start, frame_stop):
+            # 续跑时跳过已经完整落盘的帧
+            if i in writer.completed_frames:
+                continue
+
+            # A. 取出预先解算好的各相机位姿 (look-at 和阵列偏移已在 solve_array_poses 中完成)
+            frame_positions, quat = positions[i], quats[i]
+
+            # B. 一次批量更新所有相机位姿
+            rig.apply_poses(frame_positions, quat)
+
+            # C. 仿真步进并渲染
+            with profiler.stage("world.step"):
+                world.step(render=True)
+            with profiler.stage("simulation_app.update"):
+                simulation_app.update()
+
+            # D. 提取图像数据：取一块空闲缓冲（写出端还占着所有块时在这里等待），渲染结果只拷贝这一次
+            with profiler.stage("ring.acquire"):
+                slot = ring.acquire()
+            views = rig.capture(out=ring[slot])
+            # 深度同样拷进环里，视差换算交给写出端
+            depth = rig.capture_depth(out=ring.depth[slot]) if config.CAPTURE_DEPTH else None
+
+            # E. 保存数据（缓冲按引用交给写出端，编码完成后归还到环里）
+            if views is not None and (depth is not None or not config.CAPTURE_DEPTH):
+                writer.write_views(
+                    frame_id=i,
+                    time=world.current_time,
+                    positions=frame_positions,
+                    quat=quat,
+                    views=views,
+                    depth=depth,
+                    release=partial(ring.release, slot)
+                )
+                frames_written += 1
+            else:
+                # 渲染器这一帧没有输出，跳过（不计入写出帧数）
+                ring.release(slot)
+                frames_dropped += 1
+                print(f">>> Frame {i}: renderer returned no data, skipped")
+            profiler.frame_done()
+            memory.frame_done()
+            if on_progress is not None:
+                on_progress(i, frame_stop)
+
+            if i % 10 == 0:
+                print(f"Captured {i}/{config.NUM_FRAMES} frames...")
+
+    except Exception as e:
+        error = str(e)
+        print(f"An error occurred during simulation: {e}")
+
+    finally:
+        # 7. 清理工作
+        writer.close()
+        print(f">>> Task finished. Data saved to: {config.OUTPUT_DIR}")
+        profiler.summary()
+        profiler.export_chrome_trace(os.path.join(config.OUTPUT_DIR, "profile_trace.json"))
+        memory.summary()
+        print(f">>> Capture ring: {ring.slots} x {ring.nbytes / ring.slots / 2**20:.1f} MB, "
+              f"waited for the writer {ring.waits} time(s), peak RSS {peak_rss_mb():.1f} MB")
+
+    return {"frames": frames_written, "dropped": frames_dropped, "warmup_steps": warmup_steps,
+            "output_dir": config.OUTPUT_DIR, "error": error,
+            "peak_rss_mb": peak_rss_mb(), "memory": memory.stats() if memory.enabled else None}
@@ -9,23 +9,55 @@ class Config:
     OUTPUT_DIR = os.path.join(BASE_DIR, "output", "stereo_dataset_geometry_shape")
     # OUTPUT_DIR = os.path.join(BASE_DIR, "output", "stereo_dataset_bunny")
     
+    # 无界面模式（多进程分片采集时 worker 总是 headless）
+    HEADLESS = False
+
     # --- 2. 相机配置 ---
     RESOLUTION = (400, 400)
     FOCAL_LENGTH = 1.32383  # 单位: mm (Isaac Sim Camera API 使用)
-    BASELINE = 0.032     # 双目基线距离 (m)
+    BASELINE = 0.032     # 双目基线距离 (m)，linear 阵列中相邻相机的间距
+
+    # 相机阵列布局: "stereo" (左右双目) / "linear" (沿基线等间距 NUM_CAMERAS 个，3 个即三目)
+    #              "ring" (垂直于视线、半径 RING_RADIUS 的圆环) / "custom" (CAMERA_OFFSETS 指定，如多基线)
+    CAMERA_LAYOUT = "stereo"
+    NUM_CAMERAS = 2
+    RING_RADIUS = 0.05
+    CAMERA_OFFSETS = None   # custom 布局每个相机的 [横向, 竖直] 偏移 (m)，形如 [[0.05, 0], [0.01, 0], [-0.03, 0]]
+    # 有 CameraView 时整组相机一次批量设置位姿、一次批量抓图
+    CAMERA_BATCHED = True
     
     # --- 3. 轨迹模式配置 ---
-    # 选项: "circle" 或 "linear"
+    # 选项: "circle", "linear", "helix", "polyline", "spline" 或 "sphere"
     ORBIT_MODE = "linear" 
     # ORBIT_MODE = "circle" 
     
     NUM_FRAMES = 50
-    RADIUS = 0.4        # 圆形轨道的半径 或 直线轨道的偏移范围
-    HEIGHT = 0.4        # 相机高度
+    RADIUS = 0.4        # 圆形/螺旋轨道的半径，或球面采样的半径
+    HEIGHT = 0.4        # 相机高度（螺旋轨道的起始高度）
     TARGET_POINT = np.array([0.0, 0.0, 0.0])
 
     POINTA = np.array([0.5, 0.5, 0.5])
     POINTB = np.array([0.2, 0.2, 0.2])
+
+    # 螺旋轨道参数
+    HELIX_TURNS = 2.0
+    HELIX_END_HEIGHT = 0.2
+
+    # 折线 / 样条轨道的航点 (M, 3)
+    WAYPOINTS = np.array([
+        [0.5, 0.0, 0.4],
+        [0.0, 0.5, 0.3],
+        [-0.5, 0.0, 0.4],
+        [0.0, -0.5, 0.3],
+    ])
+    SPLINE_CLOSED = False
+
+    # 球面采样的最低仰角 (deg)，避免视点落到地面以下
+    SPHERE_MIN_ELEVATION = 15.0
+
+    # 弧长重参数化：让相邻帧间距相等（先按 OVERSAMPLE 倍加密再重采样）
+    ARC_LENGTH_UNIFORM = False
+    ARC_LENGTH_OVERSAMPLE = 8
     
     # --- 4. 场景物体配置 ---
     # 选项: "diy" (内置几何体) 或 "import" (加载外部模型)
@@ -44,11 +76,69 @@ class Config:
     MODEL_SCALE = [2, 2, 2]  # 根据需要调整
     MODEL_POS = [0.0, 0.0, 0.0]    # 放置在原点
 
+    # --- 5. 渲染器预热 ---
+    # 每步抓图，直到连续 PATIENCE 帧的平均绝对差 < DIFF_THRESHOLD (0-255 灰度) 且非黑像素比例达标
+    WARMUP_MAX_STEPS = 300
+    WARMUP_MIN_STEPS = 5
+    WARMUP_DIFF_THRESHOLD = 0.5
+    WARMUP_MIN_VALID_RATIO = 0.05
+    WARMUP_PATIENCE = 3
+
+    # --- 6. 数据写出配置 ---
+    # 选项: "png" (每帧左右两张 PNG + CSV) 或 "shard" (memmap 分片二进制格式)
+    OUTPUT_BACKEND = "png"
+    SHARD_FRAMES = 1000         # shard 后端每个分片预分配的帧数
+    SHARD_CHECKPOINT = 50       # 每写这么多帧刷盘并更新 index.json，崩溃时最多丢失这么多帧（0 = 只在分片写满时）
+
+    # 位姿日志格式: "csv" (文本，兼容续跑和多进程合并) / "npy" / "npz" (二进制，写读都更快)
+    POSE_LOG_FORMAT = "csv"
+
+    # 分阶段计时：结束时打印 p50/p95/max 表并导出 profile_trace.json (Chrome trace)
+    PROFILE = False
+
+    # 续跑模式：不清空输出目录，跳过 manifest 中已校验完成的帧（仅 png 后端）
+    RESUME = False
+
+    # 异步模式下 PNG 编码交给后台 worker 池，仿真循环只提交图像缓冲
+    WRITER_ASYNC = True
+    WRITER_POOL = "thread"      # 选项: "thread" 或 "process"
+    WRITER_WORKERS = 4
+    WRITER_MAX_PENDING = 16     # 在途帧数上限，队列满时主循环阻塞等待
+
+    # 采集缓冲环：预分配 (N, H, W, 3) uint8 的块，渲染结果只拷贝一次，写出完成后复用
+    # 块在编码完成后才归还，所以块数也是在途帧数上限：实际块数见 capture_slots()，
+    # 异步 PNG 写出时至少 WRITER_MAX_PENDING + 1 块，否则环会先于写出队列卡住主循环、让 worker 空闲
+    # 2 即双缓冲（同步写出或 shard 后端，写完立即归还）
+    CAPTURE_BUFFERS = 2
+    # 逐帧内存统计（tracemalloc，较慢）：结束时打印每帧分配量和峰值 RSS
+    PROFILE_MEMORY = False
+
+    # --- 7. 深度 / 视差真值 ---
+    # 每个相机额外抓取深度，按 d = f * BASELINE / Z 转成视差（f 取 dataset_info.txt 里 K 的 fx）
+    # png 后端: disp_left/ disp_right/ 下的 16 位 PNG，round(d * DISPARITY_SCALE)，0 = 无效像素
+    # shard 后端: float16 视差 + 按位打包的有效掩码
+    CAPTURE_DEPTH = False
+    DISPARITY_SCALE = 256.0     # 16 位定点的缩放，最大可表示 65535 / DISPARITY_SCALE 像素
+
+    @classmethod
+    def view_names(cls):
+        """每个相机的图像子目录名：双目沿用 left / right，阵列按序号 cam_00, cam_01, ..."""
+        if cls.CAMERA_LAYOUT == "stereo":
+            return ["left", "right"]
+        num_cameras = len(cls.CAMERA_OFFSETS) if cls.CAMERA_LAYOUT == "custom" else cls.NUM_CAMERAS
+        return [f"cam_{i:02d}" for i in range(num_cameras)]
+
+    @classmethod
+    def capture_slots(cls):
+        """采集缓冲环的块数：异步 PNG 写出时多留一块，队列满时主循环仍能渲染下一帧"""
+        if cls.OUTPUT_BACKEND == "png" and cls.WRITER_ASYNC:
+            return max(cls.CAPTURE_BUFFERS, cls.WRITER_MAX_PENDING + 1)
+        return cls.CAPTURE_BUFFERS
+
     @classmethod
     def prepare_output_dirs(cls):
-        """在 main.py 调用，自动创建所需的文件夹结构"""
-        left_dir = os.path.join(cls.OUTPUT_DIR, "left")
-        right_dir = os.path.join(cls.OUTPUT_DIR, "right")
-        os.makedirs(left_dir, exist_ok=True)
-        os.makedirs(right_dir, exist_ok=True)
-        return left_dir, right_dir
\ No newline at end of file
+        """在 main.py 调用，自动创建所需的文件夹结构（每个相机一个子目录）"""
+        view_dirs = [os.path.join(cls.OUTPUT_DIR, name) for name in cls.view_names()]
+        for view_dir in view_dirs:
+            os.makedirs(view_dir, exist_ok=True)
+        return view_dirs
\ No newline at end of file
@@ -1,88 +1,456 @@
+import io
 import os
 import csv
+import zlib
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import numpy as np
 from PIL import Image
 import shutil
 
+from common.columnar_log import ColumnarLog
+from .disparity import depth_to_disparity, encode_disparity_png16
+
+
+CSV_HEADER = [
+    "frame", "time",
+    "p_l_x", "p_l_y", "p_l_z", "q_w", "q_x", "q_y", "q_z",
+    "p_r_x", "p_r_y", "p_r_z"
+]
+
+# 位姿日志的列定义（列名与 CSV_HEADER 一致），time 保持原来的 4 位小数
+POSE_LOG_FIELDS = [("frame", np.int32), ("time", np.float64, "%.4f")] + [
+    (name, np.float64) for name in CSV_HEADER[2:]
+]
+
+STEREO_VIEWS = ("left", "right")
+
+
+def array_pose_header(view_names):
+    """N 相机阵列的位姿表头：共用的四元数在前，之后每个相机一组位置 p_<view>_x/y/z"""
+    return ["frame", "time", "q_w", "q_x", "q_y", "q_z"] + [
+        f"p_{name}_{axis}" for name in view_names for axis in "xyz"
+    ]
+
+
+def pose_log_fields(view_names):
+    """双目沿用原来的 CSV_HEADER 列顺序，其余阵列使用 array_pose_header"""
+    if tuple(view_names) == STEREO_VIEWS:
+        return POSE_LOG_FIELDS
+    header = array_pose_header(view_names)
+    return [("frame", np.int32), ("time", np.float64, "%.4f")] + [(name, np.float64) for name in header[2:]]
+
+
+def _save_png(img, path):
+    """
+    编码成 PNG 后原子写盘（先写 .tmp 再改名），返回文件内容的 CRC32
+    img: (H, W, 3|4) 图像按 8 位 RGB 保存；(H, W) uint16 按 16 位灰度保存（视差）
+    """
+    if img.ndim == 3:
+        img = img[:, :, :3]
+        # 已经是 uint8 时不再整幅拷贝（FrameRing 的 RGB 缓冲直接交给 PIL）
+        if img.dtype != np.uint8:
+            img = img.astype(np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(img).save(buf, format="PNG")
+    data = buf.getvalue()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return zlib.crc32(data)
+
+
+def _encode_views(images, paths):
+    """把一帧各相机的 RGBA 图像编码成 PNG 写盘（可在线程或子进程中执行），返回每张图的 CRC32"""
+    return tuple(_save_png(img, path) for img, path in zip(images, paths))
+
+
+def _encode_frame(images, paths, depth=None, disp_paths=(), focal_px=None, baseline=None, scale=256.0):
+    """
+    编码一帧：各相机的 RGB PNG，有深度时再把 d = f * B / Z 转成 16 位定点视差 PNG（0 = 无效）
+    视差转换也在 worker 里做，主循环只交出深度缓冲；返回按 paths + disp_paths 顺序的 CRC32
+    """
+    checksums = _encode_views(images, paths)
+    if depth is None:
+        return checksums
+    return checksums + tuple(
+        _save_png(encode_disparity_png16(*depth_to_disparity(z, focal_px, baseline), scale=scale), path)
+        for z, path in zip(depth, disp_paths)
+    )
+
+
+def _encode_frame_timed(*args):
+    """
+    在 worker 里执行 _encode_frame 并计时，返回 (CRC32 元组, 开始 ns, 耗时 ns, pid, 线程号)
+    perf_counter_ns 在 Linux 上是系统级单调时钟，进程池 worker 的时间戳也能和主进程对齐
+    """
+    start = time.perf_counter_ns()
+    checksums = _encode_frame(*args)
+    return checksums, start, time.perf_counter_ns() - start, os.getpid(), threading.get_ident()
+
+
+def _file_crc32(path):
+    with open(path, "rb") as f:
+        return zlib.crc32(f.read())
+
+
+def write_dataset_info(output_dir, config, intrinsic_matrix, extra=None):
+    """
+    写出 dataset_info.txt（PNG 和分片两种后端共用同一份格式）
+    extra: 运行期才知道的附加信息（如预热步数），以 "key: value" 形式写在基本信息之后
+    """
+    meta_path = os.path.join(output_dir, "dataset_info.txt")
+    with open(meta_path, "w", encoding="utf-8") as f:
+        f.write("=== Synthetic Stereo Dataset Metadata ===\n")
+        f.write(f"Scene Mode: {config.SCENE_MODE}\n")
+        f.write(f"Orbit Mode: {config.ORBIT_MODE}\n")
+        f.write(f"Resolution: {config.RESOLUTION[0]}x{config.RESOLUTION[1]}\n")
+        f.write(f"Focal Length: {10 * config.FOCAL_LENGTH}mm\n")
+        f.write(f"Stereo Baseline: {config.BASELINE}m\n")
+        for key, value in (extra or {}).items():
+            f.write(f"{key}: {value}\n")
+        f.write("-" * 40 + "\n")
+        f.write("Camera Intrinsic Matrix (K):\n")
+        f.write(np.array2string(intrinsic_matrix, separator=', '))
+        f.write("\n\n" + "-" * 40 + "\n")
+        f.write("Scene Details:\n")
+        if config.SCENE_MODE == "diy":
+            f.write(f" - Sphere Radius: {config.SPHERE_RADIUS}m\n")
+            f.write(f" - Cube Scale: {config.CUBE_SCALE}m\n")
+        else:
+            f.write(f" - Imported USD: {config.USD_PATH}\n")
+    # --- 新增：特定格式化输出 (Easy Copy 格式) ---
+        f.write("=== Easy Copy Format (K_flat and Baseline) ===\n")
+        
+        # 1. 将 3x3 矩阵展平为包含 9 个元素的列表
+        k_flat = intrinsic_matrix.flatten()
+        
+        # 2. 格式化为：空格分隔的字符串 (使用 :g 自动处理有效数字，避免过长的 0)
+        k_line = " ".join([f"{x:1}" for x in k_flat])
+        
+        # 3. 写入文件
+        f.write(k_line + "\n")
+        f.write(f"{config.BASELINE}\n")
+    print(f">>> Metadata and Intrinsics saved to: {meta_path}")
+    return meta_path
+
+
 class DatasetWriter:
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, async_mode=False, num_workers=4, pool_type="thread", max_pending=16,
+                 resume=False, pose_format="csv", pose_chunk_rows=None, view_names=STEREO_VIEWS,
+                 depth=False, disparity_scale=256.0, profiler=None):
+        """
+        async_mode: True 时 PNG 编码交给后台 worker 池，主循环只负责提交图像缓冲
+        pool_type: "thread" 或 "process"
+        max_pending: 排队中的最大帧数，超过后 write_frame 阻塞（背压）
+        resume: True 时保留已有输出，根据 manifest 校验已完成的帧并在其后追加
+        pose_format: 位姿日志格式 "csv" / "npy" / "npz"（续跑只支持 csv）
+        pose_chunk_rows: 位姿日志每攒多少行刷一次盘；manifest 行要等对应的位姿行落盘才写，
+                         所以崩溃时最多有这么多已落盘的帧需要续跑时重做。
+                         默认 csv（唯一支持续跑的格式）逐帧刷盘，npy / npz 每 256 行刷一次
+        view_names: 每个相机的图像子目录，默认双目 left / right；N 相机阵列每帧写 N 张图
+        depth: True 时每个相机另写一张 16 位视差 PNG 到 disp_<view>/，值为 round(d * disparity_scale)，0 = 无效
+        profiler: StageProfiler；每帧的编码耗时（异步模式下在 worker 里测量）记为 "writer.encode" 阶段，
+                  异步模式下 write_views 本身只是提交
+        """
+        if resume and pose_format != "csv":
+            raise ValueError("resume requires the csv pose log format")
+
         self.output_dir = output_dir
-        self.left_dir = os.path.join(output_dir, "left")
-        self.right_dir = os.path.join(output_dir, "right")
+        self.view_names = list(view_names)
+        self.view_dirs = [os.path.join(output_dir, name) for name in self.view_names]
+        self.depth = depth
+        self.disparity_scale = disparity_scale
+        self.disp_dirs = [os.path.join(output_dir, f"disp_{name}") for name in self.view_names] if depth else []
+        # 每帧要落盘的全部文件所在目录（图像在前，视差在后），manifest 按同样顺序记录 CRC
+        self._frame_dirs = self.view_dirs + self.disp_dirs
+        # 视差换算用的 fx 和基线在 save_metadata 时确定
+        self._focal_px = None
+        self._baseline = None
+        self.pose_fields = pose_log_fields(self.view_names)
+        self.pose_header = [field[0] for field in self.pose_fields]
+        self.csv_path = os.path.join(output_dir, "camera_poses.csv")
+        self.pose_path = os.path.join(output_dir, f"camera_poses.{pose_format}")
+        # 追加式清单：每行 "frame crc_0 crc_1 ..."（双目即 crc_l crc_r），只有图像和 CSV 行都落盘后才写入
+        self.manifest_path = os.path.join(output_dir, "manifest.txt")
+
+        self.resume = resume and os.path.exists(self.csv_path)
+        self.completed_frames = set()
 
         # --- 新增：清空逻辑 ---
-        if os.path.exists(self.output_dir):
+        if not self.resume and os.path.exists(self.output_dir):
             print(f">>> Detected existing output directory: {self.output_dir}. Cleaning up...")
             # 这种方式会删除整个文件夹及其内容
             shutil.rmtree(self.output_dir)
         
-        os.makedirs(self.left_dir, exist_ok=True)
-        os.makedirs(self.right_dir, exist_ok=True)
-        
-        self.csv_path = os.path.join(output_dir, "camera_poses.csv")
-        self.csv_file = open(self.csv_path, 'w', newline='')
-        self.writer = csv.writer(self.csv_file)
-        
-        self.writer.writerow([
-            "frame", "time", 
-            "p_l_x", "p_l_y", "p_l_z", "q_w", "q_x", "q_y", "q_z",
-            "p_r_x", "p_r_y", "p_r_z"
-        ])
+        for frame_dir in self._frame_dirs:
+            os.makedirs(frame_dir, exist_ok=True)
+
+        if self.resume:
+            self.completed_frames = self._recover()
+            print(f">>> Resuming: {len(self.completed_frames)} completed frame(s) found in {self.output_dir}")
+        if pose_chunk_rows is None:
+            pose_chunk_rows = 1 if pose_format == "csv" else 256
+        self.pose_log = ColumnarLog(self.pose_path, self.pose_fields, fmt=pose_format,
+                                    chunk_rows=pose_chunk_rows, append=self.resume)
+        self.manifest_file = open(self.manifest_path, 'a')
+        # 位姿行缓冲在 pose_log 里，对应的 manifest 行要等它们刷盘后再写，保证清单里的帧一定有位姿
+        self._manifest_pending = []
+
+        self.profiler = profiler
 
-    def save_metadata(self, config, intrinsic_matrix):
+        # --- 异步编码池 ---
+        self.async_mode = async_mode
+        self._pool = None
+        if async_mode:
+            if pool_type == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=num_workers)
+            elif pool_type == "process":
+                self._pool = ProcessPoolExecutor(max_workers=num_workers)
+            else:
+                raise ValueError(f"Unknown pool_type: {pool_type}")
+            # 信号量限制在途帧数，编码完成时释放
+            self._slots = threading.BoundedSemaphore(max_pending)
+            # 按提交顺序排队的 (future, csv_row)，保证 CSV 行序与帧序一致
+            self._pending = deque()
+
+    def _recover(self):
+        """
+        对照 manifest、CSV 和图像文件找出真正完成的帧：
+        三者齐全且 PNG 的 CRC 与 manifest 一致才算完成，其余视为半成品需要重做。
+        随后把 CSV 和 manifest 重写为只包含完成帧的版本，再以追加模式继续
+        """
+        manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                for line in f:
+                    parts = line.split()
+                    # 崩溃时可能留下写了一半的最后一行
+                    if len(parts) != 1 + len(self._frame_dirs) or not line.endswith("\n"):
+                        continue
+                    manifest[int(parts[0])] = tuple(int(x) for x in parts[1:])
+
+        rows = {}
+        with open(self.csv_path, newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if len(row) == len(self.pose_header):
+                    rows[int(row[0])] = row
+
+        completed = {}
+        for frame_id, crcs in manifest.items():
+            if frame_id not in rows:
+                continue
+            paths = self._frame_paths(frame_id)
+            if not all(os.path.exists(path) for path in paths):
+                continue
+            if any(_file_crc32(path) != crc for path, crc in zip(paths, crcs)):
+                continue
+            completed[frame_id] = crcs
+
+        # 清理崩溃时残留的临时文件
+        for folder in self._frame_dirs:
+            for name in os.listdir(folder):
+                if name.endswith(".tmp"):
+                    os.remove(os.path.join(folder, name))
+
+        dropped = len(set(rows) | set(manifest)) - len(completed)
+        if dropped:
+            print(f">>> Resume: {dropped} partially written frame(s) will be redone.")
+
+        with open(self.csv_path + ".tmp", 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.pose_header)
+            for frame_id in sorted(completed):
+                writer.writerow(rows[frame_id])
+        os.replace(self.csv_path + ".tmp", self.csv_path)
+
+        with open(self.manifest_path + ".tmp", 'w') as f:
+            for frame_id in sorted(completed):
+                f.write(" ".join(str(x) for x in (frame_id, *completed[frame_id])) + "\n")
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+        return set(completed)
+
+    def _commit_frame(self, row, checksums):
+        """图像已落盘：追加位姿行；位姿日志刷盘后再把这一批帧写进 manifest"""
+        self._manifest_pending.append(" ".join(str(x) for x in (row[0], *checksums)) + "\n")
+        self.completed_frames.add(row[0])
+        if self.pose_log.append(row):
+            self._flush_manifest()
+
+    def _flush_manifest(self):
+        self.manifest_file.writelines(self._manifest_pending)
+        self.manifest_file.flush()
+        self._manifest_pending = []
+
+    def save_metadata(self, config, intrinsic_matrix, extra=None):
         """
         保存数据集描述和相机内参
         intrinsic_matrix: 3x3 的 numpy 数组
         """
-        meta_path = os.path.join(self.output_dir, "dataset_info.txt")
-        with open(meta_path, "w", encoding="utf-8") as f:
-            f.write("=== Synthetic Stereo Dataset Metadata ===\n")
-            f.write(f"Scene Mode: {config.SCENE_MODE}\n")
-            f.write(f"Orbit Mode: {config.ORBIT_MODE}\n")
-            f.write(f"Resolution: {config.RESOLUTION[0]}x{config.RESOLUTION[1]}\n")
-            f.write(f"Focal Length: {10 * config.FOCAL_LENGTH}mm\n")
-            f.write(f"Stereo Baseline: {config.BASELINE}m\n")
-            f.write("-" * 40 + "\n")
-            f.write("Camera Intrinsic Matrix (K):\n")
-            f.write(np.array2string(intrinsic_matrix, separator=', '))
-            f.write("\n\n" + "-" * 40 + "\n")
-            f.write("Scene Details:\n")
-            if config.SCENE_MODE == "diy":
-                f.write(f" - Sphere Radius: {config.SPHERE_RADIUS}m\n")
-                f.write(f" - Cube Scale: {config.CUBE_SCALE}m\n")
-            else:
-                f.write(f" - Imported USD: {config.USD_PATH}\n")
-        # --- 新增：特定格式化输出 (Easy Copy 格式) ---
-            f.write("=== Easy Copy Format (K_flat and Baseline) ===\n")
-            
-            # 1. 将 3x3 矩阵展平为包含 9 个元素的列表
-            k_flat = intrinsic_matrix.flatten()
-            
-            # 2. 格式化为：空格分隔的字符串 (使用 :g 自动处理有效数字，避免过长的 0)
-            k_line = " ".join([f"{x:1}" for x in k_flat])
-            
-            # 3. 写入文件
-            f.write(k_line + "\n")
-            f.write(f"{config.BASELINE}\n")
-        print(f">>> Metadata and Intrinsics saved to: {meta_path}")
+        self._focal_px = float(intrinsic_matrix[0, 0])
+        self._baseline = config.BASELINE
+        write_dataset_info(self.output_dir, config, intrinsic_matrix, extra)
 
-    def write_frame(self, frame_id, time, pos_l, pos_r, quat, img_l, img_r):
+    def _frame_paths(self, frame_id):
         file_name = f"{frame_id:04d}.png"
-        
-        img_l_pix = Image.fromarray(img_l[:, :, :3].astype(np.uint8))
-        img_r_pix = Image.fromarray(img_r[:, :, :3].astype(np.uint8))
-        
-        img_l_pix.save(os.path.join(self.left_dir, file_name))
-        img_r_pix.save(os.path.join(self.right_dir, file_name))
-        
-        self.writer.writerow([
-            frame_id, f"{time:.4f}",
-            pos_l[0], pos_l[1], pos_l[2], 
-            quat[0], quat[1], quat[2], quat[3],
-            pos_r[0], pos_r[1], pos_r[2]
-        ])
+        return [os.path.join(frame_dir, file_name) for frame_dir in self._frame_dirs]
+
+    def _pose_row(self, frame_id, time, positions, quat):
+        if tuple(self.view_names) == STEREO_VIEWS:
+            pos_l, pos_r = positions
+            return [
+                frame_id, time,
+                pos_l[0], pos_l[1], pos_l[2],
+                quat[0], quat[1], quat[2], quat[3],
+                pos_r[0], pos_r[1], pos_r[2]
+            ]
+        return [frame_id, time, *quat] + [p for position in positions for p in position]
+
+    def write_frame(self, frame_id, time, pos_l, pos_r, quat, img_l, img_r):
+        """双目接口，等价于 write_views(frame_id, time, [pos_l, pos_r], quat, [img_l, img_r])"""
+        self.write_views(frame_id, time, (pos_l, pos_r), quat, (img_l, img_r))
+
+    def write_views(self, frame_id, time, positions, quat, views, depth=None, release=None):
+        """
+        写出一帧 N 个相机的图像和位姿
+        positions: (N, 3)；quat: 共用的 [w, x, y, z]；views: (N, H, W, 3|4) 数组或 N 张图像的序列
+        depth: depth=True 时必须提供的 (N, H, W) 到像平面的距离 (m)，在编码端转成视差
+        release: 图像编码完成后调用（归还 FrameRing 缓冲）。传入时 views / depth 按引用交给写出端，
+                 调用方在 release 之前不能改写；不传时异步模式会先拷贝一份
+        """
+        try:
+            self._check_frame(frame_id, views, depth)
+        except ValueError:
+            # 拒收的帧也要归还缓冲
+            if release is not None:
+                release()
+            raise
+        if not self.depth:
+            depth = None
+        paths = self._frame_paths(frame_id)
+        image_paths, disp_paths = paths[:len(self.view_dirs)], paths[len(self.view_dirs):]
+        encode_args = (image_paths, depth, disp_paths, self._focal_px, self._baseline, self.disparity_scale)
+        row = self._pose_row(frame_id, time, positions, quat)
+
+        if not self.async_mode:
+            try:
+                checksums = self._record_encode(_encode_frame_timed(views, *encode_args))
+            finally:
+                if release is not None:
+                    release()
+            self._commit_frame(row, checksums)
+            return
+
+        if release is None:
+            # 调用方没有移交缓冲（如 CameraArray.frames 会被下一次抓图覆盖），提交前先拷出 RGB
+            images = [np.array(img[:, :, :3]) for img in views]
+            if depth is not None:
+                depth = np.array(depth)
+                encode_args = (image_paths, depth) + encode_args[2:]
+        else:
+            images = views
+
+        def done(_):
+            self._slots.release()
+            if release is not None:
+                release()
+
+        # 队列满时在这里阻塞，直到有 worker 完成一帧
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(_encode_frame_timed, images, *encode_args)
+        except BaseException:
+            self._slots.release()
+            if release is not None:
+                release()
+            raise
+        future.add_done_callback(done)
+        self._pending.append((future, row))
+        self._flush_rows(block=False)
+
+    def _check_frame(self, frame_id, views, depth):
+        if len(views) != len(self.view_dirs):
+            raise ValueError(f"Frame {frame_id} has {len(views)} views, expected {len(self.view_dirs)}")
+        if self.depth and (depth is None or self._focal_px is None):
+            raise ValueError("Depth capture needs a depth buffer per frame and save_metadata() before the first frame")
+
+    def _record_encode(self, timed):
+        checksums, start_ns, dur_ns, pid, thread_id = timed
+        if self.profiler is not None:
+            # 线程池按线程区分，进程池按 worker 进程区分
+            self.profiler.record("writer.encode", start_ns, dur_ns, tid=thread_id if pid == os.getpid() else pid)
+        return checksums
+
+    def _flush_rows(self, block):
+        """按提交顺序写出已完成编码的 CSV 行；block=True 时等待全部完成"""
+        while self._pending:
+            future, row = self._pending[0]
+            if not block and not future.done():
+                break
+            # 编码失败时在这里把异常抛回主线程
+            checksums = self._record_encode(future.result())
+            self._pending.popleft()
+            self._commit_frame(row, checksums)
 
     def close(self):
-        if hasattr(self, 'csv_file'):
-            self.csv_file.close()
-            print(">>> CSV file closed.")
\ No newline at end of file
+        if self._pool is not None:
+            try:
+                # 等待队列排空，再关闭 worker 池
+                self._flush_rows(block=True)
+            finally:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+            print(">>> Async encoder drained.")
+        if hasattr(self, 'pose_log'):
+            self.pose_log.close()
+            self._flush_manifest()
+            self.manifest_file.close()
+            print(f">>> Pose log closed: {self.pose_path}")
+        if self.resume:
+            self._sort_csv()
+
+    def _sort_csv(self):
+        """续跑时补做的帧追加在文件末尾，收尾时按帧号重新排序"""
+        with open(self.csv_path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows = sorted(reader, key=lambda row: int(row[0]))
+        with open(self.csv_path + ".tmp", 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        os.replace(self.csv_path + ".tmp", self.csv_path)
+
+
+def create_writer(config, profiler=None):
+    """根据 Config.OUTPUT_BACKEND 创建数据写出后端；profiler 用于记录 PNG 后端 worker 里的编码耗时"""
+    if config.OUTPUT_BACKEND == "png":
+        return DatasetWriter(
+            config.OUTPUT_DIR,
+            async_mode=config.WRITER_ASYNC,
+            num_workers=config.WRITER_WORKERS,
+            pool_type=config.WRITER_POOL,
+            max_pending=config.WRITER_MAX_PENDING,
+            resume=config.RESUME,
+            pose_format=config.POSE_LOG_FORMAT,
+            view_names=config.view_names(),
+            depth=config.CAPTURE_DEPTH,
+            disparity_scale=config.DISPARITY_SCALE,
+            profiler=profiler if profiler is not None and profiler.enabled else None
+        )
+    elif config.OUTPUT_BACKEND == "shard":
+        if config.RESUME:
+            raise ValueError("RESUME is only supported by the png backend")
+        if config.CAMERA_LAYOUT != "stereo":
+            raise ValueError("The shard backend only stores stereo pairs; use the png backend for camera arrays")
+        from .shard_store import ShardedDatasetWriter
+        return ShardedDatasetWriter(config.OUTPUT_DIR, frames_per_shard=config.SHARD_FRAMES,
+                                    depth=config.CAPTURE_DEPTH, checkpoint_interval=config.SHARD_CHECKPOINT)
+    else:
+        raise ValueError(f"Unknown OUTPUT_BACKEND: {config.OUTPUT_BACKEND}")
@@ -0,0 +1,211 @@
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+
+from .data_handler import CSV_HEADER
+from .shard_store import POSE_DTYPE
+from .disparity import decode_disparity_png16
+from common.columnar_log import load_log
+
+
+def _decode_pair(path_l, path_r):
+    """解码一对 PNG（可在线程或子进程中执行）"""
+    with Image.open(path_l) as im_l, Image.open(path_r) as im_r:
+        return np.asarray(im_l.convert("RGB")), np.asarray(im_r.convert("RGB"))
+
+
+def read_disparity_png(path, scale=256.0):
+    """读取 16 位视差 PNG，返回 (float32 视差, 有效掩码)"""
+    with Image.open(path) as im:
+        return decode_disparity_png16(np.asarray(im), scale)
+
+
+def find_pose_log(output_dir):
+    """按 csv / npy / npz 的顺序找位姿日志"""
+    for ext in ("csv", "npy", "npz"):
+        path = os.path.join(output_dir, f"camera_poses.{ext}")
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No camera_poses.csv/.npy/.npz in {output_dir}")
+
+
+def load_pose_table(pose_path):
+    """一次性把位姿日志（csv/npy/npz）解析成 POSE_DTYPE 结构化数组"""
+    raw = load_log(pose_path)
+    raw = np.stack([raw[name].astype(np.float64) for name in CSV_HEADER], axis=1) if len(raw) else np.zeros((0, 12))
+    table = np.zeros(len(raw), dtype=POSE_DTYPE)
+    if len(raw):
+        table["frame"] = raw[:, 0].astype(np.int32)
+        table["time"] = raw[:, 1]
+        table["p_l"] = raw[:, 2:5]
+        table["q"] = raw[:, 5:9]
+        table["p_r"] = raw[:, 9:12]
+    return table
+
+
+def parse_dataset_info(info_path):
+    """从 dataset_info.txt 的 Easy Copy 段读回 K 矩阵和基线，并顺带解析分辨率"""
+    with open(info_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    info = {}
+    for line in lines:
+        m = re.match(r"Resolution: (\d+)x(\d+)", line)
+        if m:
+            info["resolution"] = (int(m.group(1)), int(m.group(2)))
+        m = re.match(r"Disparity Scale: ([0-9.eE+-]+)", line)
+        if m:
+            info["disparity_scale"] = float(m.group(1))
+
+    marker = next(i for i, line in enumerate(lines) if line.startswith("=== Easy Copy Format"))
+    k_flat = np.array([float(x) for x in lines[marker + 1].split()])
+    info["intrinsic_matrix"] = k_flat.reshape(3, 3)
+    info["baseline"] = float(lines[marker + 2])
+    return info
+
+
+class StereoDatasetReader:
+    """
+    读取 DatasetWriter 输出的 left/ right/ camera_poses.(csv|npy|npz) dataset_info.txt
+    支持随机访问和顺序迭代，后台 worker 池解码 PNG，并对已解码帧做 LRU 缓存
+    """
+
+    def __init__(self, output_dir, prefetch=8, num_workers=4, pool_type="thread", cache_size=64):
+        self.output_dir = output_dir
+        self.left_dir = os.path.join(output_dir, "left")
+        self.right_dir = os.path.join(output_dir, "right")
+
+        self.poses = load_pose_table(find_pose_log(output_dir))
+        info = parse_dataset_info(os.path.join(output_dir, "dataset_info.txt"))
+        self.intrinsic_matrix = info["intrinsic_matrix"]
+        self.baseline = info["baseline"]
+        self.resolution = info.get("resolution")
+        # 采集时打开了 CAPTURE_DEPTH 才有 disp_left/ disp_right/
+        self.disparity_scale = info.get("disparity_scale")
+        self.has_depth = os.path.isdir(os.path.join(output_dir, "disp_left"))
+
+        self.prefetch = prefetch
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        if pool_type == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=num_workers)
+        elif pool_type == "process":
+            self._pool = ProcessPoolExecutor(max_workers=num_workers)
+        else:
+            raise ValueError(f"Unknown pool_type: {pool_type}")
+
+    # --- 向量化位姿表 ---
+    @property
+    def frame_ids(self):
+        return self.poses["frame"]
+
+    @property
+    def times(self):
+        return self.poses["time"]
+
+    @property
+    def positions_left(self):
+        return self.poses["p_l"]
+
+    @property
+    def positions_right(self):
+        return self.poses["p_r"]
+
+    @property
+    def quaternions(self):
+        return self.poses["q"]
+
+    def __len__(self):
+        return len(self.poses)
+
+    def _paths(self, idx):
+        file_name = f"{int(self.poses['frame'][idx]):04d}.png"
+        return os.path.join(self.left_dir, file_name), os.path.join(self.right_dir, file_name)
+
+    def disparity(self, idx):
+        """返回 (disp_l, disp_r, valid_l, valid_r)，视差单位为像素，无效像素为 0"""
+        if not self.has_depth:
+            raise ValueError(f"{self.output_dir} was captured without depth")
+        file_name = f"{int(self.poses['frame'][idx]):04d}.png"
+        scale = self.disparity_scale or 256.0
+        disp_l, valid_l = read_disparity_png(os.path.join(self.output_dir, "disp_left", file_name), scale)
+        disp_r, valid_r = read_disparity_png(os.path.join(self.output_dir, "disp_right", file_name), scale)
+        return disp_l, disp_r, valid_l, valid_r
+
+    def _cache_get(self, idx):
+        with self._lock:
+            if idx in self._cache:
+                self._cache.move_to_end(idx)
+                return self._cache[idx]
+        return None
+
+    def _cache_put(self, idx, images):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[idx] = images
+            self._cache.move_to_end(idx)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _submit(self, idx):
+        return self._pool.submit(_decode_pair, *self._paths(idx))
+
+    def _sample(self, idx, images):
+        row = self.poses[idx]
+        img_l, img_r = images
+        return img_l, img_r, row["p_l"], row["p_r"], row["q"], self.intrinsic_matrix, self.baseline
+
+    def __getitem__(self, idx):
+        """随机访问：返回 (img_l, img_r, pose_l, pose_r, quat, K, baseline)"""
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        images = self._cache_get(idx)
+        if images is None:
+            images = self._submit(idx).result()
+            self._cache_put(idx, images)
+        return self._sample(idx, images)
+
+    def iter_range(self, start=0, stop=None):
+        """顺序迭代，始终保持 prefetch 帧在后台解码"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        pending = deque()
+        next_idx = start
+
+        def fill():
+            nonlocal next_idx
+            while next_idx < stop and len(pending) < max(self.prefetch, 1):
+                cached = self._cache_get(next_idx)
+                pending.append((next_idx, cached if cached is not None else self._submit(next_idx)))
+                next_idx += 1
+
+        fill()
+        while pending:
+            idx, item = pending.popleft()
+            if isinstance(item, tuple):
+                images = item
+            else:
+                images = item.result()
+                self._cache_put(idx, images)
+            fill()
+            yield self._sample(idx, images)
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
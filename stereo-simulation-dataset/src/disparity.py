@@ -0,0 +1,50 @@
+import numpy as np
+
+# 深度 -> 视差真值及其紧凑存储
+#   png 后端:  16 位 PNG，定点数 round(d * scale)，0 表示无效像素（KITTI 约定，scale 默认 256）
+#   shard 后端: float16 视差 + 按位打包的有效掩码 (np.packbits，每像素 1 bit)
+
+DISPARITY_PNG_MAX = 65535
+
+
+def depth_to_disparity(depth, focal_px, baseline, out=None, valid=None):
+    """
+    d = f * B / Z（像素），f 取内参矩阵 K[0, 0]，Z 为到像平面的距离 (m)
+    Z 非有限（没有击中任何物体）或 <= 0 的像素无效，视差记 0
+    out / valid 可以传入预分配的 float32 / bool 缓冲，返回 (disparity, valid)
+    """
+    depth = np.asarray(depth)
+    if out is None:
+        out = np.empty(depth.shape, dtype=np.float32)
+    if valid is None:
+        valid = np.empty(depth.shape, dtype=bool)
+    np.isfinite(depth, out=valid)
+    np.greater(depth, 0, out=valid, where=valid)
+    out.fill(0)
+    np.divide(np.float32(focal_px * baseline), depth, out=out, where=valid)
+    return out, valid
+
+
+def encode_disparity_png16(disparity, valid, scale=256.0):
+    """定点编码为 uint16：有效像素至少为 1（与无效的 0 区分），超过 65535 / scale 像素的视差饱和"""
+    code = np.multiply(disparity, scale, dtype=np.float32)
+    np.rint(code, out=code)
+    np.clip(code, 1, DISPARITY_PNG_MAX, out=code)
+    code = code.astype(np.uint16)
+    code[~valid] = 0
+    return code
+
+
+def decode_disparity_png16(code, scale=256.0):
+    """uint16 -> (float32 视差, 有效掩码)，无效像素的视差为 0"""
+    code = np.asarray(code)
+    return code.astype(np.float32) / np.float32(scale), code > 0
+
+
+def pack_valid_mask(valid):
+    """(..., H, W) bool -> (..., H, ceil(W / 8)) uint8"""
+    return np.packbits(valid, axis=-1)
+
+
+def unpack_valid_mask(packed, width):
+    return np.unpackbits(packed, axis=-1, count=width).astype(bool)
@@ -0,0 +1,49 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class FrameRing:
+    """
+    预分配的采集缓冲环：slots 块 (N, H, W, 3) uint8，每块放一帧所有相机（双目即左右眼）的 RGB
+    采集循环 acquire() 取一块空闲缓冲，渲染结果只拷贝一次进去，再按引用交给写出端；
+    写出端编码完成后 release() 归还。所有块都在途时 acquire() 阻塞，相当于在途帧数上限
+    depth=True 时每块另有 (N, H, W) float32 的深度缓冲，通过 ring.depth[slot] 取
+    """
+
+    def __init__(self, slots, num_views, height, width, depth=False):
+        if slots < 1:
+            raise ValueError("FrameRing needs at least one slot")
+        # 一次性分配全部缓冲，采集过程中不再分配整幅图像
+        self.buffers = np.zeros((slots, num_views, height, width, 3), dtype=np.uint8)
+        self.depth = np.zeros((slots, num_views, height, width), dtype=np.float32) if depth else None
+        self._free = deque(range(slots))
+        self._cond = threading.Condition()
+        self.waits = 0   # acquire 时所有块都在途、需要等待写出端的次数
+
+    @property
+    def slots(self):
+        return len(self.buffers)
+
+    @property
+    def nbytes(self):
+        return self.buffers.nbytes + (self.depth.nbytes if self.depth is not None else 0)
+
+    def acquire(self):
+        """取一块空闲缓冲，返回块号"""
+        with self._cond:
+            if not self._free:
+                self.waits += 1
+            while not self._free:
+                self._cond.wait()
+            return self._free.popleft()
+
+    def release(self, slot):
+        """写出端用完后归还（可以在编码线程里调用）"""
+        with self._cond:
+            self._free.append(slot)
+            self._cond.notify()
+
+    def __getitem__(self, slot):
+        return self.buffers[slot]
@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import resource
+import threading
+import tracemalloc
+import functools
+from contextlib import nullcontext
+import numpy as np
+
+# 关闭时 stage() 直接返回这个共享的空上下文，循环里几乎没有额外开销
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+class StageProfiler:
+    """
+    采集循环的分阶段计时：
+      with profiler.stage("world.step"): ...
+    结束时输出每个阶段的 p50/p95/max 和整体帧率，并导出 Chrome trace (chrome://tracing / Perfetto)
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._events = []   # (name, start_ns, dur_ns, thread_id)
+        self._frames = 0
+        self._t0 = time.perf_counter_ns()
+        self._capture_start = None
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name, start_ns, dur_ns, tid=None):
+        """tid: 事件所在的线程，默认当前线程；worker 池里测得的耗时可以传入 worker 的标识"""
+        with self._lock:
+            self._events.append((name, start_ns, dur_ns, threading.get_ident() if tid is None else tid))
+
+    def start_capture(self):
+        """标记采集循环开始，帧率只按这之后的时间计算（不含场景搭建和预热）"""
+        self._capture_start = time.perf_counter_ns()
+
+    def frame_done(self):
+        self._frames += 1
+
+    def instrument(self, obj, method_names, prefix):
+        """给实例上的方法套上计时（仅在启用时替换，关闭时对象保持原样）"""
+        if not self.enabled:
+            return obj
+        for method_name in method_names:
+            method = getattr(obj, method_name)
+
+            @functools.wraps(method)
+            def timed(*args, _method=method, _name=f"{prefix}.{method_name}", **kwargs):
+                with self.stage(_name):
+                    return _method(*args, **kwargs)
+
+            setattr(obj, method_name, timed)
+        return obj
+
+    def stats(self):
+        """按阶段汇总：{name: {"count", "total_s", "p50_ms", "p95_ms", "max_ms"}}"""
+        by_stage = {}
+        for name, _, dur_ns, _ in self._events:
+            by_stage.setdefault(name, []).append(dur_ns)
+
+        result = {}
+        for name, durations in by_stage.items():
+            ms = np.array(durations, dtype=np.float64) / 1e6
+            result[name] = {
+                "count": len(ms),
+                "total_s": float(ms.sum() / 1e3),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "max_ms": float(ms.max()),
+            }
+        return result
+
+    def summary(self):
+        """打印阶段耗时表和帧率"""
+        if not self.enabled:
+            return
+        start = self._t0 if self._capture_start is None else self._capture_start
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+        stats = self.stats()
+
+        print("=" * 78)
+        print(f"{'stage':<28}{'count':>8}{'total(s)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}")
+        print("-" * 78)
+        for name, s in sorted(stats.items(), key=lambda item: -item[1]["total_s"]):
+            print(f"{name:<28}{s['count']:>8}{s['total_s']:>10.2f}{s['p50_ms']:>10.2f}"
+                  f"{s['p95_ms']:>10.2f}{s['max_ms']:>10.2f}")
+        print("-" * 78)
+        fps = self._frames / elapsed if elapsed > 0 else 0.0
+        print(f"{self._frames} frames in {elapsed:.2f}s -> {fps:.2f} FPS")
+        print("=" * 78)
+
+    def export_chrome_trace(self, path):
+        """导出 Chrome trace JSON（"X" 完整事件，时间单位为微秒）"""
+        if not self.enabled:
+            return None
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start_ns - self._t0) / 1e3,
+                "dur": dur_ns / 1e3,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start_ns, dur_ns, tid in self._events
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f">>> Chrome trace saved to: {path}")
+        return path
+
+
+def peak_rss_mb():
+    """进程至今的峰值常驻内存 (MB)，Linux 上 ru_maxrss 的单位是 KB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+class MemoryMonitor:
+    """
+    逐帧内存统计：用 tracemalloc 记录每帧相对帧开始时的分配峰值（NumPy 数组内存也计入），
+    换算成"相当于多少张整幅图像"，结束时连同峰值 RSS 一起打印
+    tracemalloc 会明显拖慢 Python 代码，只在 Config.PROFILE_MEMORY 打开时启用；关闭时所有方法都是空操作
+    """
+
+    def __init__(self, enabled=False, frame_bytes=None):
+        self.enabled = enabled
+        self.frame_bytes = frame_bytes   # 一个相机一帧 RGB 的字节数，用于换算
+        self.frame_peaks = []
+        self._base = 0
+        self._started_here = False
+
+    def start(self):
+        if not self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_here = True
+        tracemalloc.reset_peak()
+        self._base = tracemalloc.get_traced_memory()[0]
+
+    def frame_done(self):
+        if not self.enabled:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        self.frame_peaks.append(peak - self._base)
+        tracemalloc.reset_peak()
+        self._base = current
+
+    def stats(self):
+        """{"frames", "alloc_mean_mb", "alloc_max_mb", "frame_buffers_per_frame", "peak_rss_mb"}"""
+        result = {"frames": len(self.frame_peaks), "peak_rss_mb": peak_rss_mb()}
+        if self.frame_peaks:
+            peaks = np.array(self.frame_peaks, dtype=np.float64)
+            result["alloc_mean_mb"] = float(peaks.mean() / 2**20)
+            result["alloc_max_mb"] = float(peaks.max() / 2**20)
+            if self.frame_bytes:
+                result["frame_buffers_per_frame"] = float(peaks.mean() / self.frame_bytes)
+        return result
+
+    def summary(self):
+        if not self.enabled:
+            return None
+        stats = self.stats()
+        if self._started_here:
+            tracemalloc.stop()
+        print("=" * 78)
+        if stats["frames"]:
+            line = (f"Per-frame allocations: mean {stats['alloc_mean_mb']:.2f} MB, "
+                    f"max {stats['alloc_max_mb']:.2f} MB over {stats['frames']} frames")
+            if "frame_buffers_per_frame" in stats:
+                line += f" (~{stats['frame_buffers_per_frame']:.1f} full-frame buffers)"
+            print(line)
+        print(f"Peak RSS: {stats['peak_rss_mb']:.1f} MB")
+        print("=" * 78)
+        return stats
+
@@ -1,5 +1,10 @@
-import isaacsim.core.utils.prims as prim_utils
-from pxr import UsdLux, Sdf
+from common import sim_backend
+
+if sim_backend.is_fake():
+    from common.fake_sim import prim_utils, UsdLux
+else:
+    import isaacsim.core.utils.prims as prim_utils
+    from pxr import UsdLux, Sdf
 
 def setup_stereo_scene(world, config):
     """根据 Config 配置初始化场景"""
@@ -0,0 +1,277 @@
+import os
+import json
+import shutil
+import numpy as np
+
+from .data_handler import write_dataset_info
+from .disparity import depth_to_disparity, pack_valid_mask, unpack_valid_mask
+
+# 分片内每帧一行的位姿表，字段与 camera_poses.csv 一一对应
+POSE_DTYPE = np.dtype([
+    ("frame", np.int32),
+    ("time", np.float64),
+    ("p_l", np.float64, (3,)),
+    ("q", np.float64, (4,)),
+    ("p_r", np.float64, (3,)),
+])
+
+INDEX_NAME = "index.json"
+
+
+def _shard_name(shard_id):
+    return f"shard_{shard_id:05d}"
+
+
+class ShardedDatasetWriter:
+    """
+    分片二进制数据集：每个分片预分配 (frames, H, W, 3) 的 np.memmap（左右眼各一个 .npy）
+    和一张位姿表，index.json 记录每个分片实际写入的帧数，读取端可以零拷贝切片
+    depth=True 时每只眼另有 (frames, H, W) float16 视差和 (frames, H, ceil(W/8)) 按位打包的有效掩码
+    checkpoint_interval: 当前分片每写这么多帧就刷盘并更新索引；进程崩溃时最多丢失这么多帧
+                         （索引里登记的帧都已落盘，读取端照常打开），设为 0 则只在分片写满/关闭时登记
+    """
+
+    def __init__(self, output_dir, frames_per_shard=1000, depth=False, checkpoint_interval=50):
+        self.output_dir = output_dir
+        self.shard_dir = os.path.join(output_dir, "shards")
+        self.frames_per_shard = frames_per_shard
+        self.depth = depth
+        self.checkpoint_interval = checkpoint_interval
+
+        if os.path.exists(self.output_dir):
+            print(f">>> Detected existing output directory: {self.output_dir}. Cleaning up...")
+            shutil.rmtree(self.output_dir)
+        os.makedirs(self.shard_dir, exist_ok=True)
+
+        self.index = {
+            "format": "stereo-shards",
+            "version": 1,
+            "frames_per_shard": frames_per_shard,
+            "image_shape": None,
+            "depth": {"disparity": "float16", "valid_mask": "packbits"} if depth else None,
+            "num_frames": 0,
+            "metadata": {},
+            "shards": [],
+        }
+
+        # 分片后端不支持续跑，保持与 DatasetWriter 相同的接口
+        self.completed_frames = set()
+
+        self._shard_id = -1
+        self._count = 0
+        self._left = None
+        self._right = None
+        self._poses = None
+        self._disp = None    # {"left": memmap, "right": memmap}
+        self._valid = None
+        # 视差换算用的 fx / 基线，以及逐帧复用的 float32 视差和 bool 掩码缓冲
+        self._focal_px = None
+        self._baseline = None
+        self._disp_scratch = None
+        self._valid_scratch = None
+
+    def save_metadata(self, config, intrinsic_matrix, extra=None):
+        """与 DatasetWriter 相同的 dataset_info.txt，同时把内参以数值形式写入索引"""
+        write_dataset_info(self.output_dir, config, intrinsic_matrix, extra)
+        self._focal_px = float(intrinsic_matrix[0, 0])
+        self._baseline = config.BASELINE
+        self.index["metadata"] = {
+            "scene_mode": config.SCENE_MODE,
+            "orbit_mode": config.ORBIT_MODE,
+            "resolution": list(config.RESOLUTION),
+            "focal_length": config.FOCAL_LENGTH,
+            "baseline": config.BASELINE,
+            "intrinsic_matrix": np.asarray(intrinsic_matrix, dtype=float).tolist(),
+            **(extra or {}),
+        }
+        self._write_index()
+
+    def _open_shard(self, image_shape):
+        """新建一个分片，预分配整块 memmap"""
+        self._shard_id += 1
+        self._count = 0
+        name = _shard_name(self._shard_id)
+        shape = (self.frames_per_shard, *image_shape)
+
+        self._left = np.lib.format.open_memmap(
+            os.path.join(self.shard_dir, f"{name}_left.npy"), mode="w+", dtype=np.uint8, shape=shape)
+        self._right = np.lib.format.open_memmap(
+            os.path.join(self.shard_dir, f"{name}_right.npy"), mode="w+", dtype=np.uint8, shape=shape)
+        self._poses = np.zeros(self.frames_per_shard, dtype=POSE_DTYPE)
+        if self.depth:
+            height, width = image_shape[:2]
+            self._disp = {eye: np.lib.format.open_memmap(
+                os.path.join(self.shard_dir, f"{name}_disp_{eye}.npy"), mode="w+", dtype=np.float16,
+                shape=(self.frames_per_shard, height, width)) for eye in ("left", "right")}
+            self._valid = {eye: np.lib.format.open_memmap(
+                os.path.join(self.shard_dir, f"{name}_valid_{eye}.npy"), mode="w+", dtype=np.uint8,
+                shape=(self.frames_per_shard, height, (width + 7) // 8)) for eye in ("left", "right")}
+
+        self.index["shards"].append({"name": name, "count": 0, "first_frame": None})
+
+    def _checkpoint(self):
+        """把当前分片已写的帧刷盘，再在索引中登记帧数（先数据后索引，索引里的帧总是完整的）"""
+        name = _shard_name(self._shard_id)
+        self._left.flush()
+        self._right.flush()
+        if self.depth:
+            for array in (*self._disp.values(), *self._valid.values()):
+                array.flush()
+        poses_path = os.path.join(self.shard_dir, f"{name}_poses.npy")
+        with open(poses_path + ".tmp", "wb") as f:
+            np.save(f, self._poses[:self._count])
+        os.replace(poses_path + ".tmp", poses_path)
+
+        entry = self.index["shards"][-1]
+        entry["count"] = self._count
+        entry["first_frame"] = int(self._poses["frame"][0]) if self._count else None
+        self._write_index()
+
+    def _seal_shard(self):
+        """分片写满或关闭时最后登记一次"""
+        if self._left is None:
+            return
+        self._checkpoint()
+        self._left = self._right = self._poses = None
+        self._disp = self._valid = None
+
+    def _write_index(self):
+        # 先写临时文件再替换，避免中途崩溃留下半截 JSON
+        tmp_path = os.path.join(self.output_dir, INDEX_NAME + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.output_dir, INDEX_NAME))
+
+    def _write_disparity(self, eye, depth):
+        """d = f * B / Z 算进复用的 float32 缓冲，再写入 float16 memmap 和打包掩码"""
+        if self._disp_scratch is None:
+            self._disp_scratch = np.empty(depth.shape, dtype=np.float32)
+            self._valid_scratch = np.empty(depth.shape, dtype=bool)
+        disparity, valid = depth_to_disparity(depth, self._focal_px, self._baseline,
+                                              out=self._disp_scratch, valid=self._valid_scratch)
+        self._disp[eye][self._count] = disparity
+        self._valid[eye][self._count] = pack_valid_mask(valid)
+
+    def write_frame(self, frame_id, time, pos_l, pos_r, quat, img_l, img_r, depth=None):
+        """depth: depth=True 时必须提供的 (depth_l, depth_r) 到像平面的距离"""
+        if self.depth and (depth is None or self._focal_px is None):
+            raise ValueError("Depth capture needs a depth pair per frame and save_metadata() before the first frame")
+        image_shape = (img_l.shape[0], img_l.shape[1], 3)
+        if self.index["image_shape"] is None:
+            self.index["image_shape"] = list(image_shape)
+        elif tuple(self.index["image_shape"]) != image_shape:
+            raise ValueError(f"Frame {frame_id} has shape {image_shape}, expected {tuple(self.index['image_shape'])}")
+
+        if self._left is None or self._count == self.frames_per_shard:
+            self._seal_shard()
+            self._open_shard(image_shape)
+
+        # 直接写进 memmap，RGBA -> RGB 的裁剪和类型转换在赋值时一次完成
+        self._left[self._count] = img_l[:, :, :3]
+        self._right[self._count] = img_r[:, :, :3]
+        if self.depth:
+            self._write_disparity("left", depth[0])
+            self._write_disparity("right", depth[1])
+
+        row = self._poses[self._count]
+        row["frame"] = frame_id
+        row["time"] = time
+        row["p_l"] = pos_l
+        row["q"] = quat
+        row["p_r"] = pos_r
+
+        self._count += 1
+        self.index["num_frames"] += 1
+        if self.checkpoint_interval and self._count % self.checkpoint_interval == 0:
+            self._checkpoint()
+
+    def write_views(self, frame_id, time, positions, quat, views, depth=None, release=None):
+        """与 DatasetWriter.write_views 相同的接口；分片格式只存双目，图像拷进 memmap 后立即 release"""
+        try:
+            if len(views) != 2:
+                raise ValueError(f"The shard backend only stores stereo pairs, got {len(views)} views")
+            self.write_frame(frame_id, time, positions[0], positions[1], quat, views[0], views[1], depth=depth)
+        finally:
+            if release is not None:
+                release()
+
+    def close(self):
+        self._seal_shard()
+        print(f">>> Shards sealed: {len(self.index['shards'])} shard(s), {self.index['num_frames']} frames.")
+
+
+class ShardedDatasetReader:
+    """以只读 memmap 打开分片数据集，按帧号或切片取图，不拷贝像素"""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        with open(os.path.join(output_dir, INDEX_NAME), encoding="utf-8") as f:
+            self.index = json.load(f)
+
+        shard_dir = os.path.join(output_dir, "shards")
+        self.left = []
+        self.right = []
+        self.disp = {"left": [], "right": []}
+        self.valid = {"left": [], "right": []}
+        pose_tables = []
+        for entry in self.index["shards"]:
+            count = entry["count"]
+            if count == 0:
+                continue
+            name = entry["name"]
+            # 最后一个分片是预分配的，只取实际写入的前 count 帧
+            self.left.append(np.load(os.path.join(shard_dir, f"{name}_left.npy"), mmap_mode="r")[:count])
+            self.right.append(np.load(os.path.join(shard_dir, f"{name}_right.npy"), mmap_mode="r")[:count])
+            pose_tables.append(np.load(os.path.join(shard_dir, f"{name}_poses.npy")))
+            if self.has_depth:
+                for eye in ("left", "right"):
+                    self.disp[eye].append(np.load(os.path.join(shard_dir, f"{name}_disp_{eye}.npy"),
+                                                  mmap_mode="r")[:count])
+                    self.valid[eye].append(np.load(os.path.join(shard_dir, f"{name}_valid_{eye}.npy"),
+                                                   mmap_mode="r")[:count])
+
+        self.poses = np.concatenate(pose_tables) if pose_tables else np.zeros(0, dtype=POSE_DTYPE)
+        # 每个分片在全局序号中的起点
+        self._offsets = np.cumsum([0] + [len(a) for a in self.left])
+
+    @property
+    def intrinsic_matrix(self):
+        return np.array(self.index["metadata"]["intrinsic_matrix"])
+
+    @property
+    def baseline(self):
+        return self.index["metadata"]["baseline"]
+
+    @property
+    def has_depth(self):
+        return bool(self.index.get("depth"))
+
+    def __len__(self):
+        return int(self._offsets[-1])
+
+    def _locate(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        shard = int(np.searchsorted(self._offsets, idx, side="right")) - 1
+        return shard, idx - int(self._offsets[shard])
+
+    def __getitem__(self, idx):
+        """返回 (img_l, img_r, pose_row)，图像是 memmap 视图"""
+        shard, local = self._locate(idx)
+        return self.left[shard][local], self.right[shard][local], self.poses[idx]
+
+    def disparity(self, idx):
+        """返回 (disp_l, disp_r, valid_l, valid_r)：float16 视差 memmap 视图和解包后的 bool 有效掩码"""
+        if not self.has_depth:
+            raise ValueError(f"{self.output_dir} was captured without depth")
+        shard, local = self._locate(idx)
+        width = self.index["image_shape"][1]
+        return (self.disp["left"][shard][local], self.disp["right"][shard][local],
+                unpack_valid_mask(self.valid["left"][shard][local], width),
+                unpack_valid_mask(self.valid["right"][shard][local], width))
+
+    def shard_slice(self, shard, start=None, stop=None):
+        """取某个分片内连续的一段帧，返回左右眼 memmap 视图"""
+        return self.left[shard][start:stop], self.right[shard][start:stop]
@@ -0,0 +1,124 @@
+import os
+import csv
+import shutil
+import subprocess
+
+from .data_handler import CSV_HEADER
+
+# 每一帧的位姿只由 frame_idx 决定，所以整段采集可以按帧区间切开并行渲染，最后再合并
+
+
+def split_frames(num_frames, num_shards):
+    """把 range(num_frames) 切成 num_shards 段连续区间 [(start, stop), ...]，长度最多相差 1"""
+    num_shards = max(1, min(num_shards, num_frames))
+    bounds = [num_frames * k // num_shards for k in range(num_shards + 1)]
+    return [(bounds[k], bounds[k + 1]) for k in range(num_shards)]
+
+
+def shard_dir_name(output_dir, shard_id):
+    return os.path.join(output_dir, "_shards", f"shard_{shard_id:03d}")
+
+
+def run_shards(worker_cmd, num_frames, num_shards, output_dir, max_parallel=None):
+    """
+    启动 worker 进程并等待全部结束
+    worker_cmd(start, stop, shard_dir) -> argv 列表；每个 worker 拥有自己的 SimulationApp/World/StereoRig
+    max_parallel: 同时运行的 worker 数（受显存限制），默认全部并行
+    返回 [(start, stop, shard_dir), ...]
+    """
+    ranges = split_frames(num_frames, num_shards)
+    shards = [(start, stop, shard_dir_name(output_dir, k)) for k, (start, stop) in enumerate(ranges)]
+    max_parallel = max_parallel or len(shards)
+
+    queue = list(shards)
+    running = []
+    failed = []
+    while queue or running:
+        while queue and len(running) < max_parallel:
+            start, stop, shard_dir = queue.pop(0)
+            print(f">>> Launching worker for frames [{start}, {stop}) -> {shard_dir}")
+            proc = subprocess.Popen(worker_cmd(start, stop, shard_dir))
+            running.append((proc, (start, stop, shard_dir)))
+
+        # 等最早启动的 worker 结束，再补位
+        proc, shard = running.pop(0)
+        if proc.wait() != 0:
+            failed.append((shard, proc.returncode))
+
+    if failed:
+        details = ", ".join(f"[{s[0]}, {s[1]}) exit={code}" for s, code in failed)
+        raise RuntimeError(f"{len(failed)} capture worker(s) failed: {details}")
+    return shards
+
+
+def merge_shards(shard_dirs, output_dir, keep_shards=False, view_names=("left", "right"), num_frames=None):
+    """
+    把各 worker 的输出合并成一个数据集：
+    PNG 直接移动（文件名就是全局帧号），camera_poses.csv 和 manifest.txt 按帧号排序合并，
+    dataset_info.txt / trajectory.npy 各 worker 相同，取第一个分片的
+    view_names: 每个相机的图像子目录（相机阵列为 cam_00, cam_01, ...）
+    num_frames: 给定时检查位姿表和 manifest 的帧号恰好是 range(num_frames)，缺帧或重复时保留分片目录并抛出 RuntimeError
+    """
+    for eye_dir in view_names:
+        os.makedirs(os.path.join(output_dir, eye_dir), exist_ok=True)
+
+    header = None
+    rows = []
+    manifest_lines = []
+    for shard_dir in shard_dirs:
+        for eye_dir in view_names:
+            src_dir = os.path.join(shard_dir, eye_dir)
+            if not os.path.isdir(src_dir):
+                continue
+            for name in os.listdir(src_dir):
+                if name.endswith(".png"):
+                    shutil.move(os.path.join(src_dir, name), os.path.join(output_dir, eye_dir, name))
+
+        csv_path = os.path.join(shard_dir, "camera_poses.csv")
+        if os.path.exists(csv_path):
+            with open(csv_path, newline='') as f:
+                reader = csv.reader(f)
+                # 表头随相机数量变化，沿用分片里的
+                header = next(reader, None) or header
+                rows.extend(row for row in reader if row)
+
+        manifest_path = os.path.join(shard_dir, "manifest.txt")
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest_lines.extend(line for line in f if line.endswith("\n"))
+
+    rows.sort(key=lambda row: int(row[0]))
+    manifest_lines.sort(key=lambda line: int(line.split()[0]))
+    if num_frames is not None:
+        expected = list(range(num_frames))
+        for name, frame_ids in (("camera_poses.csv", [int(row[0]) for row in rows]),
+                                ("manifest.txt", [int(line.split()[0]) for line in manifest_lines])):
+            if frame_ids != expected:
+                missing = sorted(set(expected) - set(frame_ids))
+                raise RuntimeError(f"Merged {name} has {len(frame_ids)} frame(s), expected {num_frames}; "
+                                   f"missing {missing[:10]}{' ...' if len(missing) > 10 else ''}")
+
+    with open(os.path.join(output_dir, "camera_poses.csv"), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header or CSV_HEADER)
+        writer.writerows(rows)
+
+    with open(os.path.join(output_dir, "manifest.txt"), 'w') as f:
+        f.writelines(manifest_lines)
+
+    for name in ("dataset_info.txt", "trajectory.npy"):
+        for shard_dir in shard_dirs:
+            path = os.path.join(shard_dir, name)
+            if os.path.exists(path):
+                shutil.copy2(path, os.path.join(output_dir, name))
+                break
+
+    if not keep_shards:
+        for shard_dir in shard_dirs:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+        shards_root = os.path.join(output_dir, "_shards")
+        if os.path.isdir(shards_root) and not os.listdir(shards_root):
+            os.rmdir(shards_root)
+
+    print(f">>> Merged {len(shard_dirs)} shard(s), {len(rows)} frames -> {output_dir}")
+    return len(rows)
@@ -0,0 +1,152 @@
+import os
+import numpy as np
+
+# 所有生成函数都一次性返回 (num_frames, 3) 的相机中心轨迹，主循环只做索引
+
+
+def circle_path(num_frames, radius, height):
+    """圆形轨道：与旧版逐帧计算一致，角度为 frame/total * 360°（不含终点）"""
+    angle = np.radians(np.arange(num_frames) / num_frames * 360.0)
+    path = np.empty((num_frames, 3))
+    path[:, 0] = radius * np.cos(angle)
+    path[:, 1] = radius * np.sin(angle)
+    path[:, 2] = height
+    return path
+
+
+def linear_path(num_frames, point_a, point_b):
+    """直线轨道：第 0 帧在 A，最后一帧刚好落在 B"""
+    point_a = np.asarray(point_a, dtype=float)
+    point_b = np.asarray(point_b, dtype=float)
+    if num_frames == 1:
+        return point_a[None, :].copy()
+    progress = np.arange(num_frames) / (num_frames - 1)
+    return point_a + (point_b - point_a) * progress[:, None]
+
+
+def helix_path(num_frames, radius, z_start, z_end, turns):
+    """螺旋轨道：绕 Z 轴转 turns 圈，同时高度从 z_start 线性变化到 z_end"""
+    if num_frames == 1:
+        progress = np.zeros(1)
+    else:
+        progress = np.arange(num_frames) / (num_frames - 1)
+    angle = 2.0 * np.pi * turns * progress
+    path = np.empty((num_frames, 3))
+    path[:, 0] = radius * np.cos(angle)
+    path[:, 1] = radius * np.sin(angle)
+    path[:, 2] = z_start + (z_end - z_start) * progress
+    return path
+
+
+def polyline_path(num_frames, waypoints):
+    """多航点折线：按累计弦长均匀分布，首尾帧落在第一个和最后一个航点上"""
+    waypoints = np.asarray(waypoints, dtype=float)
+    if len(waypoints) < 2:
+        raise ValueError("polyline needs at least 2 waypoints")
+    seg_len = np.linalg.norm(np.diff(waypoints, axis=0), axis=1)
+    cum_len = np.concatenate([[0.0], np.cumsum(seg_len)])
+    s = np.linspace(0.0, cum_len[-1], num_frames)
+    return np.stack([np.interp(s, cum_len, waypoints[:, k]) for k in range(3)], axis=1)
+
+
+def catmull_rom_path(num_frames, waypoints, closed=False):
+    """Uniform Catmull-Rom 样条：曲线经过每个航点，整条轨迹一次矩阵运算得到"""
+    waypoints = np.asarray(waypoints, dtype=float)
+    if len(waypoints) < 2:
+        raise ValueError("spline needs at least 2 waypoints")
+
+    # 补齐首尾控制点：闭合曲线循环取点，开放曲线复制端点
+    if closed:
+        ctrl = np.concatenate([waypoints[-1:], waypoints, waypoints[:2]])
+        num_seg = len(waypoints)
+        u = np.arange(num_frames) / num_frames * num_seg
+    else:
+        ctrl = np.concatenate([waypoints[:1], waypoints, waypoints[-1:]])
+        num_seg = len(waypoints) - 1
+        u = np.linspace(0.0, num_seg, num_frames)
+
+    seg = np.minimum(np.floor(u).astype(int), num_seg - 1)
+    t = (u - seg)[:, None]
+    p0, p1, p2, p3 = ctrl[seg], ctrl[seg + 1], ctrl[seg + 2], ctrl[seg + 3]
+
+    t2 = t * t
+    t3 = t2 * t
+    return 0.5 * (
+        2.0 * p1
+        + (p2 - p0) * t
+        + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * t2
+        + (3.0 * p1 - p0 - 3.0 * p2 + p3) * t3
+    )
+
+
+def sphere_path(num_frames, radius, center, min_elevation_deg=0.0):
+    """
+    球面均匀采样（Fibonacci 点阵）：z 在球冠上均匀分布 + 黄金角方位，
+    得到等面积分布的视点。min_elevation_deg 限制最低仰角，避免相机钻到地面以下
+    """
+    center = np.asarray(center, dtype=float)
+    i = np.arange(num_frames) + 0.5
+    z_min = np.sin(np.radians(min_elevation_deg))
+    z = z_min + (1.0 - z_min) * i / num_frames
+    r_xy = np.sqrt(np.clip(1.0 - z * z, 0.0, None))
+    golden_angle = np.pi * (3.0 - np.sqrt(5.0))
+    phi = golden_angle * i
+    unit = np.stack([r_xy * np.cos(phi), r_xy * np.sin(phi), z], axis=1)
+    return center + radius * unit
+
+
+def resample_by_arc_length(path, num_frames, closed=False):
+    """
+    弧长重参数化：沿一条（通常是加密过的）折线重新采样，使相邻帧间距相等。
+    closed=True 时最后一帧回到起点前一个步长处，与圆形轨道的"不含终点"约定一致
+    """
+    path = np.asarray(path, dtype=float)
+    if closed:
+        path = np.concatenate([path, path[:1]])
+    seg_len = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    cum_len = np.concatenate([[0.0], np.cumsum(seg_len)])
+    if closed:
+        s = np.arange(num_frames) / num_frames * cum_len[-1]
+    else:
+        s = np.linspace(0.0, cum_len[-1], num_frames)
+    return np.stack([np.interp(s, cum_len, path[:, k]) for k in range(3)], axis=1)
+
+
+def _generate(mode, num_frames, config):
+    if mode == "circle":
+        return circle_path(num_frames, config.RADIUS, config.HEIGHT)
+    elif mode == "linear":
+        return linear_path(num_frames, config.POINTA, config.POINTB)
+    elif mode == "helix":
+        return helix_path(num_frames, config.RADIUS, config.HEIGHT, config.HELIX_END_HEIGHT, config.HELIX_TURNS)
+    elif mode == "polyline":
+        return polyline_path(num_frames, config.WAYPOINTS)
+    elif mode == "spline":
+        return catmull_rom_path(num_frames, config.WAYPOINTS, closed=config.SPLINE_CLOSED)
+    elif mode == "sphere":
+        return sphere_path(num_frames, config.RADIUS, config.TARGET_POINT, config.SPHERE_MIN_ELEVATION)
+    else:
+        raise ValueError(f"Unknown ORBIT_MODE: {mode}")
+
+
+def build_trajectory(config):
+    """根据 Config 一次性生成整条 (NUM_FRAMES, 3) 轨迹"""
+    mode = config.ORBIT_MODE
+    num_frames = config.NUM_FRAMES
+
+    # 球面采样是离散视点集合，没有"沿路径"的概念，不做弧长重参数化
+    if not config.ARC_LENGTH_UNIFORM or mode == "sphere":
+        return _generate(mode, num_frames, config)
+
+    # 先加密采样近似曲线，再按弧长等距取回 num_frames 个点
+    dense = _generate(mode, num_frames * config.ARC_LENGTH_OVERSAMPLE, config)
+    closed = mode == "circle" or (mode == "spline" and config.SPLINE_CLOSED)
+    return resample_by_arc_length(dense, num_frames, closed=closed)
+
+
+def save_trajectory(path, output_dir):
+    """把轨迹保存到数据集目录，便于复现同一次采集"""
+    traj_path = os.path.join(output_dir, "trajectory.npy")
+    np.save(traj_path, path)
+    print(f">>> Trajectory ({len(path)} poses) saved to: {traj_path}")
+    return traj_path
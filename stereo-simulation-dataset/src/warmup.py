@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class RendererWarmup:
+    """
+    自适应预热：每步之后抓一帧，直到连续 patience 帧都满足
+      1. 与上一帧的平均绝对差 (MAD) < diff_threshold（画面不再变化）
+      2. 非黑像素比例 >= min_valid_ratio（光照和纹理已加载）
+    才认为渲染器稳定；max_steps 是硬上限
+    """
+
+    def __init__(self, max_steps=300, min_steps=5, diff_threshold=0.5, min_valid_ratio=0.05,
+                 black_level=5, patience=3):
+        self.max_steps = max_steps
+        self.min_steps = min_steps
+        self.diff_threshold = diff_threshold
+        self.min_valid_ratio = min_valid_ratio
+        self.black_level = black_level
+        self.patience = patience
+
+        self.steps = 0
+        self.converged = False
+        self.last_mad = None
+        self.last_valid_ratio = None
+        self._prev = None
+        self._stable = 0
+
+    def update(self, *images):
+        """喂入一步之后各相机的图像（双目即左右两张），返回是否已收敛"""
+        self.steps += 1
+        if not images or any(img is None or img.size == 0 for img in images):
+            # 渲染器还没有输出
+            self._prev = None
+            self._stable = 0
+            return False
+
+        frame = np.stack([img[:, :, :3] for img in images]).astype(np.float32)
+        self.last_valid_ratio = float(np.mean(frame.max(axis=-1) > self.black_level))
+
+        if self._prev is None or self._prev.shape != frame.shape:
+            self.last_mad = None
+            self._stable = 0
+        else:
+            self.last_mad = float(np.mean(np.abs(frame - self._prev)))
+            if self.last_mad < self.diff_threshold and self.last_valid_ratio >= self.min_valid_ratio:
+                self._stable += 1
+            else:
+                self._stable = 0
+        self._prev = frame
+
+        self.converged = self.steps >= self.min_steps and self._stable >= self.patience
+        return self.converged
+
+    def run(self, world, rig):
+        """执行预热循环，返回实际使用的步数"""
+        while self.steps < self.max_steps:
+            world.step(render=True)
+            views = rig.capture()
+            if self.update(*(views if views is not None else ())):
+                break
+
+        if self.converged:
+            print(f">>> Renderer warmed up after {self.steps} steps (MAD={self.last_mad:.3f}, "
+                  f"non-black={self.last_valid_ratio:.1%})")
+        else:
+            print(f">>> Warm-up hit the {self.max_steps}-step cap without converging "
+                  f"(MAD={self.last_mad}, non-black={self.last_valid_ratio})")
+        return self.steps
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            max_steps=config.WARMUP_MAX_STEPS,
+            min_steps=config.WARMUP_MIN_STEPS,
+            diff_threshold=config.WARMUP_DIFF_THRESHOLD,
+            min_valid_ratio=config.WARMUP_MIN_VALID_RATIO,
+            patience=config.WARMUP_PATIENCE,
+        )
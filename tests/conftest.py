@@ -0,0 +1,14 @@
+# 单元测试不需要 Isaac Sim：仿真相关的测试都跑在 CPU 替身后端 (common/fake_sim.py) 上
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STEREO_DIR = os.path.join(REPO_ROOT, "stereo-simulation-dataset")
+SENSOR_DIR = os.path.join(REPO_ROOT, "SpringForceSensor")
+
+for path in (REPO_ROOT, STEREO_DIR, SENSOR_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
+
+# 仿真相关模块在导入时按后端选择实现，整个测试会话固定使用替身后端
+os.environ["SIM_BACKEND"] = "fake"
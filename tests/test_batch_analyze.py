@@ -0,0 +1,45 @@
+# batch_analyze.analyze_directory：单个坏文件不影响整批分析，失败结果也进入索引缓存
+import json
+import os
+
+import numpy as np
+
+from batch_analyze import analyze_directory, INDEX_NAME, SUMMARY_NAME
+
+
+def _write_press(path, k=1000.0):
+    """一次加载-卸载的压入记录：接触后 f_z = -k * 压入深度"""
+    t = np.linspace(0.0, 2.0, 201)
+    base_z = 1.0 - 0.02 * np.sin(np.pi * t / 2.0) ** 2 * 2.0
+    depth = np.clip((1.0 - base_z) - 0.01, 0.0, None)
+    fz = -k * depth
+    with open(path, "w") as f:
+        f.write("time,f_x,f_y,f_z,base_z\n")
+        for row in zip(t, np.zeros_like(t), np.zeros_like(t), fz, base_z):
+            f.write(",".join(repr(float(v)) for v in row) + "\n")
+
+
+def test_bad_file_is_recorded_and_others_finish(tmp_path, capsys):
+    data_dir = str(tmp_path)
+    _write_press(os.path.join(data_dir, "20240101_000000.csv"), k=1000.0)
+    _write_press(os.path.join(data_dir, "20240101_000100.csv"), k=2000.0)
+    with open(os.path.join(data_dir, "20240101_000200.csv"), "w") as f:
+        f.write("time,f_x,f_y,base_z\n0.0,0,0,1.0\n")
+
+    results = analyze_directory(data_dir, num_workers=2)
+    assert results["20240101_000200.csv"] is None
+    np.testing.assert_allclose(results["20240101_000000.csv"]["stiffness"], 1000.0, rtol=1e-6)
+    np.testing.assert_allclose(results["20240101_000100.csv"]["stiffness"], 2000.0, rtol=1e-6)
+
+    with open(os.path.join(data_dir, INDEX_NAME)) as f:
+        index = json.load(f)
+    assert "KeyError" in index["20240101_000200.csv"]["error"]
+    assert "error" not in index["20240101_000000.csv"]
+    with open(os.path.join(data_dir, SUMMARY_NAME)) as f:
+        rows = f.read().splitlines()
+    assert [row.split(",")[0] for row in rows[1:]] == ["20240101_000000.csv", "20240101_000100.csv"]
+    assert "2 个成功，1 个失败" in capsys.readouterr().out
+
+    # 第二次运行全部命中缓存（包括失败的文件），不会重新分析
+    analyze_directory(data_dir, num_workers=2)
+    assert "待分析 0 个" in capsys.readouterr().out
@@ -0,0 +1,67 @@
+# solve_stereo_poses / _extract_rotation_quat（纯 NumPy）与 StereoRig._get_rig_orientation（Gf 参考实现）逐帧对比
+import numpy as np
+import pytest
+
+from src import camera_rig
+from src.camera_rig import solve_stereo_poses, solve_array_poses, array_offsets
+
+Gf = pytest.importorskip("pxr.Gf")
+
+
+@pytest.fixture
+def gf_orientation(monkeypatch):
+    """没有 Isaac Sim 时模块里的 Gf 为 None，这里换成 pxr 的 Gf 调用参考实现（它不使用 self）"""
+    monkeypatch.setattr(camera_rig, "Gf", Gf)
+    return lambda eye, target: camera_rig.StereoRig._get_rig_orientation(None, eye, target)
+
+
+def test_matches_gf_on_random_poses(gf_orientation):
+    rng = np.random.default_rng(0)
+    n = 25000
+    centers = rng.uniform(-2.0, 2.0, (n, 3))
+    targets = rng.uniform(-0.5, 0.5, (n, 3))
+    _, _, quat = solve_stereo_poses(centers, targets, 0.032)
+
+    expected = np.array([gf_orientation(c, t) for c, t in zip(centers, targets)])
+    np.testing.assert_allclose(quat, expected, rtol=0, atol=1e-12)
+
+
+def test_matches_gf_on_axis_aligned_views(gf_orientation):
+    """视线沿坐标轴时旋转矩阵的对角元会出现平局，覆盖 _extract_rotation_quat 的各个分支"""
+    centers = np.array([[1.0, 0, 0], [-1.0, 0, 0], [0, 1.0, 0], [0, -1.0, 0], [1.0, 1.0, 0], [0.4, 0.4, 0.4]])
+    _, _, quat = solve_stereo_poses(centers, np.zeros(3), 0.032)
+    expected = np.array([gf_orientation(c, np.zeros(3)) for c in centers])
+    np.testing.assert_allclose(quat, expected, rtol=0, atol=1e-12)
+
+
+def _rotate(quat, axis):
+    w, x, y, z = quat
+    return np.array(Gf.Rotation(Gf.Quatd(w, Gf.Vec3d(x, y, z))).TransformDir(Gf.Vec3d(*axis)))
+
+
+@pytest.mark.parametrize("center", [[0.0, 0.0, 1.0], [0.0, 0.0, -1.0]])
+def test_view_parallel_to_up_is_documented_fallback(gf_orientation, center):
+    """
+    视线与 Up 轴平行（正上方俯视 / 正下方仰视）时 view x up = 0，Gf::GetNormalized 除以 eps 得到零向量，
+    SetLookAt 的基退化，Gf 参考实现返回的不是单位四元数（分量可达 1e26）。
+    NumPy 实现在这里有意偏离 Gf：右方向取 +Y（与侧向向量的回退方向相同），结果是合法旋转，
+    相机 +X 指向目标，左右眼沿 +Y / -Y 排开
+    """
+    center = np.array([center])
+    pos_l, pos_r, quat = solve_stereo_poses(center, np.zeros(3), 0.032)
+    assert abs(np.linalg.norm(gf_orientation(center[0], np.zeros(3))) - 1.0) > 1e-3
+
+    np.testing.assert_allclose(np.linalg.norm(quat[0]), 1.0, atol=1e-12)
+    np.testing.assert_allclose(_rotate(quat[0], [1, 0, 0]), -center[0], atol=1e-12)
+    np.testing.assert_allclose(_rotate(quat[0], [0, -1, 0]), [0.0, 1.0, 0.0], atol=1e-12)
+    np.testing.assert_allclose(pos_l[0] - pos_r[0], [0.0, 0.032, 0.0])
+
+
+def test_stereo_layout_equals_stereo_solver():
+    rng = np.random.default_rng(1)
+    centers = rng.uniform(-1.0, 1.0, (100, 3))
+    pos_l, pos_r, quat = solve_stereo_poses(centers, np.zeros(3), 0.032)
+    positions, array_quat = solve_array_poses(centers, np.zeros(3), array_offsets("stereo", baseline=0.032))
+    np.testing.assert_array_equal(positions[:, 0], pos_l)
+    np.testing.assert_array_equal(positions[:, 1], pos_r)
+    np.testing.assert_array_equal(array_quat, quat)
@@ -0,0 +1,47 @@
+# run_capture 在替身后端上的完整流程：渲染器没有输出的帧被跳过，不计入写出帧数
+import os
+
+import pytest
+
+from common import sim_backend
+from src import capture
+from src.config import Config
+
+
+@pytest.fixture
+def small_config(tmp_path, monkeypatch):
+    for name, value in {"OUTPUT_DIR": str(tmp_path / "dataset"), "RESOLUTION": (32, 24), "NUM_FRAMES": 5,
+                        "HEADLESS": True, "RESUME": False, "PROFILE": False}.items():
+        monkeypatch.setattr(Config, name, value)
+    return Config
+
+
+def test_dropped_frames_are_not_counted(small_config, monkeypatch):
+    def create_rig(config):
+        rig = capture_create_rig(config)
+        capture_frame = rig.capture
+        calls = []
+
+        def flaky_capture(out=None):
+            # 预热之后的第 2 帧模拟渲染器还没有输出
+            calls.append(out is not None)
+            if sum(calls) == 2:
+                return None
+            return capture_frame(out=out)
+
+        rig.capture = flaky_capture
+        return rig
+
+    capture_create_rig = capture.create_rig
+    monkeypatch.setattr(capture, "create_rig", create_rig)
+
+    app = sim_backend.create_app({"headless": True})
+    world = sim_backend.new_world(stage_units_in_meters=1.0)
+    result = capture.run_capture(world, app, small_config)
+    assert result["error"] is None
+    assert result["frames"] == 4
+    assert result["dropped"] == 1
+    assert sorted(os.listdir(os.path.join(small_config.OUTPUT_DIR, "left"))) == [
+        "0000.png", "0002.png", "0003.png", "0004.png"]
+    with open(os.path.join(small_config.OUTPUT_DIR, "manifest.txt")) as f:
+        assert len(f.read().splitlines()) == 4
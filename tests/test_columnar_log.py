@@ -0,0 +1,33 @@
+# ColumnarLog 的 CSV 文本格式：默认浮点列写最短往返表示，与 csv.writer 的输出一致
+import csv
+import io
+
+import numpy as np
+
+from common.columnar_log import ColumnarLog, load_log
+
+
+def test_default_float_format_is_shortest_repr(tmp_path):
+    path = str(tmp_path / "log.csv")
+    rows = [[0, 0.0, 0.48868629150101522, "peak"], [1, 1 / 60, -1e-300, "contact_on"], [2, 0.5, np.nan, "x"]]
+    fields = [("frame", np.int32), ("time", np.float64, "%.4f"), ("value", np.float64), ("event", "U16", "%s")]
+    with ColumnarLog(path, fields, chunk_rows=2) as log:
+        for row in rows:
+            log.append(row)
+
+    expected = io.StringIO()
+    writer = csv.writer(expected, lineterminator="\n")
+    writer.writerow([name for name, *_ in fields])
+    for frame, time, value, event in rows:
+        writer.writerow([frame, f"{time:.4f}", value, event])
+    with open(path) as f:
+        assert f.read() == expected.getvalue()
+
+
+def test_csv_round_trips_float64_exactly(tmp_path):
+    path = str(tmp_path / "log.csv")
+    values = np.random.default_rng(0).normal(size=500) * 10.0 ** np.arange(-250, 250)
+    with ColumnarLog(path, [("v", np.float64)], chunk_rows=64) as log:
+        for v in values:
+            log.append([v])
+    np.testing.assert_array_equal(load_log(path)["v"], values)
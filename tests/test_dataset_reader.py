@@ -0,0 +1,116 @@
+# StereoDatasetReader：读回 DatasetWriter 写出的数据集（内参与基线、位姿、图像），LRU 淘汰和预取顺序
+import numpy as np
+import pytest
+
+from src.config import Config
+from src.data_handler import DatasetWriter
+from src.dataset_reader import StereoDatasetReader, parse_dataset_info
+
+NUM_FRAMES = 6
+K = np.array([[412.5, 0.0, 31.75], [0.0, 411.25, 23.5], [0.0, 0.0, 1.0]])
+
+
+def _views(i):
+    return np.random.default_rng(i).integers(0, 256, (2, 24, 32, 4), dtype=np.uint8)
+
+
+def _pose(i):
+    pos_l = np.array([0.1 * i, -0.2, 1.0 + 0.01 * i])
+    return pos_l, pos_l + [0.12, 0.0, 0.0], np.array([np.cos(0.1 * i), 0.0, 0.0, np.sin(0.1 * i)])
+
+
+@pytest.fixture(params=["csv", "npz"])
+def dataset(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "RESOLUTION", (32, 24))
+    monkeypatch.setattr(Config, "BASELINE", 0.12)
+    output_dir = str(tmp_path / "dataset")
+    writer = DatasetWriter(output_dir, pose_format=request.param)
+    writer.save_metadata(Config, K, extra={"Warmup Steps": 17})
+    # 乱序写入：读回的位姿表按写入顺序排列，文件名由帧号决定
+    order = [0, 2, 1, 3, 5, 4]
+    for i in order:
+        pos_l, pos_r, quat = _pose(i)
+        writer.write_views(i, i / 30.0, (pos_l, pos_r), quat, _views(i))
+    writer.close()
+    return output_dir, order
+
+
+class _CountingReader(StereoDatasetReader):
+    """记录每次提交给解码池的帧下标"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = []
+
+    def _submit(self, idx):
+        self.submitted.append(idx)
+        return super()._submit(idx)
+
+
+def test_round_trip(dataset):
+    output_dir, order = dataset
+    info = parse_dataset_info(f"{output_dir}/dataset_info.txt")
+    assert info["resolution"] == (32, 24)
+    np.testing.assert_array_equal(info["intrinsic_matrix"], K)
+
+    with StereoDatasetReader(output_dir) as reader:
+        np.testing.assert_array_equal(reader.intrinsic_matrix, K)
+        assert reader.baseline == 0.12 and reader.resolution == (32, 24) and not reader.has_depth
+        assert len(reader) == NUM_FRAMES
+        assert reader.frame_ids.tolist() == order
+        for idx, i in enumerate(order):
+            img_l, img_r, pose_l, pose_r, quat, k, baseline = reader[idx]
+            views = _views(i)
+            np.testing.assert_array_equal(img_l, views[0, :, :, :3])
+            np.testing.assert_array_equal(img_r, views[1, :, :, :3])
+            pos_l, pos_r, q = _pose(i)
+            np.testing.assert_allclose(pose_l, pos_l, rtol=0, atol=1e-12)
+            np.testing.assert_allclose(pose_r, pos_r, rtol=0, atol=1e-12)
+            np.testing.assert_allclose(quat, q, rtol=0, atol=1e-12)
+            assert reader.times[idx] == pytest.approx(i / 30.0, abs=5e-5)
+            assert baseline == 0.12 and k is reader.intrinsic_matrix
+        # 负下标从末尾数，越界抛 IndexError
+        np.testing.assert_array_equal(reader[-1][0], _views(order[-1])[0, :, :, :3])
+        with pytest.raises(IndexError):
+            reader[NUM_FRAMES]
+        # 顺序迭代与随机访问结果相同
+        for idx, sample in enumerate(reader):
+            np.testing.assert_array_equal(sample[1], reader[idx][1])
+
+
+def test_lru_eviction(dataset):
+    output_dir, _ = dataset
+    with _CountingReader(output_dir, cache_size=2) as reader:
+        for idx in (0, 1, 0, 2):
+            reader[idx]
+        # 0 刚被访问过，容量满时淘汰最久未用的 1
+        assert list(reader._cache) == [0, 2]
+        assert reader.submitted == [0, 1, 2]
+        reader[1]
+        assert list(reader._cache) == [2, 1]
+        assert reader.submitted == [0, 1, 2, 1]
+
+    with _CountingReader(output_dir, cache_size=0) as reader:
+        reader[0]
+        reader[0]
+        assert not reader._cache and reader.submitted == [0, 0]
+
+
+def test_prefetch_order(dataset):
+    output_dir, _ = dataset
+    with _CountingReader(output_dir, prefetch=3, cache_size=NUM_FRAMES) as reader:
+        reader[2]
+        it = reader.iter_range(1, 5)
+        # 拿到第一帧之前已经按顺序提交了 prefetch 帧，已缓存的 2 不再解码
+        first = next(it)
+        assert reader.submitted == [2, 1, 3, 4]
+        np.testing.assert_array_equal(first[0], reader[1][0])
+        assert [len(sample) for sample in it] == [7] * 3
+        assert reader.submitted == [2, 1, 3, 4]
+        assert list(reader._cache) == [2, 1, 3, 4]
+
+        # 不超过 stop，也不超过数据集长度
+        reader.submitted.clear()
+        reader._cache.clear()
+        assert len(list(reader.iter_range(3, 100))) == NUM_FRAMES - 3
+        assert reader.submitted == [3, 4, 5]
@@ -0,0 +1,119 @@
+# 深度 -> 视差真值：定点编码往返误差、无效像素、掩码打包，以及 png / shard 两种后端写出的视差
+import os
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from common import sim_backend
+from src import capture
+from src.config import Config
+from src.data_handler import DatasetWriter
+from src.disparity import (depth_to_disparity, encode_disparity_png16, decode_disparity_png16, pack_valid_mask,
+                           unpack_valid_mask)
+from src.shard_store import ShardedDatasetReader
+
+SCALE = 256.0
+
+
+def test_png16_round_trip_within_half_step():
+    disparity = np.random.default_rng(0).uniform(0.01, 200.0, (64, 48)).astype(np.float32)
+    valid = np.ones(disparity.shape, dtype=bool)
+    decoded, decoded_valid = decode_disparity_png16(encode_disparity_png16(disparity, valid, SCALE), SCALE)
+    assert decoded_valid.all()
+    assert np.abs(decoded - disparity).max() <= 0.5 / SCALE + 1e-4
+
+
+def test_invalid_depth():
+    depth = np.array([[0.0, -1.0, np.inf, np.nan, 2.0, 1e-9]], dtype=np.float32)
+    disparity, valid = depth_to_disparity(depth, focal_px=400.0, baseline=0.05)
+    assert valid.tolist() == [[False, False, False, False, True, True]]
+    assert disparity[0, :4].tolist() == [0.0] * 4
+    assert disparity[0, 4] == pytest.approx(10.0)
+
+    code = encode_disparity_png16(disparity, valid, SCALE)
+    # 无效像素为 0；极近的点饱和到 65535，极远的有效点至少为 1
+    assert code.tolist() == [[0, 0, 0, 0, 2560, 65535]]
+    far = encode_disparity_png16(np.array([1e-6], dtype=np.float32), np.array([True]), SCALE)
+    assert far.tolist() == [1]
+
+
+@pytest.mark.parametrize("shape", [(5, 8), (3, 13), (2, 4, 17)])
+def test_valid_mask_packing(shape):
+    valid = np.random.default_rng(1).random(shape) < 0.5
+    packed = pack_valid_mask(valid)
+    assert packed.shape == (*shape[:-1], (shape[-1] + 7) // 8)
+    np.testing.assert_array_equal(unpack_valid_mask(packed, shape[-1]), valid)
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+def test_png_writer_disparity_files_in_manifest(tmp_path, async_mode):
+    output_dir = str(tmp_path / "dataset")
+    writer = DatasetWriter(output_dir, async_mode=async_mode, depth=True, disparity_scale=SCALE)
+    intrinsic = np.array([[40.0, 0.0, 8.0], [0.0, 40.0, 6.0], [0.0, 0.0, 1.0]])
+    writer.save_metadata(Config, intrinsic)
+    rng = np.random.default_rng(2)
+    depths = {}
+    for i in range(3):
+        views = rng.integers(0, 256, (2, 12, 16, 4), dtype=np.uint8)
+        depth = rng.uniform(0.2, 3.0, (2, 12, 16)).astype(np.float32)
+        depth[:, 0, :4] = np.inf
+        depths[i] = depth
+        writer.write_views(i, i / 60.0, np.zeros((2, 3)), np.array([1.0, 0.0, 0.0, 0.0]), views, depth=depth)
+    writer.close()
+
+    with open(os.path.join(output_dir, "manifest.txt")) as f:
+        manifest = [line.split() for line in f]
+    assert [int(parts[0]) for parts in manifest] == [0, 1, 2]
+    for parts in manifest:
+        frame_id = int(parts[0])
+        paths = [os.path.join(output_dir, name, f"{frame_id:04d}.png")
+                 for name in ("left", "right", "disp_left", "disp_right")]
+        for path, crc in zip(paths, parts[1:]):
+            with open(path, "rb") as f:
+                assert zlib.crc32(f.read()) == int(crc)
+        for eye, path in enumerate(paths[2:]):
+            code = np.array(Image.open(path))
+            assert code.dtype == np.uint16
+            decoded, valid = decode_disparity_png16(code, SCALE)
+            expected, expected_valid = depth_to_disparity(depths[frame_id][eye], 40.0, Config.BASELINE)
+            np.testing.assert_array_equal(valid, expected_valid)
+            assert np.abs(decoded - expected).max() <= 0.5 / SCALE + 1e-4
+
+
+@pytest.fixture
+def depth_config(tmp_path, monkeypatch):
+    for name, value in {"RESOLUTION": (32, 24), "NUM_FRAMES": 3, "HEADLESS": True, "RESUME": False,
+                        "PROFILE": False, "CAPTURE_DEPTH": True}.items():
+        monkeypatch.setattr(Config, name, value)
+    return Config
+
+
+def _capture(config, monkeypatch, output_dir, backend):
+    monkeypatch.setattr(config, "OUTPUT_DIR", output_dir)
+    monkeypatch.setattr(config, "OUTPUT_BACKEND", backend)
+    app = sim_backend.create_app({"headless": True})
+    world = sim_backend.new_world(stage_units_in_meters=1.0)
+    result = capture.run_capture(world, app, config)
+    assert result["error"] is None and result["frames"] == 3
+
+
+def test_shard_reader_disparity_matches_png(tmp_path, depth_config, monkeypatch):
+    png_dir, shard_dir = str(tmp_path / "png"), str(tmp_path / "shard")
+    _capture(depth_config, monkeypatch, png_dir, "png")
+    _capture(depth_config, monkeypatch, shard_dir, "shard")
+
+    reader = ShardedDatasetReader(shard_dir)
+    assert reader.has_depth and len(reader) == 3
+    for i in range(3):
+        disp_l, disp_r, valid_l, valid_r = reader.disparity(i)
+        assert disp_l.dtype == np.float16 and disp_l.shape == (24, 32)
+        for disp, valid, eye in ((disp_l, valid_l, "left"), (disp_r, valid_r, "right")):
+            png, png_valid = decode_disparity_png16(
+                np.array(Image.open(os.path.join(png_dir, f"disp_{eye}", f"{i:04d}.png"))), SCALE)
+            np.testing.assert_array_equal(valid, png_valid)
+            assert valid.any()
+            disp = disp.astype(np.float32)
+            assert np.all(disp[~valid] == 0)
+            np.testing.assert_allclose(disp[valid], png[valid], rtol=2.0 ** -10, atol=0.5 / SCALE)
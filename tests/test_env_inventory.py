@@ -0,0 +1,58 @@
+# env_inventory 的纯 Python 部分：多版本扩展的选择和构建指纹（不需要 Isaac Sim）
+import os
+
+from common import env_inventory
+
+
+class _Manager:
+    def __init__(self, extensions):
+        self._extensions = extensions
+
+    def get_extensions(self):
+        return self._extensions
+
+
+def test_enabled_version_wins_name_collisions():
+    manager = _Manager([
+        {"id": "omni.physx-107.3.26", "name": "omni.physx", "version": (107, 3, 26), "enabled": True},
+        {"id": "omni.physx-106.0.1", "name": "omni.physx", "version": (106, 0, 1), "enabled": False},
+        {"id": "omni.old-1.0.0", "name": "omni.old", "version": (1, 0, 0), "enabled": False},
+        {"id": "omni.old-2.0.0", "name": "omni.old", "version": (2, 0, 0), "enabled": True},
+        {"id": "omni.off-1.0.0", "name": "omni.off", "version": (1, 0, 0), "enabled": False},
+        {"id": "omni.off-1.1.0", "name": "omni.off", "version": (1, 1, 0), "enabled": False},
+    ])
+    extensions = env_inventory._collect_extensions(manager)
+    assert extensions["omni.physx"]["id"] == "omni.physx-107.3.26"
+    assert extensions["omni.physx"]["all_ids"] == ["omni.physx-107.3.26", "omni.physx-106.0.1"]
+    assert extensions["omni.old"]["version"] == "2.0.0"
+    assert extensions["omni.old"]["all_ids"] == ["omni.old-1.0.0", "omni.old-2.0.0"]
+    assert extensions["omni.off"]["id"] == "omni.off-1.0.0"
+    inventory = {"extensions": extensions}
+    assert env_inventory.extension_info("omni.physx", inventory)["enabled"]
+
+
+def test_fingerprint_sees_rebuilt_extension_and_version(tmp_path):
+    install = str(tmp_path)
+    assert env_inventory.build_fingerprint(install) is None
+
+    ext_dir = tmp_path / "exts" / "omni.physx"
+    ext_dir.mkdir(parents=True)
+    (ext_dir / "extension.toml").write_text("a")
+    (tmp_path / "VERSION").write_text("5.0.0")
+    os.utime(tmp_path / "VERSION", (1000, 1000))
+    for path in (ext_dir / "extension.toml", ext_dir, tmp_path / "exts"):
+        os.utime(path, (1000, 1000))
+    first = env_inventory.build_fingerprint(install)
+
+    # 重新编译替换了扩展目录里的文件：exts/ 的 mtime 不变，但 exts/omni.physx/ 的变了
+    (ext_dir / "extension.toml.new").write_text("b")
+    os.replace(ext_dir / "extension.toml.new", ext_dir / "extension.toml")
+    os.utime(ext_dir, (2000, 2000))
+    assert os.stat(tmp_path / "exts").st_mtime == 1000
+    second = env_inventory.build_fingerprint(install)
+    assert second != first
+
+    # VERSION 内容变化（mtime 被还原）也会使指纹变化
+    (tmp_path / "VERSION").write_text("5.1.0")
+    os.utime(tmp_path / "VERSION", (1000, 1000))
+    assert env_inventory.build_fingerprint(install) != second
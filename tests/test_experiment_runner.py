@@ -0,0 +1,41 @@
+# ExperimentRunner 的步进 / 渲染 / 采样调度（不需要仿真器，用计数替身）
+from experiment_runner import ExperimentRunner
+
+
+class _World:
+    def __init__(self):
+        self.steps = 0
+        self.rendered = []
+
+    def step(self, render=True):
+        self.steps += 1
+        if render:
+            self.rendered.append(self.steps)
+
+
+class _App:
+    def is_running(self):
+        return True
+
+
+def test_samples_land_on_multiples_of_the_interval():
+    """与改用 runner 之前的 test_stiffness.py 一致：读数在第 100, 200, ... 步之后，和 step_count 同相位"""
+    world = _World()
+    runner = ExperimentRunner(world, _App(), render_interval=0, sample_interval=100, max_steps=350)
+    sampled_at = []
+    while runner.keep_running():
+        if runner.step():
+            assert world.steps == runner.step_count
+            sampled_at.append(runner.step_count)
+    assert sampled_at == [100, 200, 300]
+    assert runner.sample_count == 3
+    assert world.rendered == []
+
+
+def test_every_step_is_sampled_with_interval_one():
+    world = _World()
+    runner = ExperimentRunner(world, _App(), render_interval=2, sample_interval=1, max_steps=5)
+    results = [runner.step() for _ in range(5)]
+    assert results == [True] * 5
+    assert world.rendered == [1, 3, 5]
+    assert not runner.keep_running()
@@ -0,0 +1,31 @@
+# ForceAnalytics 的接触事件：写入事件表的行按时间排序
+import numpy as np
+
+from common.columnar_log import ColumnarLog, load_log
+from force_analytics import ForceAnalytics, EVENT_FIELDS, CONTACT_ON, CONTACT_OFF, PEAK
+
+
+def _press_profile(dt=0.01):
+    """两次按压：力从 0 升到峰值再回到 0"""
+    t = np.arange(0.0, 4.0, dt)
+    fz = -np.clip(np.sin(np.pi * t), 0.0, None) * np.where(t < 2.0, 2.0, 1.0)
+    return t, fz
+
+
+def test_events_are_in_time_order(tmp_path):
+    path = str(tmp_path / "events.csv")
+    t, fz = _press_profile()
+    with ColumnarLog(path, EVENT_FIELDS, chunk_rows=1) as log:
+        analytics = ForceAnalytics(0.01, cutoff_hz=None, event_log=log)
+        for ti, f in zip(t, fz):
+            analytics.update(ti, (0.0, 0.0, f))
+        analytics.finish(t[-1])
+
+    assert [event for _, event, _ in analytics.events] == [CONTACT_ON, PEAK, CONTACT_OFF] * 2
+    times = [time for time, _, _ in analytics.events]
+    assert times == sorted(times)
+    np.testing.assert_allclose([v for _, e, v in analytics.events if e == PEAK], [-2.0, -1.0], atol=1e-3)
+
+    table = load_log(path)
+    assert list(table["event"]) == [event for _, event, _ in analytics.events]
+    assert np.all(np.diff(table["time"]) >= 0)
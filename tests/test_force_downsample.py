@@ -0,0 +1,70 @@
+# 力数据降采样：首尾点、尖峰保留，以及源文件改写后缓存失效
+import os
+
+import numpy as np
+
+from force_downsample import lttb_indices, load_downsampled, minmax_indices
+
+
+SPIKE_UP, SPIKE_DOWN = 1234, 1777
+
+
+def _signal(n=10_000):
+    t = np.arange(n) / 60.0
+    fz = -np.sin(t / 10.0)
+    fz[SPIKE_UP] = 5.0
+    fz[SPIKE_DOWN] = -3.0
+    return t, fz
+
+
+def test_lttb_keeps_endpoints():
+    t, fz = _signal()
+    idx = lttb_indices(t, fz, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(t) - 1
+    assert np.all(np.diff(idx) > 0)
+    # 点数不超过 n_out 时原样返回
+    assert lttb_indices(t[:100], fz[:100], 500).tolist() == list(range(100))
+
+
+def test_minmax_keeps_spikes_and_endpoints():
+    t, fz = _signal()
+    idx = minmax_indices(fz, 200)
+    assert len(idx) <= 202
+    assert {0, SPIKE_UP, SPIKE_DOWN, len(t) - 1} <= set(idx.tolist())
+    assert np.all(np.diff(idx) > 0)
+    assert fz[idx].max() == 5.0 and fz[idx].min() == -3.0
+
+
+def _write_csv(path, t, fz):
+    with open(path, "w") as f:
+        f.write("time,f_x,f_y,f_z,base_z\n")
+        for ti, fi in zip(t, fz):
+            f.write(f"{ti:.4f},0.0,0.0,{fi:.6f},1.0000\n")
+
+
+def test_cache_rebuilt_after_source_rewrite(tmp_path):
+    path = str(tmp_path / "run.csv")
+    t, fz = _signal(2000)
+    _write_csv(path, t, fz)
+    cache = f"{path}.minmax100.npz"
+    assert load_downsampled(path, "minmax", 100)["f_z"].max() == 5.0
+    assert os.path.exists(cache)
+
+    # 源文件不变时直接返回缓存，不重写缓存文件
+    cached_mtime = os.stat(cache).st_mtime_ns
+    assert load_downsampled(path, "minmax", 100)["f_z"].max() == 5.0
+    assert os.stat(cache).st_mtime_ns == cached_mtime
+
+    # 同样大小的改写（只改了尖峰的高度）：大小不变，靠修改时间失效
+    st = os.stat(path)
+    _write_csv(path, t, np.where(fz == 5.0, 6.0, fz))
+    assert os.stat(path).st_size == st.st_size
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+    assert load_downsampled(path, "minmax", 100)["f_z"].max() == 6.0
+
+    # 追加数据：大小变化
+    _write_csv(path, np.append(t, t[-1] + 1.0), np.append(fz, 9.0))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+    second = load_downsampled(path, "minmax", 100)
+    assert second["f_z"].max() == 9.0 and len(second["time"]) <= 102
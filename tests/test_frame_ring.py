@@ -0,0 +1,70 @@
+# FrameRing 缓冲的归属：交给 DatasetWriter 的块在编码完成（或写出失败）后一定归还
+from functools import partial
+
+import numpy as np
+import pytest
+
+from src.config import Config
+from src.data_handler import DatasetWriter
+from src.frame_ring import FrameRing
+
+
+def _fill(ring, slot, i):
+    ring[slot][:] = np.random.default_rng(i).integers(0, 256, ring[slot].shape, dtype=np.uint8)
+    return ring[slot]
+
+
+def _write(writer, ring, frames):
+    for i in frames:
+        slot = ring.acquire()
+        writer.write_views(i, i / 60.0, np.zeros((2, 3)), np.array([1.0, 0.0, 0.0, 0.0]), _fill(ring, slot, i),
+                           release=partial(ring.release, slot))
+
+
+@pytest.mark.parametrize("pool_type", ["thread", "process"])
+def test_slots_return_after_async_encode(tmp_path, pool_type):
+    ring = FrameRing(3, 2, 6, 8)
+    writer = DatasetWriter(str(tmp_path / "dataset"), async_mode=True, num_workers=2, pool_type=pool_type,
+                           max_pending=2)
+    # 帧数远多于块数：块没有归还时 acquire 会一直阻塞
+    _write(writer, ring, range(12))
+    writer.close()
+    assert sorted(ring._free) == [0, 1, 2]
+
+
+def test_slot_returns_after_sync_encode(tmp_path):
+    ring = FrameRing(1, 2, 6, 8)
+    writer = DatasetWriter(str(tmp_path / "dataset"))
+    _write(writer, ring, range(3))
+    assert list(ring._free) == [0]
+    assert ring.waits == 0
+    writer.close()
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+def test_slot_returns_when_write_views_raises(tmp_path, async_mode):
+    ring = FrameRing(2, 3, 6, 8)
+    writer = DatasetWriter(str(tmp_path / "dataset"), async_mode=async_mode)
+
+    # 三个相机的块交给双目写出端：拒收
+    slot = ring.acquire()
+    with pytest.raises(ValueError):
+        writer.write_views(0, 0.0, np.zeros((3, 3)), np.array([1.0, 0.0, 0.0, 0.0]), ring[slot],
+                           release=partial(ring.release, slot))
+    assert sorted(ring._free) == [0, 1]
+
+    # 单通道图像 PIL 编码失败（同步时直接抛出，异步时在 close 里抛回主线程）
+    slot = ring.acquire()
+    with pytest.raises(TypeError):
+        writer.write_views(1, 0.0, np.zeros((2, 3)), np.array([1.0, 0.0, 0.0, 0.0]), ring[slot][:2, :, :, :1],
+                           release=partial(ring.release, slot))
+        writer.close()
+    assert sorted(ring._free) == [0, 1]
+
+
+def test_async_ring_does_not_cap_the_writer_queue(monkeypatch):
+    monkeypatch.setattr(Config, "OUTPUT_BACKEND", "png")
+    monkeypatch.setattr(Config, "WRITER_ASYNC", True)
+    assert Config.capture_slots() == max(Config.CAPTURE_BUFFERS, Config.WRITER_MAX_PENDING + 1)
+    monkeypatch.setattr(Config, "WRITER_ASYNC", False)
+    assert Config.capture_slots() == Config.CAPTURE_BUFFERS
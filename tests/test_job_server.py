@@ -0,0 +1,86 @@
+# JobServer 的排队与事件协议（替身任务 stub_handlers，不需要 Isaac Sim）
+import json
+import socket
+import threading
+
+import pytest
+
+from common.job_server import JobServer, JobClient, JobError, stub_handlers
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / "jobs.sock")
+    srv = JobServer(path, stub_handlers(step_time=0.001, steps=3))
+    srv.start()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield path, srv, thread
+    if thread.is_alive():
+        JobClient(path).shutdown()
+        thread.join(timeout=5)
+
+
+def test_event_order(server):
+    path, _, _ = server
+    events = list(JobClient(path).submit("press", {"speed": 0.01}, job_id="a"))
+    assert [e["event"] for e in events] == ["accepted", "started", "progress", "progress", "progress",
+                                           "result", "done"]
+    assert all(e["id"] == "a" for e in events)
+    assert [e["data"]["step"] for e in events if e["event"] == "progress"] == [0, 1, 2]
+    assert events[-2]["data"]["params"] == {"speed": 0.01}
+
+
+def test_error_and_unknown_type(server):
+    path, _, _ = server
+    client = JobClient(path)
+    with pytest.raises(JobError, match="stub capture failed"):
+        client.run("capture", {"fail": True})
+    events = list(client.submit("nope"))
+    assert [e["event"] for e in events] == ["error", "done"]
+    assert "unknown job type" in events[0]["message"]
+    # 出错之后服务照常处理后续任务
+    assert client.run("stiffness")["type"] == "stiffness"
+
+
+def test_bad_requests_keep_connection_alive(server):
+    path, _, _ = server
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        reader = sock.makefile("rb")
+        for line in (b"[1]\n", b"not json\n", b'{"params": {}}\n', b'"text"\n'):
+            sock.sendall(line)
+            reply = json.loads(reader.readline())
+            assert reply["event"] == "error" and reply["message"].startswith("bad request")
+        sock.sendall(b'{"id": "p", "type": "ping"}\n')
+        assert json.loads(reader.readline())["event"] == "pong"
+
+
+def test_shutdown_drains_queued_jobs(tmp_path):
+    path = str(tmp_path / "jobs.sock")
+    srv = JobServer(path, stub_handlers(step_time=0.02, steps=3))
+    srv.start()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+
+    # 三个任务都确认入队（收到 accepted）之后再请求 shutdown
+    conns = []
+    for i in range(3):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        reader = sock.makefile("rb")
+        sock.sendall(json.dumps({"id": f"job{i}", "type": "press"}).encode() + b"\n")
+        assert json.loads(reader.readline())["event"] == "accepted"
+        conns.append((sock, reader))
+    JobClient(path).shutdown()
+
+    # 已排队的任务全部执行完才退出
+    for sock, reader in conns:
+        events = [json.loads(reader.readline())]
+        while events[-1]["event"] != "done":
+            events.append(json.loads(reader.readline()))
+        assert [e["event"] for e in events][-2:] == ["result", "done"]
+        sock.close()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert srv.jobs_done == 3
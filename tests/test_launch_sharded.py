@@ -0,0 +1,108 @@
+# launch_sharded.py + fake_worker.py 的端到端检查：分片、合并后的帧数、位姿表和 manifest
+import csv
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import STEREO_DIR
+
+# 在替身后端上跑真正的 main.py，但让第 2 帧抓图抛异常（run_capture 捕获后记在 result["error"] 里）
+FAILING_MAIN = f"""
+import runpy
+import sys
+sys.path.insert(0, {STEREO_DIR!r})
+from src import capture
+
+create_rig = capture.create_rig
+
+
+def failing_rig(config):
+    rig = create_rig(config)
+    calls = []
+
+    def capture_frame(out=None):
+        calls.append(out is not None)
+        if sum(calls) == 2:
+            raise RuntimeError("renderer lost")
+        return type(rig).capture(rig, out=out)
+
+    rig.capture = capture_frame
+    return rig
+
+
+capture.create_rig = failing_rig
+runpy.run_path({os.path.join(STEREO_DIR, "main.py")!r}, run_name="__main__")
+"""
+
+
+def _launch(output_dir, num_frames, workers, worker_script=None, check=True):
+    return subprocess.run([sys.executable, os.path.join(STEREO_DIR, "launch_sharded.py"),
+                           "--workers", str(workers), "--num-frames", str(num_frames), "--output-dir", output_dir,
+                           "--worker-script", worker_script or os.path.join(STEREO_DIR, "fake_worker.py")],
+                          cwd=STEREO_DIR, check=check, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          text=True)
+
+
+def test_merge_covers_requested_frames(tmp_path):
+    output_dir = str(tmp_path / "merged")
+    _launch(output_dir, num_frames=12, workers=3)
+
+    # 轨迹按 --num-frames 生成，而不是截取 Config.NUM_FRAMES 帧轨迹的前 12 个点
+    assert len(np.load(os.path.join(output_dir, "trajectory.npy"))) == 12
+
+    for eye in ("left", "right"):
+        assert sorted(os.listdir(os.path.join(output_dir, eye))) == [f"{i:04d}.png" for i in range(12)]
+
+    with open(os.path.join(output_dir, "camera_poses.csv"), newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][0] == "frame"
+    assert [int(row[0]) for row in rows[1:]] == list(range(12))
+
+    with open(os.path.join(output_dir, "manifest.txt")) as f:
+        lines = f.read().splitlines()
+    assert [int(line.split()[0]) for line in lines] == list(range(12))
+    assert all(len(line.split()) == 3 for line in lines)
+    assert not os.path.exists(os.path.join(output_dir, "_shards"))
+
+
+def test_more_frames_than_config_default(tmp_path):
+    from src.config import Config
+
+    output_dir = str(tmp_path / "long")
+    num_frames = Config.NUM_FRAMES + 4
+    _launch(output_dir, num_frames=num_frames, workers=2)
+    assert len(os.listdir(os.path.join(output_dir, "left"))) == num_frames
+    with open(os.path.join(output_dir, "manifest.txt")) as f:
+        assert len(f.read().splitlines()) == num_frames
+
+
+def test_failed_capture_fails_the_launch(tmp_path):
+    worker_script = tmp_path / "failing_main.py"
+    worker_script.write_text(FAILING_MAIN)
+    output_dir = str(tmp_path / "merged")
+
+    # main.py 以非零状态退出，run_shards 报告失败的 worker，不做合并
+    result = _launch(output_dir, num_frames=4, workers=2, worker_script=str(worker_script), check=False)
+    assert result.returncode != 0
+    assert "capture worker(s) failed" in result.stderr
+    assert not os.path.exists(os.path.join(output_dir, "manifest.txt"))
+
+
+def test_merge_rejects_missing_frames(tmp_path):
+    from src.sharding import merge_shards, shard_dir_name
+
+    output_dir = str(tmp_path / "merged")
+    shard_dirs = []
+    for shard_id, (start, stop) in enumerate([(0, 3), (4, 6)]):
+        shard_dir = shard_dir_name(output_dir, shard_id)
+        subprocess.run([sys.executable, os.path.join(STEREO_DIR, "fake_worker.py"), "--num-frames", "6",
+                        "--frame-start", str(start), "--frame-stop", str(stop), "--output-dir", shard_dir],
+                       cwd=STEREO_DIR, check=True, stdout=subprocess.DEVNULL)
+        shard_dirs.append(shard_dir)
+
+    with pytest.raises(RuntimeError, match=r"missing \[3\]"):
+        merge_shards(shard_dirs, output_dir, num_frames=6)
+    assert all(os.path.isdir(shard_dir) for shard_dir in shard_dirs)
@@ -0,0 +1,102 @@
+# 压头运动曲线：物理步网格上的起止高度、峰值速度、往复次数与停留时长，以及按步号取阶段
+import numpy as np
+import pytest
+
+import motion_profile
+from motion_profile import HOLDING, MOVING, WAITING
+
+DT = 1.0 / 60.0
+START_Z, END_Z = 1.35, 1.05
+
+
+def _runs(mask):
+    """mask 中连续为 True 的段 [(起点, 长度), ...]"""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    return list(zip(starts.tolist(), (stops - starts).tolist()))
+
+
+@pytest.mark.parametrize("accel", [None, 0.5, 0.02])
+def test_trapezoidal_heights_and_peak_speed(accel):
+    speed = 0.05
+    profile = motion_profile.trapezoidal(START_Z, END_Z, speed, DT, accel=accel, wait_time=1.0, hold_time=0.5)
+    n_wait, n_hold = 60, 30
+    np.testing.assert_allclose(profile.t, np.arange(len(profile)) * DT)
+
+    assert np.all(profile.z[:n_wait] == START_Z) and np.all(profile.phase[:n_wait] == WAITING)
+    assert np.all(profile.z[-n_hold:] == END_Z) and np.all(profile.phase[-n_hold:] == HOLDING)
+    moving = profile.z[profile.phase == MOVING]
+    assert moving[0] == START_Z
+    # 运动段不含终点，最后一个采样离终点不超过一步
+    assert 0 < moving[-1] - END_Z <= speed * DT + 1e-12
+    # 单调下压，任何一步的速度都不超过设定速度
+    velocity = -np.diff(profile.z) / DT
+    assert velocity.min() >= 0.0
+    assert velocity.max() <= speed * (1 + 1e-9)
+    assert profile.duration == pytest.approx(len(profile) * DT)
+
+
+def test_trapezoidal_constant_speed_matches_original():
+    # accel=None 时与原 run.py 的匀速下压一致：每步移动 speed * dt
+    profile = motion_profile.trapezoidal(START_Z, END_Z, 0.05, DT)
+    moving = profile.z[profile.phase == MOVING]
+    assert len(moving) == round(0.3 / 0.05 / DT)
+    np.testing.assert_allclose(np.diff(moving), -0.05 * DT)
+
+
+def test_trapezoidal_triangle_when_too_short_to_cruise():
+    # 0.3 m 加速度 0.02 m/s^2：来不及加速到 0.5 m/s，峰值速度为 sqrt(a * d)
+    profile = motion_profile.trapezoidal(START_Z, END_Z, 0.5, DT, accel=0.02)
+    velocity = -np.diff(profile.z) / DT
+    peak = np.sqrt(0.02 * 0.3)
+    assert velocity.max() <= peak * (1 + 1e-9)
+    assert velocity.max() == pytest.approx(peak, rel=1e-2)
+
+
+def test_s_curve_heights_and_peak_speed():
+    duration = 4.0
+    profile = motion_profile.s_curve(START_Z, END_Z, duration, DT, wait_time=0.5, hold_time=0.5)
+    moving = profile.z[profile.phase == MOVING]
+    assert len(moving) == round(duration / DT)
+    assert moving[0] == START_Z and profile.z[-1] == END_Z
+    velocity = -np.diff(profile.z) / DT
+    # 五次多项式的峰值速度为 15/8 * 距离 / 时长，起止速度为零（连续，不跳变）
+    assert velocity.max() <= 1.875 * 0.3 / duration * (1 + 1e-9)
+    assert velocity.max() == pytest.approx(1.875 * 0.3 / duration, rel=1e-3)
+    assert velocity[:30].max() < 1e-4 and velocity[-31:].max() < 1e-4
+    assert velocity.min() >= 0.0
+
+
+@pytest.mark.parametrize("dwell_time", [0.0, 0.5])
+def test_cyclic_cycles_and_dwell(dwell_time):
+    cycles, speed = 3, 0.1
+    profile = motion_profile.cyclic(START_Z, END_Z, speed, cycles, DT, accel=0.5, dwell_time=dwell_time,
+                                    wait_time=0.25, hold_time=0.25)
+    n_dwell = round(dwell_time / DT)
+    one_way = len(motion_profile.trapezoid_segment(START_Z, END_Z, speed, 0.5, DT))
+    assert len(profile) == 15 + cycles * 2 * (one_way + n_dwell) + 15
+    moving = profile.phase == MOVING
+    assert _runs(moving) == [(15, cycles * 2 * (one_way + n_dwell))]
+
+    # 每个循环在最低点停留 n_dwell 步，再加上抬起段的第一步（抬起段从 end_z 出发）
+    bottom = _runs(moving & (profile.z == END_Z))
+    assert len(bottom) == cycles
+    assert all(length == n_dwell + 1 for _, length in bottom)
+    # 全程保持在 [end_z, start_z] 内，最后回到起点
+    assert profile.z.min() == END_Z and profile.z.max() == START_Z
+    assert np.all(profile.z[profile.phase == HOLDING] == START_Z)
+    assert np.abs(np.diff(profile.z)).max() <= speed * DT * (1 + 1e-9)
+
+
+def test_at_step_phases_and_clamp():
+    profile = motion_profile.trapezoidal(START_Z, END_Z, 0.05, DT, wait_time=1.0, hold_time=0.5)
+    n_move = round(0.3 / 0.05 / DT)
+    assert profile.at_step(0) == (START_Z, WAITING)
+    assert profile.at_step(59) == (START_Z, WAITING)
+    assert profile.at_step(60) == (START_Z, MOVING)
+    z, phase = profile.at_step(60 + n_move - 1)
+    assert phase == MOVING and z > END_Z
+    assert profile.at_step(60 + n_move) == (END_Z, HOLDING)
+    # 超出曲线长度后保持最后一个值
+    assert profile.at_step(len(profile) + 1000) == (END_Z, HOLDING)
+    assert motion_profile.PHASE_NAMES[profile.at_step(len(profile))[1]] == "FINISHED"
@@ -0,0 +1,81 @@
+# 参考模型：静平衡、与替身后端 SpringJoint 一致，以及 compare_run 读取 run.py 格式的记录
+import numpy as np
+import pytest
+
+from common import sim_backend, fake_sim
+from common.columnar_log import ColumnarLog
+from reference_model import GRAVITY, PHYSICS_DT, compare_run, make_grid, simulate, to_run_table
+
+LOG_FIELDS = [("time", "f8", "%.4f"), ("f_x", "f8"), ("f_y", "f8"), ("f_z", "f8"), ("base_z", "f8", "%.4f")]
+
+
+def _press(n_steps, wait=120, speed=0.05):
+    """静止 wait 步后匀速下压"""
+    t = np.maximum(np.arange(n_steps) - wait, 0) * PHYSICS_DT
+    return 1.35 - speed * t
+
+
+def _write_log(path, table, every=1):
+    with ColumnarLog(str(path), LOG_FIELDS, fmt="csv") as log:
+        for row in table[::every]:
+            log.append(tuple(row))
+
+
+def test_static_equilibrium_over_grid():
+    grid = make_grid(stiffness=[100.0, 1000.0, 1e5], probe_mass=[0.0001, 0.5, 5.0], damping=[0.0, 10.0])
+    result = simulate(np.full(500, 3.0), PHYSICS_DT, grid["stiffness"], grid["damping"], grid["probe_mass"])
+    assert result["f_z"].shape == (18, 500)
+    np.testing.assert_allclose(result["f_z"], np.broadcast_to(-grid["probe_mass"][:, None] * GRAVITY, (18, 500)),
+                               rtol=1e-9, atol=1e-9)
+
+
+def test_matches_fake_spring_joint():
+    from SpringForceSensor import SpringForceSensor
+
+    k, c, m = 1000.0, 10.0, 0.5
+    base_z = _press(900, wait=600)
+    fake_sim.new_stage()
+    sim_backend.create_app({"headless": True})
+    world = sim_backend.create_world(stage_units_in_meters=1.0)
+    sensor = SpringForceSensor("/World/Sensor", stiffness=k, damping=c, probe_mass=m, t_base=[0.0, 0.0, base_z[0]])
+    sensor.attach_to_world(world)
+    world.reset()
+    measured = np.empty(len(base_z))
+    for i, z in enumerate(base_z):
+        sensor.update_base_pose(position=(0.0, 0.0, z))
+        world.step(render=False)
+        measured[i] = sensor.get_equivalent_force_geom()[2]
+
+    # 替身从弹簧原长出发，参考模型从静平衡出发：等静止段的初始振荡衰减完之后逐步比较
+    model = simulate(base_z, PHYSICS_DT, k, c, m)["f_z"][0]
+    np.testing.assert_allclose(measured[500:], model[500:], atol=1e-6)
+    # 开始下压时 Base 的速度突变激起一段瞬态，比较的不只是静平衡
+    assert np.ptp(measured[600:]) > 0.1
+
+
+def test_compare_run_on_logged_table(tmp_path):
+    base_z = _press(600)
+    table = to_run_table(simulate(base_z, PHYSICS_DT, 1000.0, 10.0, 0.5))
+    path = tmp_path / "run.csv"
+    _write_log(path, table)
+
+    # 第二组的探头质量不对，静态力差了 4 倍
+    res = compare_run(str(path), 1000.0, 10.0, [0.5, 2.0])
+    # 记录里 base_z 只保留 4 位小数，速度项带来约 0.02 N 的误差
+    assert res["rms"][0] < 0.05
+    assert list(res["diverged"]) == [False, True]
+
+
+def test_compare_run_with_sample_interval(tmp_path):
+    base_z = _press(601)
+    table = to_run_table(simulate(base_z, PHYSICS_DT, 1000.0, 10.0, 0.5))
+    path = tmp_path / "run.csv"
+    _write_log(path, table, every=10)
+
+    # 每 10 个物理步记录一次：模型仍按物理步长积分，只在采样步比较
+    res = compare_run(str(path), 1000.0, 10.0, 0.5, sample_interval=10)
+    assert not res["diverged"][0]
+    assert res["model"]["f_z"].shape == (1, 61)
+    # 不说明采样间隔时拒绝，而不是把采样间隔当成物理步长
+    with pytest.raises(ValueError, match="sample-interval"):
+        compare_run(str(path), 1000.0, 10.0, 0.5)
@@ -0,0 +1,41 @@
+# 分片后端：写入中途崩溃（没有 close）时，索引里登记的帧仍可完整读取
+import numpy as np
+
+from src.shard_store import ShardedDatasetWriter, ShardedDatasetReader
+
+
+def _views(i, shape=(8, 16, 4)):
+    return np.random.default_rng(i).integers(0, 256, (2, *shape), dtype=np.uint8)
+
+
+def _write(writer, frames):
+    for i in frames:
+        writer.write_views(i, i / 60.0, np.full((2, 3), float(i)), np.array([1.0, 0.0, 0.0, 0.0]), _views(i))
+
+
+def test_open_shard_is_readable_after_crash(tmp_path):
+    output_dir = str(tmp_path / "dataset")
+    writer = ShardedDatasetWriter(output_dir, frames_per_shard=16, checkpoint_interval=5)
+    _write(writer, range(23))
+
+    # 不调用 close()：第一个分片写满 16 帧已封存，第二个分片的 7 帧里前 5 帧已经 checkpoint
+    reader = ShardedDatasetReader(output_dir)
+    assert len(reader) == 21
+    assert list(reader.poses["frame"]) == list(range(21))
+    for i in (0, 15, 16, 20):
+        img_l, img_r, pose = reader[i]
+        np.testing.assert_array_equal(img_l, _views(i)[0, :, :, :3])
+        np.testing.assert_array_equal(img_r, _views(i)[1, :, :, :3])
+        assert pose["frame"] == i
+
+    writer.close()
+    assert len(ShardedDatasetReader(output_dir)) == 23
+
+
+def test_checkpoint_disabled_only_registers_sealed_shards(tmp_path):
+    output_dir = str(tmp_path / "dataset")
+    writer = ShardedDatasetWriter(output_dir, frames_per_shard=16, checkpoint_interval=0)
+    _write(writer, range(20))
+    assert len(ShardedDatasetReader(output_dir)) == 16
+    writer.close()
+    assert len(ShardedDatasetReader(output_dir)) == 20
@@ -0,0 +1,80 @@
+# SpringForceSensor 的读数缓存和 SpringForceSensorArray 的批量读数（CPU 替身后端）
+import numpy as np
+import pytest
+
+from common import sim_backend, fake_sim
+
+
+@pytest.fixture
+def fake_world():
+    fake_sim.new_stage()
+    sim_backend.create_app({"headless": True})
+    return sim_backend.create_world(stage_units_in_meters=1.0)
+
+
+def test_cache_is_cleared_by_world_reset(fake_world):
+    from SpringForceSensor import SpringForceSensor
+
+    sensor = SpringForceSensor("/World/Sensor", stiffness=1000.0, probe_mass=1.0, t_base=[0.0, 0.0, 3.0])
+    sensor.attach_to_world(fake_world)
+    fake_world.reset()
+    initial = sensor.get_equivalent_force_geom()
+    for _ in range(200):
+        fake_world.step(render=False)
+    settled = sensor.get_equivalent_force_geom()
+    assert not np.allclose(settled, initial)
+
+    # reset 之后第一次读数对应初始状态，而不是上一次运行最后一步的缓存
+    fake_world.reset()
+    np.testing.assert_allclose(sensor.get_equivalent_force_geom(), initial)
+
+
+def test_cache_serves_repeated_reads_within_a_step(fake_world):
+    from SpringForceSensor import SpringForceSensor
+
+    sensor = SpringForceSensor("/World/Sensor", stiffness=1000.0, probe_mass=1.0, t_base=[0.0, 0.0, 3.0])
+    sensor.attach_to_world(fake_world)
+    fake_world.reset()
+    fake_world.step(render=False)
+    first = sensor.get_equivalent_force_geom()
+    first[2] = 1e9   # 返回的是副本，不会污染缓存
+    assert sensor._cached_step == fake_world.current_time_step_index
+    assert sensor.get_equivalent_force_geom()[2] != 1e9
+
+
+def _quat(axis, angle):
+    axis = np.asarray(axis, dtype=float) / np.linalg.norm(axis)
+    return np.concatenate([[np.cos(angle / 2)], np.sin(angle / 2) * axis])
+
+
+@pytest.mark.parametrize("rotated", [False, True])
+def test_array_matches_per_sensor_readout(fake_world, rotated):
+    from SpringForceSensor import SpringForceSensorArray
+
+    positions = np.stack([np.arange(5) * 0.3, np.zeros(5), np.full(5, 2.0)], axis=1)
+    array = SpringForceSensorArray("/World/Array", positions, stiffness=np.linspace(500.0, 1500.0, 5),
+                                   probe_mass=[0.1, 0.2, 0.3, 0.4, 0.5])
+    for sensor in array.sensors:
+        sensor.attach_to_world(fake_world)
+    fake_world.reset()
+    array.initialize_views()
+    for i in range(30):
+        array.update_base_poses(positions + [0.0, 0.0, -0.001 * i])
+        fake_world.step(render=False)
+    unrotated = array.get_equivalent_forces()
+
+    if rotated:
+        # Base 带旋转（最后一个还带非均匀缩放）：逐个读数走通用路径，批量读数走 inv(M3)^T 后备路径
+        quats = [_quat([1, 0, 0], 0.3), _quat([0, 1, 0], -0.7), _quat([1, 1, 1], 1.2), _quat([0, 0, 1], 0.5)]
+        for sensor, quat in zip(array.sensors[1:], quats):
+            sensor.base_prim.orientation = quat
+        array.sensors[-1].base_prim.scale = np.array([1.0, 2.0, 0.5])
+
+    batched = array.get_equivalent_forces()
+    single = np.array([sensor.get_equivalent_force_geom() for sensor in array.sensors])
+    assert batched.shape == (5, 3)
+    np.testing.assert_allclose(batched, single, rtol=1e-12, atol=1e-12)
+    if rotated:
+        assert not any(sensor.fast_path for sensor in array.sensors[1:])
+        assert not np.allclose(batched[1:], unrotated[1:], atol=1e-3)
+        np.testing.assert_allclose(batched[0], unrotated[0])
@@ -0,0 +1,56 @@
+# 刚度标定：stiffness_sweep.run_sweep 和任务服务的 stiffness 任务走同一段流程（CPU 替身后端）
+import csv
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SENSOR_DIR
+
+from common import sim_backend
+from common.sim_server import make_handlers
+from stiffness_sweep import RESULT_FIELDS, run_sweep
+
+
+def test_sweep_settles_to_weight(tmp_path):
+    app = sim_backend.create_app({"headless": True})
+    world = sim_backend.new_world(stage_units_in_meters=1.0)
+    output_csv = str(tmp_path / "Data_recording.csv")
+    progress = []
+    result = run_sweep(world, app, [1000.0, 2000.0], [0.5, 2.0], output_csv=output_csv, on_progress=progress.append)
+
+    assert result["error"] is None
+    assert progress == result["rows"]
+    assert [(row["k"], row["m"]) for row in result["rows"]] == [(1000.0, 0.5), (1000.0, 2.0), (2000.0, 0.5),
+                                                              (2000.0, 2.0)]
+    for row in result["rows"]:
+        assert row["settled"]
+        assert row["fz"] == pytest.approx(-9.81 * row["m"], rel=1e-3)
+
+    with open(output_csv, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == [field[0] for field in RESULT_FIELDS]
+    assert [float(row["fz"]) for row in rows] == pytest.approx([row["fz"] for row in result["rows"]], abs=1e-6)
+
+
+def test_job_handler_matches_script():
+    app = sim_backend.create_app({"headless": True})
+    handler = make_handlers(app)["stiffness"]
+    events = []
+    result = handler({"stiffness": [1000.0], "masses": [0.5, 2.0]}, events.append)
+
+    expected = run_sweep(sim_backend.new_world(stage_units_in_meters=1.0), app, [1000.0], [0.5, 2.0])
+    assert events == result["rows"]
+    assert result["rows"] == expected["rows"]
+
+
+def test_script_runs_on_fake_backend(tmp_path):
+    # --backend 覆盖环境变量，脚本不需要 Isaac Sim
+    env = dict(os.environ, SIM_BACKEND="isaac")
+    subprocess.run([sys.executable, os.path.join(SENSOR_DIR, "stiffness_sweep.py"), "--backend", "fake",
+                    "--headless"], cwd=tmp_path, env=env, check=True, stdout=subprocess.DEVNULL)
+    with open(tmp_path / "Data_recording.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10
+    assert all(row["settled"] == "1" for row in rows)
@@ -0,0 +1,98 @@
+# 相机轨迹：circle / linear 与旧版逐帧公式一致，折线和样条经过航点，弧长重参数化后帧间距均匀
+import numpy as np
+import pytest
+
+from src.config import Config
+from src.trajectory import (build_trajectory, catmull_rom_path, circle_path, helix_path, linear_path, polyline_path,
+                            resample_by_arc_length)
+
+WAYPOINTS = np.array([[0.5, 0.0, 0.4], [0.2, 0.4, 0.3], [-0.3, 0.3, 0.5], [-0.4, -0.2, 0.3], [0.1, -0.1, 0.2]])
+
+
+def _old_trajectory(frame_idx, total_frames, config):
+    """旧版 main.py 的 calculate_trajectory"""
+    if config.ORBIT_MODE == "circle":
+        angle = np.radians((frame_idx / total_frames) * 360)
+        return np.array([config.RADIUS * np.cos(angle), config.RADIUS * np.sin(angle), config.HEIGHT])
+    progress = frame_idx / (total_frames - 1)
+    return config.POINTA + (config.POINTB - config.POINTA) * progress
+
+
+def _spacing(path, closed=False):
+    if closed:
+        path = np.concatenate([path, path[:1]])
+    return np.linalg.norm(np.diff(path, axis=0), axis=1)
+
+
+@pytest.mark.parametrize("mode", ["circle", "linear"])
+@pytest.mark.parametrize("num_frames", [2, 7, 120])
+def test_matches_old_per_frame_formula(mode, num_frames, monkeypatch):
+    monkeypatch.setattr(Config, "ORBIT_MODE", mode)
+    monkeypatch.setattr(Config, "NUM_FRAMES", num_frames)
+    monkeypatch.setattr(Config, "ARC_LENGTH_UNIFORM", False)
+    path = build_trajectory(Config)
+    assert path.shape == (num_frames, 3)
+    expected = np.array([_old_trajectory(i, num_frames, Config) for i in range(num_frames)])
+    np.testing.assert_allclose(path, expected, rtol=0, atol=1e-15)
+
+
+def test_endpoints():
+    # 圆形轨道不含终点：第 0 帧在 +X 轴，最后一帧在起点前一个角步长处
+    path = circle_path(36, 0.4, 0.3)
+    np.testing.assert_allclose(path[0], [0.4, 0.0, 0.3], atol=1e-15)
+    np.testing.assert_allclose(path[-1], [0.4 * np.cos(np.radians(-10)), 0.4 * np.sin(np.radians(-10)), 0.3],
+                               atol=1e-15)
+    # 直线和螺旋首尾落在端点上
+    path = linear_path(11, [0.5, 0.5, 0.5], [0.2, 0.2, 0.2])
+    assert path[0].tolist() == [0.5, 0.5, 0.5] and path[-1].tolist() == [0.2, 0.2, 0.2]
+    assert linear_path(1, [0.5, 0.5, 0.5], [0.2, 0.2, 0.2]).tolist() == [[0.5, 0.5, 0.5]]
+    path = helix_path(50, 0.4, 0.4, 0.2, 2.0)
+    np.testing.assert_allclose(path[[0, -1]], [[0.4, 0.0, 0.4], [0.4, 0.0, 0.2]], atol=1e-12)
+
+
+def test_polyline_passes_through_waypoints():
+    # 选帧数使每个航点正好落在某一帧上：各段长度取整数倍的弦长步长
+    waypoints = np.array([[0.0, 0.0, 0.0], [0.3, 0.0, 0.0], [0.3, 0.4, 0.0], [0.3, 0.4, 0.6]])
+    path = polyline_path(14, waypoints)
+    np.testing.assert_allclose(path[[0, 3, 7, 13]], waypoints, atol=1e-12)
+    # 帧按弦长均匀分布
+    np.testing.assert_allclose(_spacing(path), 0.1, atol=1e-12)
+    with pytest.raises(ValueError):
+        polyline_path(10, waypoints[:1])
+
+
+@pytest.mark.parametrize("closed", [False, True])
+def test_catmull_rom_passes_through_waypoints(closed):
+    num_seg = len(WAYPOINTS) if closed else len(WAYPOINTS) - 1
+    per_seg = 10
+    num_frames = num_seg * per_seg if closed else num_seg * per_seg + 1
+    path = catmull_rom_path(num_frames, WAYPOINTS, closed=closed)
+    # 每段 per_seg 帧：第 i * per_seg 帧就是第 i 个航点
+    np.testing.assert_allclose(path[::per_seg], WAYPOINTS, atol=1e-12)
+    # 曲线连续：相邻帧间距远小于航点间距
+    assert _spacing(path, closed).max() < 0.5 * _spacing(WAYPOINTS, closed).min()
+
+
+def test_arc_length_resampling_is_uniform(monkeypatch):
+    for name, value in {"ORBIT_MODE": "spline", "WAYPOINTS": WAYPOINTS, "SPLINE_CLOSED": False,
+                        "NUM_FRAMES": 60, "ARC_LENGTH_OVERSAMPLE": 8}.items():
+        monkeypatch.setattr(Config, name, value)
+    monkeypatch.setattr(Config, "ARC_LENGTH_UNIFORM", False)
+    raw = build_trajectory(Config)
+    monkeypatch.setattr(Config, "ARC_LENGTH_UNIFORM", True)
+    uniform = build_trajectory(Config)
+
+    # 均匀参数的样条在长短不一的段上疏密不均；重参数化后帧间距基本相等，首尾不变
+    raw_spacing, uniform_spacing = _spacing(raw), _spacing(uniform)
+    assert raw_spacing.max() / raw_spacing.min() > 1.5
+    assert uniform_spacing.max() / uniform_spacing.min() < 1.02
+    np.testing.assert_allclose(uniform[[0, -1]], WAYPOINTS[[0, -1]], atol=1e-12)
+
+
+def test_closed_resampling_keeps_circle_convention():
+    # 闭合曲线：最后一帧到起点的距离与其它帧间距相同，不会重复起点
+    dense = circle_path(400, 0.4, 0.3)
+    path = resample_by_arc_length(dense, 40, closed=True)
+    spacing = _spacing(path, closed=True)
+    assert spacing.max() / spacing.min() < 1.001
+    np.testing.assert_allclose(path, circle_path(40, 0.4, 0.3), atol=1e-4)
@@ -0,0 +1,102 @@
+# 自适应预热：用合成画面检查黑屏不收敛、画面稳定 patience 帧后收敛、max_steps 上限
+import itertools
+
+import numpy as np
+import pytest
+
+from src.warmup import RendererWarmup
+
+SHAPE = (12, 16, 4)
+
+
+def _scene(seed=0):
+    return np.random.default_rng(seed).integers(40, 200, SHAPE, dtype=np.uint8)
+
+
+def _settling(n_changing):
+    """前 n_changing 步画面逐步变亮（每步差 10 个灰度），之后保持不变"""
+    base = _scene()
+    for k in range(n_changing):
+        yield np.clip(base.astype(np.int16) - 10 * (n_changing - 1 - k), 0, 255).astype(np.uint8)
+    while True:
+        yield base
+
+
+class _FakeWorld:
+    def __init__(self):
+        self.steps = 0
+
+    def step(self, render=True):
+        self.steps += 1
+
+
+class _FakeRig:
+    """每次 capture 从帧序列里取下一帧，双目两张图相同"""
+
+    def __init__(self, frames):
+        self.frames = iter(frames)
+
+    def capture(self):
+        frame = next(self.frames)
+        return None if frame is None else np.stack([frame, frame])
+
+
+def test_black_frames_never_converge():
+    warmup = RendererWarmup(max_steps=50, min_steps=1, patience=3)
+    black = np.zeros(SHAPE, dtype=np.uint8)
+    # 黑屏完全不变 (MAD = 0)，但非黑像素比例不足，不能算稳定
+    for _ in range(50):
+        assert not warmup.update(black, black)
+    assert warmup.last_mad == 0.0 and warmup.last_valid_ratio == 0.0
+
+    world = _FakeWorld()
+    assert RendererWarmup(max_steps=50).run(world, _FakeRig(itertools.repeat(black))) == 50
+    assert world.steps == 50
+
+
+@pytest.mark.parametrize("patience", [1, 3, 8])
+def test_settling_sequence_converges_after_patience(patience):
+    n_changing = 10
+    warmup = RendererWarmup(max_steps=300, min_steps=5, patience=patience)
+    frames = _settling(n_changing)
+    results = [warmup.update(frame) for frame in (next(frames) for _ in range(n_changing + patience))]
+    # 第 n_changing + 1 步起画面不变，再连续 patience 帧稳定才收敛
+    assert results == [False] * (n_changing + patience - 1) + [True]
+    assert warmup.converged and warmup.last_mad == 0.0 and warmup.last_valid_ratio == 1.0
+
+    world = _FakeWorld()
+    warmup = RendererWarmup(max_steps=300, min_steps=5, patience=patience)
+    assert warmup.run(world, _FakeRig(_settling(n_changing))) == n_changing + patience
+    assert world.steps == n_changing + patience
+
+
+def test_min_steps_and_missing_output():
+    scene = _scene()
+    # 画面从第一步起就稳定：仍要走满 min_steps
+    warmup = RendererWarmup(min_steps=8, patience=2)
+    assert [warmup.update(scene) for _ in range(8)] == [False] * 7 + [True]
+
+    # 渲染器中途没有输出会清零稳定计数
+    warmup = RendererWarmup(min_steps=1, patience=3)
+    assert [warmup.update(*images) for images in [(scene,), (scene,), (scene,), (), (scene,), (scene,),
+                                                  (scene,), (scene,)]] == [False] * 7 + [True]
+    # 各相机之间的差异不影响判稳，只比较同一相机前后两步
+    warmup = RendererWarmup(min_steps=1, patience=1)
+    assert not warmup.update(scene, _scene(1))
+    assert warmup.update(scene, _scene(1))
+
+
+def test_max_steps_cap():
+    rng = np.random.default_rng(3)
+    noise = (rng.integers(0, 256, SHAPE, dtype=np.uint8) for _ in range(1000))
+    world = _FakeWorld()
+    warmup = RendererWarmup(max_steps=40, patience=3)
+    assert warmup.run(world, _FakeRig(noise)) == 40
+    assert world.steps == 40 and not warmup.converged
+    assert warmup.last_mad > warmup.diff_threshold
+
+    # 上限比 patience 所需的步数还小时同样在上限处停下
+    world = _FakeWorld()
+    warmup = RendererWarmup(max_steps=6, min_steps=1, patience=3)
+    assert warmup.run(world, _FakeRig(_settling(10))) == 6
+    assert world.steps == 6 and not warmup.converged